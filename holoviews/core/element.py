@@ -762,19 +762,21 @@ class HoloMap(UniformNdMapping):
 
 
     def hist(self, num_bins=20, bin_range=None, adjoin=True, individually=True, **kwargs):
-        histmap = self.clone(shared_data=False)
-
-        map_range = None if individually else self.range
-        bin_range = map_range if bin_range is None else bin_range
+        from ..operation import histogram
         style_prefix = 'Custom[<' + self.name + '>]_'
-        for k, v in self.items():
-            histmap[k] = v.hist(adjoin=False, bin_range=bin_range,
-                                individually=individually, num_bins=num_bins,
-                                style_prefix=style_prefix, **kwargs)
+
+        # Overlays are histogrammed along the selected layer of each frame
+        hmap = self
+        if issubclass(self.type, (NdOverlay, Overlay)):
+            index = kwargs.pop('index', 0)
+            hmap = self.clone([(k, v[index]) for k, v in self.items()])
+        histmap = histogram(hmap, adjoin=False, bin_range=bin_range,
+                            individually=individually, num_bins=num_bins,
+                            style_prefix=style_prefix, **kwargs)
 
         if adjoin and issubclass(self.type, (NdOverlay, Overlay)):
             layout = (self << histmap)
-            layout.main_layer = kwargs['index']
+            layout.main_layer = index
             return layout
 
         return (self << histmap) if adjoin else histmap
@@ -0,0 +1,180 @@
+"""
+Index structures over the key columns of array based Elements,
+allowing range, exact value and nearest neighbour queries without
+scanning the full data.
+"""
+
+import numpy as np
+
+
+class SortedIndex(object):
+    """
+    Index over a single column of values, sorting the values once so
+    that the rows within a range, the rows matching a value and the
+    rows nearest to a set of values may be found by binary search.
+
+    All row selections are returned as sorted arrays of row indices,
+    preserving the order of the original data. If the values are
+    declared presorted, no sort is required and range selections are
+    returned as slices, allowing views onto the original rows.
+    """
+
+    def __init__(self, values, presorted=False):
+        values = np.asarray(values)
+        if presorted:
+            self.order = None
+            self.values = values
+        else:
+            self.order = np.argsort(values, kind='mergesort')
+            self.values = values[self.order]
+
+
+    def __len__(self):
+        return len(self.values)
+
+
+    def _rows(self, lo, hi):
+        if self.order is None:
+            return slice(lo, hi)
+        return np.sort(self.order[lo:hi])
+
+
+    def select(self, x_range=(None, None)):
+        """
+        Returns the rows with values in the half-open interval
+        [start, stop) given by x_range, where None denotes an
+        unbounded interval.
+        """
+        start, stop = x_range
+        lo = 0 if start is None else np.searchsorted(self.values, start, 'left')
+        hi = len(self) if stop is None else np.searchsorted(self.values, stop, 'left')
+        return self._rows(lo, max(lo, hi))
+
+
+    def lookup(self, value):
+        """
+        Returns the rows matching the supplied value exactly.
+        """
+        lo = np.searchsorted(self.values, value, 'left')
+        hi = np.searchsorted(self.values, value, 'right')
+        return self._rows(lo, hi)
+
+
+    def nearest(self, coords):
+        """
+        Returns the rows holding the values closest to each of the
+        supplied coordinates.
+        """
+        coords = np.asarray(coords, dtype=np.float64)
+        if len(self) == 1:
+            return np.zeros(coords.shape, dtype=int)
+        idx = np.clip(np.searchsorted(self.values, coords), 1, len(self)-1)
+        left, right = self.values[idx-1], self.values[idx]
+        idx -= (coords - left) <= (right - coords)
+        return idx if self.order is None else self.order[idx]
+
+
+
+class GridIndex(object):
+    """
+    Uniform grid index over two columns of coordinates. The points
+    are binned into a regular grid of cells holding cell_size points
+    on average, so that box and nearest neighbour queries only have
+    to consider the points in the cells overlapping the query region.
+
+    All row selections are returned as sorted arrays of row indices,
+    preserving the order of the original data.
+    """
+
+    def __init__(self, xs, ys, cell_size=16):
+        self.xs, self.ys = np.asarray(xs), np.asarray(ys)
+        self.l, self.r = np.nanmin(self.xs), np.nanmax(self.xs)
+        self.b, self.t = np.nanmin(self.ys), np.nanmax(self.ys)
+        ncells = max(1, len(self.xs) // cell_size)
+        self.nx = self.ny = max(1, int(np.sqrt(ncells)))
+        self.cell_width = float(self.r - self.l) / self.nx or 1.0
+        self.cell_height = float(self.t - self.b) / self.ny or 1.0
+
+        ix, iy = self._cell(self.xs, self.ys)
+        cells = iy * self.nx + ix
+        self.order = np.argsort(cells, kind='mergesort')
+        counts = np.bincount(cells, minlength=self.nx*self.ny)
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+
+
+    def _cell(self, xs, ys):
+        """
+        Returns the column and row of the cells containing the
+        supplied coordinates, clipped to the extent of the grid.
+        """
+        xs = np.nan_to_num((np.asarray(xs, dtype=np.float64) - self.l) / self.cell_width)
+        ys = np.nan_to_num((np.asarray(ys, dtype=np.float64) - self.b) / self.cell_height)
+        ix = np.clip(xs, 0, self.nx-1).astype(int)
+        iy = np.clip(ys, 0, self.ny-1).astype(int)
+        return ix, iy
+
+
+    def _candidates(self, ix0, ix1, iy0, iy1):
+        """
+        Returns the rows of all points in the block of cells spanning
+        the supplied (inclusive) column and row ranges.
+        """
+        ix0, iy0 = max(int(ix0), 0), max(int(iy0), 0)
+        ix1, iy1 = min(int(ix1), self.nx-1), min(int(iy1), self.ny-1)
+        blocks = [self.order[self.offsets[iy*self.nx+ix0]:self.offsets[iy*self.nx+ix1+1]]
+                  for iy in range(iy0, iy1+1)]
+        return np.concatenate(blocks) if blocks else np.array([], dtype=int)
+
+
+    def select(self, x_range=(None, None), y_range=(None, None)):
+        """
+        Returns the rows with coordinates within the half-open
+        intervals [x0, x1) and [y0, y1) given by x_range and y_range,
+        where None denotes an unbounded interval.
+        """
+        (x0, x1), (y0, y1) = [(-np.inf if lower is None else lower,
+                               np.inf if upper is None else upper)
+                              for lower, upper in (x_range, y_range)]
+        (ix0, ix1), (iy0, iy1) = self._cell([x0, x1], [y0, y1])
+        rows = self._candidates(ix0, ix1, iy0, iy1)
+        xs, ys = self.xs[rows], self.ys[rows]
+        mask = (x0 <= xs) & (xs < x1) & (y0 <= ys) & (ys < y1)
+        return np.sort(rows[mask])
+
+
+    def lookup(self, x, y):
+        """
+        Returns the rows matching the supplied coordinates exactly.
+        """
+        ix, iy = self._cell(x, y)
+        rows = self._candidates(ix, ix, iy, iy)
+        mask = (self.xs[rows] == x) & (self.ys[rows] == y)
+        return np.sort(rows[mask])
+
+
+    def nearest(self, x, y):
+        """
+        Returns the row of the point closest to the supplied
+        coordinates, searching outwards in rings of cells until no
+        cell beyond the searched block can hold a closer point.
+        """
+        ix, iy = self._cell(x, y)
+        best, best_dist, radius = None, np.inf, 0
+        while True:
+            rows = self._candidates(ix-radius, ix+radius, iy-radius, iy+radius)
+            if len(rows):
+                dists = (self.xs[rows]-x)**2 + (self.ys[rows]-y)**2
+                idx = np.argmin(dists)
+                if dists[idx] < best_dist:
+                    best, best_dist = rows[idx], dists[idx]
+
+            # Distance to the nearest side of the searched block
+            # that does not coincide with the edge of the grid
+            margins = [x - (self.l + (ix-radius)*self.cell_width) if ix-radius > 0 else np.inf,
+                       (self.l + (ix+radius+1)*self.cell_width) - x if ix+radius < self.nx-1 else np.inf,
+                       y - (self.b + (iy-radius)*self.cell_height) if iy-radius > 0 else np.inf,
+                       (self.b + (iy+radius+1)*self.cell_height) - y if iy+radius < self.ny-1 else np.inf]
+            margin = min(margins)
+            if margin == np.inf or (best is not None and best_dist <= margin**2):
+                return best
+            radius += 1
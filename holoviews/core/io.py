@@ -540,9 +540,9 @@ class FileArchive(Archive):
             raise SyntaxError("Could not parse formatter %r" % formatter)
 
     def __init__(self, **params):
-        super(FileArchive, self).__init__(**params)
         #  Items with key: (basename,ext) and value: (data, info)
         self._files = OrderedDict()
+        super(FileArchive, self).__init__(**params)
         self._validate_formatters()
 
 
@@ -619,6 +619,7 @@ class FileArchive(Archive):
     def _add_content(self, obj, data, info, filename=None):
         (unique_key, ext) = self._compute_filename(obj, info, filename=filename)
         self._files[(unique_key, ext)] = (data, info)
+        return (unique_key, ext)
 
 
     def _compute_filename(self, obj, info, filename=None):
@@ -643,9 +644,13 @@ class FileArchive(Archive):
         filename = self._normalize_name(filename)
         ext = info.get('file-ext', '')
         (unique_key, ext) = self._unique_name(filename, ext,
-                                              self._files.keys(), force=True)
+                                              self._existing_keys(), force=True)
         return (unique_key, ext)
 
+    def _existing_keys(self):
+        "The (basename, ext) keys new entries must not clash with."
+        return list(self._files.keys())
+
     def _zip_archive(self, export_name, files, root):
         archname = '.'.join(self._unique_name(export_name, 'zip', root))
         with zipfile.ZipFile(os.path.join(root, archname), 'w') as zipf:
@@ -2,10 +2,20 @@
 Operations manipulate Elements, HoloMaps and Layouts, typically for
 the purposes of analysis or visualization.
 """
+import os
+import atexit
+import pickle
+import hashlib
+import threading
+from collections import OrderedDict
 from functools import reduce
+from multiprocessing import Pool, cpu_count, current_process
+from multiprocessing.pool import ThreadPool
+
+import numpy as np
 import param
 
-from .dimension import ViewableElement
+from .dimension import Dimensioned, ViewableElement
 from .element import Element, HoloMap, GridSpace
 from .layout import Layout
 from .overlay import NdOverlay, Overlay
@@ -13,6 +23,160 @@ from .traversal import unique_dimkeys
 
 
 
+def _update_fingerprint(hasher, obj):
+    """
+    Feeds the content of an object into the supplied hash, descending
+    into the data and parameters of HoloViews objects and the
+    contents of containers. Instance names are excluded so that equal
+    objects share the same fingerprint.
+    """
+    if isinstance(obj, np.ndarray):
+        hasher.update(repr((obj.dtype.str, obj.shape)).encode('utf-8'))
+        if obj.dtype.hasobject:
+            for el in obj.flat: _update_fingerprint(hasher, el)
+        else:
+            hasher.update(np.ascontiguousarray(obj).view(np.uint8))
+    elif isinstance(obj, Dimensioned):
+        hasher.update(type(obj).__name__.encode('utf-8'))
+        for name, value in sorted(obj.get_param_values()):
+            if name == 'name': continue
+            hasher.update(name.encode('utf-8'))
+            _update_fingerprint(hasher, value)
+        _update_fingerprint(hasher, obj.data)
+    elif isinstance(obj, dict):
+        for key, value in obj.items():
+            _update_fingerprint(hasher, key)
+            _update_fingerprint(hasher, value)
+    elif isinstance(obj, (list, tuple)):
+        hasher.update(('%s%d' % (type(obj).__name__, len(obj))).encode('utf-8'))
+        for el in obj: _update_fingerprint(hasher, el)
+    else:
+        hasher.update(repr(obj).encode('utf-8'))
+
+
+def _nbytes(obj):
+    """
+    Estimates the memory held by the arrays in an object.
+    """
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    elif isinstance(obj, Dimensioned):
+        return _nbytes(obj.data)
+    elif isinstance(obj, dict):
+        return sum(_nbytes(v) for v in obj.values())
+    elif isinstance(obj, (list, tuple)):
+        return sum(_nbytes(v) for v in obj)
+    return 64
+
+
+
+class OperationCache(param.Parameterized):
+    """
+    An OperationCache holds the results of Operations keyed by a
+    digest of the operation, its parameters and the content of the
+    input, evicting the least recently used results once the arrays
+    held exceed the byte budget.
+
+    If a cache directory is supplied, results are also pickled to
+    disk so that they outlive evictions from memory and may be shared
+    between sessions. Note that parameters without a stable repr
+    (e.g. lambda functions) only produce hits within a session.
+    """
+
+    max_bytes = param.Integer(default=256*1024**2, bounds=(0, None), doc="""
+       The maximum number of bytes held by the results cached in
+       memory.""")
+
+    cache_dir = param.String(default=None, allow_None=True, doc="""
+       Optional directory in which results are pickled, acting as a
+       second tier behind the in-memory cache.""")
+
+    def __init__(self, **params):
+        super(OperationCache, self).__init__(**params)
+        self._entries = OrderedDict()
+        self.nbytes = 0
+        self.hits, self.misses = 0, 0
+
+
+    @classmethod
+    def digest(cls, operation, element, key=None):
+        """
+        Returns the digest identifying the result of applying the
+        operation (with its current parameter overrides) to the
+        element with the supplied key.
+        """
+        hasher = hashlib.sha1()
+        op_type = type(operation)
+        hasher.update(('%s.%s' % (op_type.__module__, op_type.__name__)).encode('utf-8'))
+        for name in sorted(operation.params()):
+            if name in operation._uncached_params: continue
+            hasher.update(name.encode('utf-8'))
+            _update_fingerprint(hasher, operation.p[name])
+        _update_fingerprint(hasher, key)
+        _update_fingerprint(hasher, element)
+        return hasher.hexdigest()
+
+
+    def _path(self, digest):
+        return os.path.join(self.cache_dir, digest + '.pkl')
+
+
+    def get(self, digest):
+        """
+        Returns the cached result for the digest or None.
+        """
+        if digest in self._entries:
+            self._entries[digest] = self._entries.pop(digest)
+            self.hits += 1
+            return self._entries[digest][0]
+        if self.cache_dir and os.path.isfile(self._path(digest)):
+            with open(self._path(digest), 'rb') as f:
+                result = pickle.load(f)
+            self._store(digest, result)
+            self.hits += 1
+            return result
+        self.misses += 1
+        return None
+
+
+    def _store(self, digest, result):
+        nbytes = _nbytes(result)
+        if nbytes > self.max_bytes:
+            return
+        self._entries[digest] = (result, nbytes)
+        self.nbytes += nbytes
+        while self.nbytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.nbytes -= evicted
+
+
+    def set(self, digest, result):
+        """
+        Caches the result under the digest.
+        """
+        if digest in self._entries:
+            self.nbytes -= self._entries.pop(digest)[1]
+        self._store(digest, result)
+        if self.cache_dir:
+            if not os.path.isdir(self.cache_dir):
+                os.makedirs(self.cache_dir)
+            with open(self._path(digest), 'wb') as f:
+                pickle.dump(result, f, protocol=2)
+
+
+    def clear(self, disk=False):
+        """
+        Clears the in-memory cache and optionally the pickled results.
+        """
+        self._entries.clear()
+        self.nbytes, self.hits, self.misses = 0, 0, 0
+        if disk and self.cache_dir and os.path.isdir(self.cache_dir):
+            for filename in os.listdir(self.cache_dir):
+                if filename.endswith('.pkl'):
+                    os.remove(os.path.join(self.cache_dir, filename))
+
+
+
 class Operation(param.ParameterizedFunction):
     """
     Base class for all Operation types.
@@ -22,6 +186,19 @@ class Operation(param.ParameterizedFunction):
        The group string used to identify the output of the
        Operation. By default this should match the operation name.""")
 
+    memoize = param.Boolean(default=False, doc="""
+       Whether to look up the output of the operation in the shared
+       OperationCache before computing it, caching any newly computed
+       output. Cached outputs are shared and should not be modified
+       in place.""")
+
+    # The cache shared by all Operations with memoize enabled
+    cache = OperationCache()
+
+    # Parameters that do not affect the output of the operation
+    _uncached_params = ['name', 'memoize', 'executor', 'workers', 'batch_size',
+                        'batch_bytes']
+
 
     @classmethod
     def search(cls, element, pattern):
@@ -65,6 +242,69 @@ class Operation(param.ParameterizedFunction):
 
 
 
+def _process_batch(args):
+    """
+    Processes a batch of elements in a worker process, recreating the
+    operation and its parameter overrides from the pickled arguments.
+    """
+    (operation_type, params, overrides, elements, keys) = args
+    operation = operation_type.instance(**params)
+    operation.p = param.ParamOverrides(operation, overrides)
+    return operation._process_batch(elements, keys)
+
+
+# Pools shared by all operations: a thread pool per number of workers
+# and the most recently used process pool, keyed by operation type and
+# number of workers (so that the workers are forked after the operation
+# type has been defined)
+_thread_pools = {}
+_process_pool = [None, None]
+_pool_lock = threading.Lock()
+_pool_state = threading.local()
+
+def _thread_pool(workers):
+    with _pool_lock:
+        if workers not in _thread_pools:
+            _thread_pools[workers] = ThreadPool(workers)
+        return _thread_pools[workers]
+
+
+def _process_pool_for(operation_type, workers):
+    with _pool_lock:
+        key, pool = _process_pool
+        if key != (operation_type, workers):
+            if pool is not None:
+                pool.close()
+                pool.join()
+            pool = Pool(workers)
+            _process_pool[:] = [(operation_type, workers), pool]
+        return pool
+
+
+def _in_pool_worker():
+    "Whether the current thread or process is an operation pool worker."
+    return getattr(_pool_state, 'worker', False) or current_process().daemon
+
+
+def _process_thread_batch(args):
+    "Processes a batch of elements on a thread pool worker."
+    (operation, elements, keys) = args
+    _pool_state.worker = True
+    try:
+        return operation._process_batch(elements, keys)
+    finally:
+        _pool_state.worker = False
+
+
+@atexit.register
+def _close_pools():
+    pools = list(_thread_pools.values()) + [_process_pool[1]]
+    for pool in [pool for pool in pools if pool is not None]:
+        pool.close()
+        pool.join()
+
+
+
 class ElementOperation(Operation):
     """
     An ElementOperation process an Element or HoloMap at the level of
@@ -72,6 +312,12 @@ class ElementOperation(Operation):
     input, a processed holomap is returned as output where the
     individual elements have been transformed accordingly. An
     ElementOperation may turn overlays in new elements or vice versa.
+
+    The elements of a HoloMap are processed in batches, which may be
+    distributed over a pool of threads or processes by setting the
+    executor parameter. Operations that can process several elements
+    at once (e.g. by stacking their arrays) may implement the
+    _process_batch method.
     """
 
     input_ranges = param.ClassSelector(default={},
@@ -84,6 +330,31 @@ class ElementOperation(Operation):
        first component is a Normalization.ranges list and the second
        component is Normalization.keys. """)
 
+    executor = param.ObjectSelector(default='serial',
+                                    objects=['serial', 'thread', 'process'], doc="""
+       Whether the elements of a HoloMap are processed serially or
+       distributed over a pool of threads or processes. Processes
+       avoid contention on the global interpreter lock but require
+       the operation, its parameters and the elements to be
+       picklable. The order of the output is always the order of the
+       input.""")
+
+    workers = param.Integer(default=None, allow_None=True, bounds=(1, None), doc="""
+       The number of workers in the thread or process pool, defaulting
+       to the number of CPUs.""")
+
+    batch_size = param.Integer(default=None, allow_None=True, bounds=(1, None), doc="""
+       The number of elements of a HoloMap passed to _process_batch at
+       once and the size of the chunks distributed to the workers. By
+       default, batches are limited to batch_bytes of element data,
+       and pools split the elements into at least four chunks per
+       worker.""")
+
+    batch_bytes = param.Integer(default=64*2**20, bounds=(1, None), doc="""
+       The approximate number of bytes of element data per batch when
+       no batch_size is set, bounding the memory used by operations
+       stacking the arrays of a batch.""")
+
 
     def _process(self, view, key=None):
         """
@@ -95,20 +366,134 @@ class ElementOperation(Operation):
         raise NotImplementedError
 
 
+    # Whether the output of _process_array shares the dimensions and
+    # bounds of the element the data originated from
+    _array_preserves_metadata = True
+
+    # The type of element _process_array accepts, matching the input
+    # validation of _process
+    _array_input_type = Element
+
+    def _process_array(self, data, element, key=None, out=None):
+        """
+        Optional array-level kernel allowing the operation to be fused
+        into a chain pipeline. Given the data of an element (which
+        may already have been transformed by preceding kernels), the
+        element the data originated from and the key, returns the
+        transformed data. If supplied, the kernel may write its result
+        into the out array (which may be the input data itself)
+        provided it has the required shape and dtype.
+        """
+        raise NotImplementedError
+
+
+    def _wrap_array(self, data, element):
+        """
+        Wraps the output of _process_array in an element, given the
+        element the data originated from.
+        """
+        return element.clone(data, group=self.p.group)
+
+
+    def _process_batch(self, elements, keys):
+        """
+        Process a list of elements with the corresponding keys,
+        returning a list of processed elements in the same order. By
+        default each element is passed to _process in turn.
+        """
+        return [self._process(el, key=k) for el, k in zip(elements, keys)]
+
+
+    def _process_items(self, items):
+        """
+        Processes a list of (key, element) pairs, returning the
+        processed (key, element) pairs in the original order. If
+        memoize is enabled, only the elements missing from the cache
+        are processed.
+        """
+        if not self.p.memoize:
+            return self._execute(items)
+        digests = [self.cache.digest(self, el, k) for k, el in items]
+        results = [self.cache.get(digest) for digest in digests]
+        missing = [i for i, result in enumerate(results) if result is None]
+        for i, (_, result) in zip(missing, self._execute([items[i] for i in missing])):
+            self.cache.set(digests[i], result)
+            results[i] = result
+        return list(zip([k for k, _ in items], results))
+
+
+    def _execute(self, items):
+        """
+        Processes a list of (key, element) pairs in batches using the
+        selected executor, returning the processed (key, element)
+        pairs in the original order.
+        """
+        keys = [k for k, _ in items]
+        elements = [el for _, el in items]
+        # Nested operations in pool workers are processed serially
+        parallel = len(items) > 1 and not _in_pool_worker()
+        executor = self.p.executor if parallel else 'serial'
+        workers = self.p.workers or cpu_count()
+        if self.p.batch_size:
+            batch_size = self.p.batch_size
+        else:
+            nbytes = self._element_bytes(elements[0]) if elements else 0
+            batch_size = max(self.p.batch_bytes // max(nbytes, 1), 1)
+            if executor != 'serial':
+                batch_size = min(batch_size, max(len(items) // (workers * 4), 1))
+        batches = [(elements[i:i+batch_size], keys[i:i+batch_size])
+                   for i in range(0, len(items), batch_size)]
+
+        if executor == 'serial':
+            processed = [self._process_batch(els, ks) for els, ks in batches]
+        elif executor == 'thread':
+            processed = _thread_pool(workers).map(_process_thread_batch,
+                                                  [(self, els, ks) for els, ks in batches])
+        else:
+            params = dict(self.get_param_values(onlychanged=True))
+            overrides = dict(self.p)
+            pool = _process_pool_for(type(self), workers)
+            processed = pool.map(_process_batch, [(type(self), params, overrides, els, ks)
+                                                  for els, ks in batches])
+        return list(zip(keys, [el for batch in processed for el in batch]))
+
+
+    @classmethod
+    def _element_bytes(cls, element):
+        "The number of bytes of array data held by an element."
+        arrays = element.traverse(lambda x: x.data, [Element])
+        return sum(getattr(data, 'nbytes', 0) for data in arrays)
+
+
     def process_element(self, element, key, **params):
         """
         The process_element method allows a single element to be
         operated on given an externally supplied key.
         """
         self.p = param.ParamOverrides(self, params)
-        return self._process(element, key)
+        return self._process_memoized(element, key)
+
+
+    def _process_memoized(self, element, key=None):
+        """
+        Processes a single element, using the cache if memoize is
+        enabled.
+        """
+        if not self.p.memoize:
+            return self._process(element, key)
+        digest = self.cache.digest(self, element, key)
+        result = self.cache.get(digest)
+        if result is None:
+            result = self._process(element, key)
+            self.cache.set(digest, result)
+        return result
 
 
     def __call__(self, element, **params):
         self.p = param.ParamOverrides(self, params)
 
         if isinstance(element, ViewableElement):
-            processed = self._process(element)
+            processed = self._process_memoized(element)
         elif isinstance(element, GridSpace):
             # Initialize an empty axis layout
             processed = GridSpace(None, label=element.label)
@@ -116,8 +501,7 @@ class ElementOperation(Operation):
             for pos, cell in element.items():
                 processed[pos] = self(cell, **params)
         elif isinstance(element, HoloMap):
-            mapped_items = [(k, self._process(el, key=k))
-                            for k, el in element.items()]
+            mapped_items = self._process_items(list(element.items()))
             refval = mapped_items[0][1]
             processed = element.clone(mapped_items,
                                       group=refval.group,
@@ -4,7 +4,9 @@ objects either to inspect the structure of their declared dimensions
 or mutate the matching elements.
 """
 
-from operator import itemgetter
+import math
+from operator import itemgetter, mul
+from functools import reduce
 
 from .dimension import Dimension
 
@@ -86,3 +88,34 @@ def bijective(keys):
                 return False
             store.append(subkey)
     return True
+
+
+def decimate_keys(keys, max_keys):
+    """
+    Decimates a set of keys by selecting every k-th value along each
+    dimension, such that at most max_keys combinations of the selected
+    values remain. The stride of the dimension with the most remaining
+    values is increased first, keeping the decimation balanced across
+    dimensions. Returns the lists of selected values per dimension.
+    """
+    ndims = len(keys[0]) if keys else 0
+    values = [[] for _ in range(ndims)]
+    seen = [set() for _ in range(ndims)]
+    for key in keys:
+        for i, v in enumerate(key):
+            if v not in seen[i]:
+                seen[i].add(v)
+                values[i].append(v)
+
+    strides = [1] * ndims
+    counts = [len(vals) for vals in values]
+    max_keys = max(1, max_keys)
+    while reduce(mul, counts, 1) > max_keys:
+        total = reduce(mul, counts, 1)
+        idx = counts.index(max(counts))
+        runner_up = sorted(counts)[-2] if ndims > 1 else 1
+        target = max(1, runner_up, int(counts[idx] * float(max_keys) / total))
+        target = min(target, counts[idx] - 1)
+        strides[idx] = int(math.ceil(len(values[idx]) / float(target)))
+        counts[idx] = int(math.ceil(len(values[idx]) / float(strides[idx])))
+    return [vals[::stride] for vals, stride in zip(values, strides)]
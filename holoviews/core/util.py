@@ -166,6 +166,59 @@ def is_number(obj):
     else: return False
 
 
+def hsv_to_rgb(hsv, out=None):
+    """
+    Vectorized conversion of an array of HSV values with shape
+    (..., 3) or (..., 4) to RGB, equivalent to applying
+    colorsys.hsv_to_rgb to every sample. Any alpha channel is passed
+    through unchanged. The result may optionally be written into a
+    preallocated output array (which may be the input array itself).
+    """
+    hsv = np.asarray(hsv)
+    if out is None:
+        dtype = hsv.dtype if hsv.dtype.kind == 'f' else np.float64
+        out = np.empty(hsv.shape, dtype=dtype)
+    h, s, v = hsv[..., 0], hsv[..., 1], hsv[..., 2]
+    i = np.floor(h*6.0)
+    f = h*6.0 - i
+    i = i.astype(int) % 6
+    p, q, t = v*(1.0-s), v*(1.0-s*f), v*(1.0-s*(1.0-f))
+    r = np.choose(i, [v, q, p, p, t, v])
+    g = np.choose(i, [t, v, v, q, p, p])
+    b = np.choose(i, [p, p, t, v, v, q])
+    if hsv.shape[-1] == 4 and out is not hsv:
+        out[..., 3] = hsv[..., 3]
+    out[..., 0], out[..., 1], out[..., 2] = r, g, b
+    return out
+
+
+def rgb_to_hsv(rgb, out=None):
+    """
+    Vectorized conversion of an array of RGB values with shape
+    (..., 3) or (..., 4) to HSV, equivalent to applying
+    colorsys.rgb_to_hsv to every sample. Any alpha channel is passed
+    through unchanged. The result may optionally be written into a
+    preallocated output array (which may be the input array itself).
+    """
+    rgb = np.asarray(rgb)
+    if out is None:
+        dtype = rgb.dtype if rgb.dtype.kind == 'f' else np.float64
+        out = np.empty(rgb.shape, dtype=dtype)
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    maxc = np.maximum(np.maximum(r, g), b)
+    minc = np.minimum(np.minimum(r, g), b)
+    delta = maxc - minc
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s = np.where(maxc > 0, delta / maxc, 0)
+        rc, gc, bc = [(maxc-c) / delta for c in (r, g, b)]
+    h = np.where(r == maxc, bc-gc, np.where(g == maxc, 2.0+rc-bc, 4.0+gc-rc))
+    h = np.where(delta > 0, (h/6.0) % 1.0, 0)
+    if rgb.shape[-1] == 4 and out is not rgb:
+        out[..., 3] = rgb[..., 3]
+    out[..., 0], out[..., 1], out[..., 2] = h, s, maxc
+    return out
+
+
 class ProgressIndicator(param.Parameterized):
     """
     Baseclass for any ProgressIndicator that indicates progress
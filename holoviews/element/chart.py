@@ -3,9 +3,14 @@ import numpy as np
 import param
 
 from ..core import OrderedDict, Dimension, NdMapping, Element2D, NdElement, HoloMap
+from ..core.index import SortedIndex, GridIndex
 from .tabular import ItemTable, Table
 
 
+class _SharedData(np.ndarray):
+    "Marks array views onto the data of a Chart, which are not copied."
+
+
 class Chart(Element2D):
     """
     The data held within an Array is a numpy array of shape (n, m).
@@ -23,8 +28,29 @@ class Chart(Element2D):
         Dimensions on Element2Ds determine the number of indexable
         dimensions.""")
 
+    spatial_index = param.Boolean(default=False, doc="""
+        Whether to build an index over the key dimensions, speeding
+        up slicing, selecting, sampling and closest lookups on large
+        datasets. The index is built lazily on the first query, using
+        a sorted index for a single key dimension and a uniform grid
+        for two key dimensions, and is reused until the data is
+        replaced.""")
+
+    monotonic = param.Boolean(default=None, allow_None=True, doc="""
+        Whether the values along the first key dimension are sorted
+        in ascending order. If None, this is detected on the first
+        query. On sorted data, range slices of elements with a single
+        key dimension return views onto the rows of its data and
+        slicing, sampling and closest lookups use binary search,
+        without requiring a spatial_index. Array input is copied,
+        so the data cannot change after the index is built.""")
+
     _null_value = np.array([[], []]).T # For when data is None
 
+    _index = None # Cached (data, settings, index) tuple
+
+    _index_params = ['spatial_index', 'monotonic'] # Not applicable to Tables
+
     def __init__(self, data, **params):
         settings = {}
         if isinstance(data, Chart):
@@ -33,7 +59,12 @@ class Chart(Element2D):
         elif isinstance(data, NdMapping) or (isinstance(data, list) and data
                                            and isinstance(data[0], Element2D)):
             data, settings = self._process_map(data)
-        data = list(data)
+        if isinstance(data, _SharedData):
+            data = data.view(np.ndarray)
+        elif isinstance(data, np.ndarray):
+            data = data.copy()
+        else:
+            data = list(data)
         data = self._null_value if (data is None) or (len(data) == 0) else data
         if len(data) and not isinstance(data, np.ndarray):
             data = np.array(data)
@@ -63,14 +94,97 @@ class Chart(Element2D):
         return data, settings
 
 
+    def clone(self, data=None, shared_data=True, *args, **overrides):
+        """
+        Clones share the data of the Chart, or the supplied views onto
+        it, rather than copying it as is done for other array input.
+        """
+        if data is None and shared_data:
+            data = self.data
+        if (isinstance(data, np.ndarray) and len(self.data)
+            and np.may_share_memory(data, self.data)):
+            data = data.view(_SharedData)
+        return super(Chart, self).clone(data, shared_data, *args, **overrides)
+
+
+    def __getstate__(self):
+        "The index is dropped when pickling and rebuilt on demand."
+        state = super(Chart, self).__getstate__()
+        state.pop('_index', None)
+        return state
+
+
+    def _get_index(self):
+        """
+        Returns the index over the key dimensions (if any), building
+        it if the data has changed since the index was last built.
+        """
+        if not len(self.data):
+            return None
+        settings = (self.spatial_index, self.monotonic)
+        if (self._index is None or self._index[0] is not self.data
+            or self._index[1] != settings):
+            self._index = (self.data, settings, self._build_index())
+        return self._index[2]
+
+
+    def _build_index(self):
+        """
+        Builds a sorted index for a single key dimension, which only
+        requires a sort if the data is not already sorted, or a grid
+        index for two key dimensions if spatial_index is enabled.
+        """
+        if self.ndims == 1:
+            xs = self.data[:, 0]
+            presorted = self.monotonic
+            if presorted is None:
+                presorted = bool(np.all(xs[1:] >= xs[:-1]))
+            if presorted or self.spatial_index:
+                return SortedIndex(xs, presorted=presorted)
+        elif self.spatial_index:
+            return GridIndex(self.data[:, 0], self.data[:, 1])
+        return None
+
+
+    def _index_rows(self, slices):
+        """
+        Looks up the rows selected by the supplied slices or values on
+        the index, returning None if no index is available or the
+        selection cannot be resolved by the index.
+        """
+        index = self._get_index()
+        if index is None:
+            return None
+        slices = slices + (slice(None),) * (self.ndims - len(slices))
+        if all(isinstance(slc, slice) for slc in slices):
+            ranges = [(slc.start if slc.start else None,
+                       slc.stop if slc.stop else None) for slc in slices]
+            return index.select(*ranges)
+        elif not any(isinstance(slc, slice) for slc in slices):
+            return index.lookup(*slices)
+        return None
+
+
     def closest(self, coords):
         """
         Given single or multiple x-values, returns the list
-        of closest actual samples.
+        of closest actual samples. For elements with two key
+        dimensions, (x, y) tuples return the closest (x, y)
+        samples.
         """
         if not isinstance(coords, list): coords = [coords]
+        index = self._get_index()
+        if self.ndims == 2 and all(isinstance(c, tuple) for c in coords):
+            xs, ys = self.data[:, 0], self.data[:, 1]
+            if index is not None:
+                idxs = [index.nearest(x, y) for x, y in coords]
+            else:
+                idxs = [np.argmin((xs-x)**2 + (ys-y)**2) for x, y in coords]
+            return [(xs[idx], ys[idx]) for idx in idxs]
         xs = self.data[:, 0]
-        idxs = [np.argmin(xs-coord) for coord in coords]
+        if index is not None and self.ndims == 1:
+            return list(xs[index.nearest(coords)])
+        idxs = [np.argmin(np.abs(xs-coord)) for coord in coords]
         return [xs[idx] for idx in idxs]
 
 
@@ -87,24 +201,27 @@ class Chart(Element2D):
             raise Exception("Slice must match number of key_dimensions.")
 
         data = self.data
+        rows = self._index_rows(slices)
+        if rows is not None:
+            data = data[rows]
         lower_bounds, upper_bounds = [], []
         for idx, slc in enumerate(slices):
             if isinstance(slc, slice):
                 start = slc.start if slc.start else -float("inf")
                 stop = slc.stop if slc.stop else float("inf")
 
-                clip_start = start <= data[:, idx]
-                clip_stop = data[:, idx] < stop
-                data = data[np.logical_and(clip_start, clip_stop), :]
-                lbound = self.extents[idx]
-                ubound = self.extents[self.ndims:][idx]
-                lower_bounds.append(start if slc.start else lbound)
-                upper_bounds.append(stop if slc.stop else ubound)
+                if rows is None:
+                    clip_start = start <= data[:, idx]
+                    clip_stop = data[:, idx] < stop
+                    data = data[np.logical_and(clip_start, clip_stop), :]
+                # Extents are only computed for open-ended slices
+                lower_bounds.append(start if slc.start else self.extents[idx])
+                upper_bounds.append(stop if slc.stop else self.extents[self.ndims:][idx])
             else:
-                data_index = data[:, idx] == slc
-                if not any(data_index):
+                if rows is None:
+                    data = data[data[:, idx] == slc, :]
+                if not len(data):
                     raise IndexError("Value %s not found in data." % slc)
-                data = data[data_index, :]
         if not any(isinstance(slc, slice) for slc in slices):
             return data
         if self.ndims == 1:
@@ -131,7 +248,9 @@ class Chart(Element2D):
         sample_data = OrderedDict()
         for sample in samples:
             sample_data[sample] = self[sample]
-        return Table(sample_data, **dict(self.get_param_values(onlychanged=True)))
+        params = dict(self.get_param_values(onlychanged=True))
+        for p in self._index_params: params.pop(p, None)
+        return Table(sample_data, **params)
 
 
     def reduce(self, dimensions=None, function=None, **reduce_map):
@@ -157,6 +276,7 @@ class Chart(Element2D):
             raise Exception("Dimension %s not found in %s" % (dim, type(self).__name__))
         params = dict(self.get_param_values(onlychanged=True), value_dimensions=self.value_dimensions,
                       key_dimensions=[])
+        for p in self._index_params: params.pop(p, None)
         return ItemTable(reduced_data, **params)
 
 
@@ -277,8 +397,9 @@ class Histogram(Element2D):
             values = values[:, 0]
             edges = values[:, 1]
         else:
-            values = np.array(values)
-            edges = np.array(edges, dtype=np.float)
+            # Avoids copying arrays, allowing values to be views
+            values = np.asarray(values)
+            edges = np.asarray(edges, dtype=np.float64)
 
         if len(edges) == len(values):
             widths = list(set(np.diff(edges)))
@@ -286,7 +407,7 @@ class Histogram(Element2D):
                 width = widths[0]
             else:
                 raise Exception('Centered bins have to be of equal width.')
-            edges -= width/2.
+            edges = edges - width/2.
             edges = np.concatenate([edges, [edges[-1]+width]])
         return values, edges, settings
 
@@ -414,8 +535,7 @@ class VectorField(Points):
     _min_dims = 3                              # Minimum number of columns
 
     def __init__(self, data, **params):
-        if not isinstance(data, np.ndarray):
-            data = np.array([
-                [el for el in (col.flat if isinstance(col,np.ndarray) else col)]
-                for col in data]).T
+        if data is not None and not isinstance(data, (np.ndarray, Chart, NdMapping)):
+            columns = [np.asarray(col).ravel() for col in data]
+            data = np.column_stack(columns) if columns else []
         super(VectorField, self).__init__(data, **params)
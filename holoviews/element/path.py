@@ -26,6 +26,13 @@ class Path(Element2D):
 
     Each point in the path array corresponds to an X,Y coordinate
     along the specified path.
+
+    Internally the paths are packed into a single array of vertices
+    and an array of offsets, where the vertices of the ith path are
+    given by vertices[offsets[i]:offsets[i+1]]. A Path may also be
+    constructed directly from such a (vertices, offsets) tuple. The
+    data attribute supplies the list of paths as views into the
+    packed vertices.
     """
 
     key_dimensions = param.List(default=[Dimension('x'), Dimension('y')],
@@ -34,34 +41,106 @@ class Path(Element2D):
         of a string or dimension object.""")
 
 
-    def __init__(self, data, **params):
-        if not isinstance(data, list):
+    @classmethod
+    def _pack(cls, data):
+        """
+        Packs the supplied list of paths or (vertices, offsets) tuple
+        into a single array of vertices and an offsets array.
+        """
+        if isinstance(data, tuple):
+            vertices, offsets = (np.asarray(el) for el in data)
+            if not (vertices.ndim == 2 and vertices.shape[1] == 2 and offsets.ndim == 1
+                    and offsets.dtype.kind in 'iu' and len(offsets)
+                    and offsets[0] == 0 and offsets[-1] == len(vertices)
+                    and (np.diff(offsets) >= 0).all()):
+                raise ValueError("Path data tuple must supply (vertices, offsets) "
+                                 "with Nx2 vertices and increasing integer offsets "
+                                 "from 0 to the number of vertices")
+            return vertices, offsets.astype(int)
+        elif not isinstance(data, list):
             raise ValueError("Path data must be a list paths (Nx2 coordinates)")
-        elif len(data) >= 1:
-            data = [np.array(p) if not isinstance(p, np.ndarray) else p for p in data ]
-        super(Path, self).__init__(data, **params)
+        paths = [np.array(p) if not isinstance(p, np.ndarray) else p for p in data]
+        paths = [p.reshape(-1, 2) if p.ndim < 2 else p for p in paths]
+        offsets = np.concatenate([[0], np.cumsum([len(p) for p in paths])]).astype(int)
+        vertices = np.concatenate(paths) if paths else np.zeros((0, 2))
+        return vertices, offsets
+
+
+    @property
+    def data(self):
+        if self._paths is None:
+            self._paths = (np.split(self.vertices, self.offsets[1:-1])
+                           if len(self) else [])
+        return self._paths
+
+
+    @data.setter
+    def data(self, data):
+        self.vertices, self.offsets = self._pack(data)
+        self._paths = None
+
+
+    def clone(self, data=None, shared_data=True, *args, **overrides):
+        if data is None and shared_data:
+            data = (self.vertices, self.offsets)
+        return super(Path, self).clone(data, shared_data, *args, **overrides)
+
+
+    def __getitem__(self, slices):
+        """
+        Slices the Path along the x- and y-dimensions, retaining only
+        the vertices within the selected region. Paths leaving the
+        region are split into separate paths.
+        """
+        if slices is ():
+            return self
+        if not isinstance(slices, tuple): slices = (slices, slice(None))
+        if len(slices) != 2 or not all(isinstance(s, slice) for s in slices):
+            raise IndexError('Indexing requires x- and y-slice ranges.')
+
+        extents = self.extents
+        mask = np.ones(len(self.vertices), dtype=bool)
+        lower_bounds, upper_bounds = [], []
+        for idx, slc in enumerate(slices):
+            lbound, ubound = extents[idx], extents[2+idx]
+            if slc.start is not None:
+                mask &= slc.start <= self.vertices[:, idx]
+                lbound = slc.start
+            if slc.stop is not None:
+                mask &= self.vertices[:, idx] < slc.stop
+                ubound = slc.stop
+            lower_bounds.append(lbound)
+            upper_bounds.append(ubound)
+
+        # A new path starts at each retained vertex which starts a
+        # path or whose predecessor was discarded
+        starts = np.zeros(len(mask), dtype=bool)
+        starts[self.offsets[:-1][np.diff(self.offsets) > 0]] = True
+        starts[1:] |= ~mask[:-1]
+        kept_starts = np.flatnonzero((starts & mask)[mask])
+        offsets = np.concatenate([kept_starts, [mask.sum()]])
+        return self.clone((self.vertices[mask], offsets),
+                          extents=tuple(lower_bounds + upper_bounds))
 
 
     def __len__(self):
-        return len(self.data)
+        return len(self.offsets) - 1
 
     @property
     def xlim(self):
         if self._xlim: return self._xlim
-        elif len(self):
-            xmin = min(min(c[:, 0]) for c in self.data)
-            xmax = max(max(c[:, 0]) for c in self.data)
-            return xmin, xmax
+        elif len(self.vertices):
+            xs = self.vertices[:, 0]
+            return xs.min(), xs.max()
         else:
             return None
 
     @property
     def ylim(self):
         if self._ylim: return self._ylim
-        elif len(self):
-            ymin = min(min(c[:, 0]) for c in self.data)
-            ymax = max(max(c[:, 0]) for c in self.data)
-            return ymin, ymax
+        elif len(self.vertices):
+            ys = self.vertices[:, 1]
+            return ys.min(), ys.max()
         else:
             return None
 
@@ -69,10 +148,7 @@ class Path(Element2D):
         dim_idx = self.get_dimension_index(dimension)
         if dim_idx >= len(self.dimensions()):
             return super(Path, self).dimension_values(dimension)
-        values = []
-        for contour in self.data:
-            values.append(contour[:, dim_idx])
-        return np.concatenate(values) if values else []
+        return self.vertices[:, dim_idx]
 
 
 
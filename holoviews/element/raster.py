@@ -1,11 +1,11 @@
 from itertools import product
 import numpy as np
-import colorsys
 import param
 
 from ..core import OrderedDict, Dimension, NdMapping, Element2D, Overlay
 from ..core.boundingregion import BoundingRegion, BoundingBox
 from ..core.sheetcoords import SheetCoordinateSystem, Slice
+from ..core.util import hsv_to_rgb
 from .chart import Curve
 from .tabular import Table
 
@@ -557,19 +557,11 @@ class HSV(RGB):
         If an alpha channel is supplied, the defined alpha_dimension
         is automatically appended to this list.""")
 
-    hsv_to_rgb = np.vectorize(colorsys.hsv_to_rgb)
-
     @property
     def rgb(self):
         """
         Conversion from HSV to RGB.
         """
-        hsv = self.hsv_to_rgb(self.data[:,:,0],
-                              self.data[:,:,1],
-                              self.data[:,:,2])
-        if len(self.value_dimensions) == 4:
-            hsv += (self.data[:,:,3],)
-
-        return RGB(np.dstack(hsv), bounds=self.bounds,
+        return RGB(hsv_to_rgb(self.data), bounds=self.bounds,
                    group=self.group,
                    label=self.label)
@@ -12,6 +12,7 @@ from ..core import Dimension, ViewableElement, UniformNdMapping,\
  GridSpace, AttrTree, Layout, HoloMap
 from ..core.util import ProgressIndicator
 from ..core.io import Reference
+from ..operation.element import HistogramAccumulator
 
 Time = Dimension("Time", type=param.Dynamic.time_fn.time_type)
 
@@ -636,3 +637,7 @@ class Collector(AttrTree):
                 lines.append(value_line % ('', val))
         return '\n'.join(lines)
 
+
+# Accumulators draw the samples arriving between collections from
+# their source, collecting a snapshot of the updated distribution
+Collector.for_type(HistogramAccumulator, lambda acc, *args, **kwargs: acc(**kwargs))
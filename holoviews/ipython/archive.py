@@ -3,8 +3,13 @@ Implements NotebookArchive used to automatically capture notebook data
 and export it to disk via the display hooks.
 """
 
-import time, os, traceback
+import time, os, traceback, threading, shutil, pickle
 import io
+from hashlib import sha256
+import numpy as np
+
+try:    from queue import Queue
+except: from Queue import Queue # Python 2
 
 from IPython.nbformat import reader
 from IPython.display import Javascript, display
@@ -13,7 +18,8 @@ from IPython.nbconvert.preprocessors import Preprocessor
 from IPython.nbconvert import HTMLExporter
 
 import param
-from ..core.io import FileArchive, Pickler
+from ..core import OrderedDict, Element
+from ..core.io import FileArchive, Exporter, Pickler
 from ..core.options import Store
 from ..plotting import HTML_TAGS
 
@@ -38,6 +44,45 @@ except:
         return nb
 
 
+def _hash_data(hashfn, data):
+    """
+    Updates the hash with the supplied data, hashing the buffers of
+    numeric arrays in place and pickling any other data.
+    """
+    if isinstance(data, np.ndarray) and data.dtype.kind in 'biufc':
+        hashfn.update(repr((data.dtype.str, data.shape)).encode('utf-8'))
+        hashfn.update(np.ascontiguousarray(data))
+    elif isinstance(data, (list, tuple)):
+        hashfn.update(repr((type(data).__name__, len(data))).encode('utf-8'))
+        for item in data:
+            _hash_data(hashfn, item)
+    else:
+        hashfn.update(pickle.dumps(data, 2))
+
+
+def content_hash(obj):
+    """
+    Returns a hash of the data, parameters and options of all the
+    components of a HoloViews object, which is unaffected by the
+    automatically generated object names. Returns None if the
+    object holds data that cannot be hashed.
+    """
+    hashfn = sha256()
+    def update(component):
+        params = [(k, v) for k, v in sorted(component.get_param_values()) if k != 'name']
+        options = [Store.lookup_options(component, group).kwargs
+                   for group in ['plot', 'style', 'norm']]
+        hashfn.update(repr((type(component).__name__, params, options)).encode('utf-8'))
+        data = component.data if isinstance(component, Element) else list(component.data.keys())
+        _hash_data(hashfn, data)
+    try:
+        obj.traverse(update)
+    except Exception:
+        return None
+    return hashfn.hexdigest()
+
+
+
 class NotebookArchive(FileArchive):
     """
     FileArchive that can automatically capture notebook data via the
@@ -68,6 +113,19 @@ class NotebookArchive(FileArchive):
         for the notebook name field as {notebook}.""")
 
 
+    incremental = param.Boolean(default=False, doc="""
+        Whether to export each captured object as soon as it is
+        displayed, reusing the display render where possible, with
+        background workers writing its files directly to the export
+        directory. Objects unchanged since they were exported, as
+        determined by their content hash, are skipped and export then
+        only writes the notebook snapshot. Incremental exports are
+        always written to a directory, regardless of pack.""")
+
+    workers = param.Integer(default=1, bounds=(1, None), doc="""
+        The number of background threads writing the files of the
+        captured objects in incremental mode.""")
+
     auto = param.Boolean(False)
 
     # Used for debugging to view Exceptions raised from Javascript
@@ -83,12 +141,19 @@ class NotebookArchive(FileArchive):
         self.export_success = None
 
         self._auto = False
+        # The list of html displays substituted by each file
         self._replacements = {}
         self._notebook_data = None
         self._timestamp = None
         self._tags = {val[0]:val[1] for val in HTML_TAGS.values()
                       if isinstance(val, tuple) and len(val)==2}
 
+        # State of incremental exports
+        self._lock = threading.Lock()
+        self._queue = Queue()
+        self._workers = []
+        self._reset_incremental()
+
         keywords = ['%s=%s' % (k, v.__class__.__name__) for k,v in self.params().items()]
         self.auto.__func__.__doc__ = 'auto(enabled=Boolean, %s)' % ', '.join(keywords)
 
@@ -122,6 +187,8 @@ class NotebookArchive(FileArchive):
         cmd = (kernel + nbname + nbcmd + "kernel.execute(name_cmd); ")
         display(Javascript(cmd))
         time.sleep(0.5)
+        self._queue.join()
+        self._reset_incremental()
         self._auto=enabled
         self.set_param(**kwargs)
 
@@ -135,8 +202,7 @@ class NotebookArchive(FileArchive):
         Get the current notebook data and export.
         """
         if self.skip_notebook_export:
-            super(NotebookArchive, self).export(timestamp=self._timestamp,
-                                                info={'notebook':self.notebook_name})
+            self._export_files()
             return
 
         self.export_success = None
@@ -163,13 +229,122 @@ class NotebookArchive(FileArchive):
     def add(self, obj=None, filename=None, data=None, info={}, html=None):
         "Similar to FileArchive.add but accepts html strings for substitution"
         initial_last_key = list(self._files.keys())[-1] if len(self) else None
-        if self._auto:
+        if self._auto and self.incremental and obj is not None and data is None:
+            self._queue_export(obj, filename, dict(info, notebook=self.notebook_name), html)
+        elif self._auto:
             super(NotebookArchive, self).add(obj, filename, data,
                                              info=dict(info, notebook=self.notebook_name))
             # Only add substitution if file successfully added to archive.
             new_last_key = list(self._files.keys())[-1] if len(self) else None
             if new_last_key != initial_last_key:
-                self._replacements[new_last_key] = html
+                self._replacements[new_last_key] = [html]
+
+
+    def _reset_incremental(self):
+        "Starts a new incremental export."
+        self._output_dir = None
+        self._exported = OrderedDict()
+        self._hashes = {}
+
+
+    def _existing_keys(self):
+        return list(self._files.keys()) + list(self._exported.keys())
+
+
+    def _queue_export(self, obj, filename, info, html):
+        """
+        Runs the exporters on the object, queuing the exported files
+        to be written by the background workers, unless an identical
+        object was already exported under the same name, in which
+        case the html is only added to the substitutions of the files
+        already exported. The exporters run
+        while the object is displayed, reusing the display render and
+        keeping rendering on the main thread.
+        """
+        digest = content_hash(obj)
+        if digest is not None:
+            digest = repr((digest, filename, sorted(info.items())))
+            keys = self._hashes.get(digest)
+            if keys is not None:
+                if keys:
+                    self._replacements[keys[-1]].append(html)
+                return
+        try:
+            entries = []
+            for exporter in self.exporters:
+                rendered = exporter(obj)
+                if rendered is not None:
+                    entries.append((rendered[0], dict(info, **rendered[1])))
+        except:
+            self.traceback = traceback.format_exc()
+            return
+        keys = []
+        with self._lock:
+            for entry in entries:
+                key = self._compute_filename(obj, entry[1], filename=filename)
+                self._exported[key] = entry[1]
+                keys.append(key)
+        if digest is not None:
+            self._hashes[digest] = keys
+        if keys:
+            self._replacements[keys[-1]] = [html]
+        while len(self._workers) < self.workers:
+            worker = threading.Thread(target=self._export_worker)
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+        for key, entry in zip(keys, entries):
+            self._queue.put((key, entry))
+
+
+    def _export_worker(self):
+        "Writes the queued files of the exported objects to disk."
+        while True:
+            (key, entry) = self._queue.get()
+            try:
+                self._write_file(key, entry)
+            except:
+                self.traceback = traceback.format_exc()
+            finally:
+                self._queue.task_done()
+
+
+    def _write_file(self, key, entry):
+        """
+        Writes an entry to the incremental export directory, which is
+        created (or replaced) on the first write of the export.
+        """
+        tstamp = time.strftime(self.timestamp_format, self._timestamp)
+        fields = {'timestamp':tstamp, 'notebook':self.notebook_name}
+        with self._lock:
+            if self._output_dir is None:
+                root = os.path.abspath(self.root)
+                export_name = self._format(self.export_name, fields)
+                output_dir = os.path.join(root, self._unique_name(export_name, '', root)[0])
+                if os.path.isdir(output_dir):
+                    shutil.rmtree(output_dir)
+                os.makedirs(output_dir)
+                self._output_dir = output_dir
+        (basename, ext) = key
+        filename = self._truncate_name(self._format(basename, fields), ext)
+        with open(os.path.join(self._output_dir, filename), 'wb') as f:
+            f.write(Exporter.encode(entry))
+
+
+    def _export_files(self):
+        """
+        Exports the archived files. In incremental mode, waits for the
+        background workers and writes the remaining files, e.g. the
+        notebook snapshot, to the export directory.
+        """
+        if not self.incremental:
+            super(NotebookArchive, self).export(timestamp=self._timestamp,
+                                                info={'notebook':self.notebook_name})
+            return
+        self._queue.join()
+        for key, entry in self._files.items():
+            self._write_file(key, entry)
+        self._files = OrderedDict()
 
 
     # The following methods are executed via JavaScript and so fail
@@ -200,10 +375,11 @@ class NotebookArchive(FileArchive):
         try:
             tstamp = time.strftime(self.timestamp_format, self._timestamp)
             substitutions = {}
-            for (basename, ext), entry in self._files.items():
-                (_, info) = entry
-                html_key = self._replacements.get((basename, ext), None)
-                if html_key is None: continue
+            self._queue.join()
+            entries = [(key, info) for key, (_, info) in self._files.items()]
+            for (basename, ext), info in entries + list(self._exported.items()):
+                html_keys = self._replacements.get((basename, ext), [])
+                if not html_keys: continue
                 filename = self._format(basename, {'timestamp':tstamp,
                                                    'notebook':self.notebook_name})
                 fpath = filename+(('.%s' % ext) if ext else '')
@@ -215,7 +391,8 @@ class NotebookArchive(FileArchive):
                 else:
                     link_html = self._format(self._tags[info['mime_type']],
                                              {'src':fpath, 'mime_type':info['mime_type']})
-                    substitutions[html_key] = (link_html, fpath)
+                    for html_key in html_keys:
+                        substitutions[html_key] = (link_html, fpath)
 
             node = self._get_notebook_node()
             html = self._generate_html(node, substitutions)
@@ -234,8 +411,7 @@ class NotebookArchive(FileArchive):
                                                                  'mime_type':'text/json',
                                                                  'notebook':self.notebook_name})
             # If store cleared_notebook... save here
-            super(NotebookArchive, self).export(timestamp=self._timestamp,
-                                                info={'notebook':self.notebook_name})
+            self._export_files()
         except:
             self.traceback = traceback.format_exc()
         else:
@@ -9,7 +9,7 @@ try:    from matplotlib import animation
 except: animation = None
 
 from functools import wraps
-import sys, traceback, base64
+import sys, traceback, base64, uuid, threading
 
 try:
     import mpld3
@@ -22,14 +22,15 @@ except:
     new_figure_manager_given_figure = None
 
 import param
+from IPython.display import HTML
 
 from ..core.options import Store
-from ..core import Element, ViewableElement, HoloMap, AdjointLayout, NdLayout,\
-    NdOverlay, GridSpace, Layout, Overlay
-from ..core.traversal import unique_dimkeys, bijective
+from ..core import Element, ViewableElement, Dimensioned, HoloMap, AdjointLayout, NdLayout,\
+    NdOverlay, GridSpace, Layout, Overlay, OrderedDict
+from ..core.traversal import bijective, decimate_keys
 from ..element import Raster
 from ..plotting import LayoutPlot, GridPlot, RasterGridPlot
-from ..plotting import ANIMATION_OPTS, HTML_TAGS, opts, get_plot_size
+from ..plotting import ANIMATION_OPTS, HTML_TAGS, RenderProfiler, opts, get_plot_size, render_lock
 from .magics import OutputMagic, OptsMagic
 from .widgets import SelectionWidget, ScrubberWidget
 
@@ -37,21 +38,72 @@ from .archive import notebook_archive
 
 OutputMagic.ANIMATION_OPTS = ANIMATION_OPTS
 
+# Records the (data, format, dpi) rendered by the display hook active
+# in the current thread, allowing the data to be reused for output
+_capture = threading.local()
+
 # To assist with debugging of display hooks
 ENABLE_TRACEBACKS=True
 
+# Objects displayed as previews, which may be loaded in full on
+# demand, indexed by the id of the preview. Only the most recent
+# MAX_PREVIEWS previews may be loaded.
+previews = OrderedDict()
+MAX_PREVIEWS = 10
+
+PREVIEW_HTML = """
+<div id="hv_preview%(id)s">
+<b>Preview of %(frames)d out of %(total)d frames (max_frames=%(max_frames)d)</b>
+<button id="hv_preview_button%(id)s">Load all frames</button></br>
+%(html)s
+</div>
+<script>
+$("#hv_preview_button%(id)s").click(function() {
+    var callbacks = {iopub: {output: function(msg) {
+        var data = msg.content.data;
+        if(data !== undefined && data["text/html"] !== undefined) {
+            $("#hv_preview%(id)s").html(data["text/html"]);
+        }
+    }}};
+    var cmd = "import holoviews.ipython.display_hooks as hooks; hooks.load_preview('%(id)s')";
+    IPython.notebook.kernel.execute(cmd, callbacks, {silent: false});
+});
+</script>
+"""
+
 
 #==================#
 # Helper functions #
 #==================#
 
 
+def record_rendered(data, fmt, dpi):
+    "Records data rendered while a display hook is active."
+    rendered = getattr(_capture, 'rendered', None)
+    if rendered is not None:
+        rendered.append((data, fmt, dpi))
+
+
+def reuse_rendered(element, rendered):
+    """
+    Returns a context manager within which the data rendered for
+    display is reused when rendering the element for file output or
+    the notebook archive. Reuse is only possible when the display
+    rendered a single figure or animation of the full element.
+    """
+    if rendered is None or len(rendered) != 1 or not isinstance(element, Dimensioned):
+        return Store.renderer.reusing(None)
+    (data, fmt, dpi) = rendered[0]
+    return Store.renderer.reusing(element, data, fmt, OutputMagic.options['size'], dpi)
+
+
 def animate(anim, dpi, writer, fmt, anim_kwargs, extra_args):
     if extra_args != []:
         anim_kwargs = dict(anim_kwargs, extra_args=extra_args)
 
     renderer = Store.renderer.instance(dpi=dpi)
     data = renderer.anim_data(anim, fmt, writer, **anim_kwargs)
+    record_rendered(data, fmt, dpi if dpi else mpl.rcParams['savefig.dpi'])
     b64data = base64.b64encode(data).decode("utf-8")
     (mime_type, tag) = HTML_TAGS[fmt]
     src = HTML_TAGS['base64'].format(mime_type=mime_type, b64=b64data)
@@ -99,11 +151,60 @@ def max_frame_warning(max_frames):
                      "[Total item frames exceeds max_frames on OutputMagic (%d)]"
                      % max_frames)
 
-def process_object(obj):
+def decimate(obj, dimensions, keys, max_frames):
+    """
+    Returns a copy of the object keeping only every k-th value along
+    each of the supplied key dimensions, such that at most max_frames
+    of the supplied keys remain.
+    """
+    selected = dict(zip([d.name for d in dimensions],
+                        [set(vals) for vals in decimate_keys(keys, max_frames)]))
+    def select(hmap):
+        names = [d.name for d in hmap.key_dimensions]
+        return hmap.clone([(k, v) for k, v in hmap.data.items()
+                           if all(val in selected.get(name, [val])
+                                  for name, val in zip(names, k))])
+    return obj.map(select, [HoloMap])
+
+
+def display_preview(obj, plot_fn, dimensions, keys, max_frames, widget_mode):
+    """
+    Displays a decimated preview of an object with more frames than
+    max_frames. If widgets are used, all frames may be loaded on
+    demand into a live widget, which renders each frame as it is
+    selected.
+    """
+    if OutputMagic.options['holomap'] == 'repr': return None
+    # The decimated preview must not be reused to output the object
+    _capture.rendered = None
+    plot = plot_fn(decimate(obj, dimensions, keys, max_frames))
+    if widget_mode is None:
+        return ('<b>Preview of %d out of %d frames (max_frames=%d)</b></br>%s'
+                % (len(plot), len(keys), max_frames, render(plot)))
+    preview_id = uuid.uuid4().hex
+    previews[preview_id] = (obj, plot_fn)
+    while len(previews) > MAX_PREVIEWS:
+        previews.popitem(last=False)
+    return PREVIEW_HTML % dict(id=preview_id, frames=len(plot), total=len(keys),
+                               max_frames=max_frames, html=display_widgets(plot))
+
+
+def load_preview(preview_id):
+    """
+    Returns a live widget displaying all the frames of a previewed
+    object, to be displayed in place of the preview.
+    """
+    if preview_id not in previews:
+        return HTML("<b>Preview expired, display the object again to load all frames</b>")
+    obj, plot_fn = previews.pop(preview_id)
+    return HTML(SelectionWidget(plot_fn(obj), embed=False)())
+
+
+def process_object(obj, estimate=None):
     "Hook to process the object currently being displayed."
     invalid_options = OptsMagic.process_element(obj)
     if invalid_options: return invalid_options
-    OutputMagic.info(obj)
+    OutputMagic.info(obj, estimate)
 
 
 def render(plot):
@@ -140,8 +241,26 @@ def display_widgets(plot):
         return SelectionWidget(plot, embed=False)()
 
 
-def display_figure(fig, message=None, max_width='100%'):
-    "Display widgets applicable to the specified element"
+def figure_bytes(fig, figure_format, dpi, close=True):
+    """
+    Renders the figure to raw image data in the supplied format on
+    its canvas, closing it in pyplot unless close is disabled.
+    """
+    renderer = Store.renderer.instance(dpi=dpi)
+    figdata = renderer.figure_data(fig, figure_format)
+    record_rendered(figdata, figure_format, mpl.rcParams['savefig.dpi'])
+    if figure_format=='svg':
+        figdata = figdata.encode("utf-8")
+    if close: plt.close(fig)
+    return figdata
+
+
+def display_figure(fig, message=None, max_width='100%', close=True):
+    """
+    Display widgets applicable to the specified element. Figures that
+    are not managed by pyplot, e.g. frames rendered on background
+    threads, should be displayed with close disabled.
+    """
     if OutputMagic.options['fig'] == 'repr': return None
 
     figure_format = OutputMagic.options['fig']
@@ -158,15 +277,12 @@ def display_figure(fig, message=None, max_width='100%'):
         mpld3.plugins.connect(fig, mpld3.plugins.MousePosition(fontsize=14))
         html = "<center>" + mpld3.fig_to_html(fig) + "<center/>"
     else:
-        renderer = Store.renderer.instance(dpi=dpi)
-        figdata = renderer.figure_data(fig, figure_format)
-        if figure_format=='svg':
-            figdata = figdata.encode("utf-8")
+        figdata = figure_bytes(fig, figure_format, dpi, close)
         b64 = base64.b64encode(figdata).decode("utf-8")
         (mime_type, tag) = HTML_TAGS[figure_format]
         src = HTML_TAGS['base64'].format(mime_type=mime_type, b64=b64)
         html = tag.format(src=src)
-    plt.close(fig)
+    if close: plt.close(fig)
     return html if (message is None) else '<b>%s</b></br>%s' % (message, html)
 
 
@@ -187,22 +303,32 @@ def display_hook(fn):
             map_format  = OutputMagic.options['holomap']
             # If widget_mode is None, widgets are not being used
             widget_mode = (widget_mode if map_format in OutputMagic.inbuilt_formats else None)
-            html = fn(element,
-                      size=OutputMagic.options['size'],
-                      dpi=OutputMagic.options['dpi'],
-                      max_frames=OutputMagic.options['max_frames'],
-                      max_branches = OutputMagic.options['max_branches'],
-                      map_format = map_format,
-                      widget_mode = widget_mode,
-                      **kwargs)
-            notebook_archive.add(element, html=html)
-            keys = ['fig', 'holomap', 'size', 'fps', 'dpi']
-            filename = OutputMagic.options['filename']
-            if filename:
-                options = {k:OutputMagic.options[k] for k in keys}
-                if options['holomap']  in OutputMagic.inbuilt_formats:
-                    options['holomap'] = None
-                Store.renderer.instance(**options).save(element, filename)
+            # Rendering is serialized with widget frames rendered on
+            # background threads
+            with render_lock:
+                _capture.rendered = []
+                try:
+                    with RenderProfiler.stage('display', element):
+                        html = fn(element,
+                                  size=OutputMagic.options['size'],
+                                  dpi=OutputMagic.options['dpi'],
+                                  max_frames=OutputMagic.options['max_frames'],
+                                  max_branches = OutputMagic.options['max_branches'],
+                                  map_format = map_format,
+                                  widget_mode = widget_mode,
+                                  **kwargs)
+                finally:
+                    rendered, _capture.rendered = _capture.rendered, None
+                with reuse_rendered(element, rendered):
+                    notebook_archive.add(element, html=html)
+                    keys = ['fig', 'holomap', 'size', 'fps', 'dpi']
+                    filename = OutputMagic.options['filename']
+                    if filename:
+                        options = {k:OutputMagic.options[k] for k in keys}
+                        if options['holomap']  in OutputMagic.inbuilt_formats:
+                            options['holomap'] = None
+                        with RenderProfiler.stage('save', element):
+                            Store.renderer.instance(**options).save(element, filename)
 
             return html
         except:
@@ -231,17 +357,19 @@ def element_display(element, size, **kwargs):
 @display_hook
 def map_display(vmap, size, map_format, max_frames, widget_mode, **kwargs):
     if not isinstance(vmap, HoloMap): return None
-    info = process_object(vmap)
+    estimate = OutputMagic.estimate(vmap)
+    info = process_object(vmap, estimate)
     if info: return info
     if vmap.type not in Store.registry:  return None
-    mapplot = Store.registry[vmap.type](vmap,
-                                        **opts(vmap, get_plot_size(vmap,size)))
-    if len(mapplot) == 0:
+    dimensions, keys, nframes, _ = estimate
+    plot_fn = lambda obj: Store.registry[obj.type](obj, **opts(obj, get_plot_size(obj, size)))
+    if nframes == 0:
         return sanitize_HTML(vmap)
-    elif len(mapplot) > max_frames:
-        max_frame_warning(max_frames)
-        return sanitize_HTML(vmap)
-    elif len(mapplot) == 1:
+    elif nframes > max_frames:
+        return display_preview(vmap, plot_fn, dimensions, keys, max_frames, widget_mode)
+
+    mapplot = plot_fn(vmap)
+    if len(mapplot) == 1:
         fig = mapplot()
         return display_figure(fig)
     elif widget_mode is not None:
@@ -254,21 +382,22 @@ def map_display(vmap, size, map_format, max_frames, widget_mode, **kwargs):
 def layout_display(layout, size, map_format, max_frames, max_branches, widget_mode, **kwargs):
     if isinstance(layout, AdjointLayout): layout = Layout.from_values(layout)
     if not isinstance(layout, (Layout, NdLayout)): return None
-    nframes = len(unique_dimkeys(layout)[1])
+    estimate = OutputMagic.estimate(layout)
+    dimensions, keys, nframes, branches = estimate
 
-    info = process_object(layout)
+    info = process_object(layout, estimate)
     if info: return info
-    layoutplot = LayoutPlot(layout, **opts(layout, get_plot_size(layout, size)))
     if isinstance(layout, Layout):
         if layout._display == 'auto':
-            branches = len(set([path[0] for path in list(layout.data.keys())]))
             if branches > max_branches:
                 return '<tt>'+ sanitize_HTML(layout) + '</tt>'
-            elif len(layout.data) * nframes > max_frames:
+            elif nframes > max_frames:
                 max_frame_warning(max_frames)
                 return '<tt>'+ sanitize_HTML(layout) + '</tt>'
 
-    if nframes == 1:
+    layoutplot = LayoutPlot(layout, keys=keys, dimensions=dimensions,
+                            **opts(layout, get_plot_size(layout, size)))
+    if len(keys) == 1:
         fig = layoutplot()
         return display_figure(fig)
     elif widget_mode is not None:
@@ -280,7 +409,9 @@ def layout_display(layout, size, map_format, max_frames, max_branches, widget_mo
 @display_hook
 def grid_display(grid, size, map_format, max_frames, max_branches, widget_mode, **kwargs):
     if not isinstance(grid, GridSpace): return None
-    info = process_object(grid)
+    estimate = OutputMagic.estimate(grid)
+    dimensions, keys, nframes, _ = estimate
+    info = process_object(grid, estimate)
     if info: return info
 
     raster_fn = lambda x: True if isinstance(x, Raster) else False
@@ -289,12 +420,14 @@ def grid_display(grid, size, map_format, max_frames, max_branches, widget_mode,
         plot_type = RasterGridPlot
     else:
         plot_type = GridPlot
-    gridplot = plot_type(grid, **opts(grid, get_plot_size(grid, size)))
+    plot_fn = lambda obj: plot_type(obj, **opts(obj, get_plot_size(obj, size)))
+    if nframes > max_frames:
+        return display_preview(grid, plot_fn, dimensions, keys, max_frames, widget_mode)
+
+    gridplot = plot_type(grid, keys=keys, dimensions=dimensions,
+                         **opts(grid, get_plot_size(grid, size)))
 
-    if len(gridplot) > max_frames:
-        max_frame_warning(max_frames)
-        return sanitize_HTML(grid)
-    elif len(gridplot) == 1:
+    if len(gridplot) == 1:
         fig = gridplot()
         return display_figure(fig)
     if widget_mode is not None:
@@ -1,17 +1,19 @@
 import time
 
 try:
-    from IPython.core.magic import Magics, magics_class, line_magic, line_cell_magic
+    from IPython.core.magic import Magics, magics_class, line_magic, cell_magic, line_cell_magic
 except:
     from unittest import SkipTest
     raise SkipTest("IPython extension requires IPython >= 0.13")
 
-from ..core import OrderedDict
+from ..core import OrderedDict, HoloMap, Layout
+from ..core.traversal import unique_dimkeys
 from ..core.options import Options, OptionError, Store, StoreOptions
 from ..core.pprint import InfoPrinter
 
 from IPython.display import display, HTML
 from ..operation import Compositor
+from ..plotting import RenderProfiler
 
 #========#
 # Magics #
@@ -198,9 +200,37 @@ class OutputMagic(OptionsMagic):
         cls.allowed['holomap'] = cls.inbuilt_formats + supported_formats
 
     @classmethod
-    def info(cls, obj):
+    def estimate(cls, obj):
+        """
+        Estimates the size of the display of the supplied object from
+        its keys alone, without constructing any plots. Returns the
+        dimensions and keys of the frames followed by the number of
+        frames and Layout branches that would be rendered, where the
+        frames of a Layout count each item in every frame.
+        """
+        if isinstance(obj, HoloMap):
+            dimensions, keys = obj.key_dimensions, list(obj.data.keys())
+        else:
+            dimensions, keys = unique_dimkeys(obj)
+        frames, branches = len(keys), 1
+        if isinstance(obj, Layout):
+            frames *= len(obj.data)
+            branches = len(set([path[0] for path in obj.data.keys()]))
+        return dimensions, keys, frames, branches
+
+
+    @classmethod
+    def info(cls, obj, estimate=None):
+        """
+        Pages information about the displayed object, including the
+        estimated number of frames and branches to be rendered, which
+        may be supplied if already computed.
+        """
         if cls.options['info'] and not cls._disable_info_output:
-            page.page(InfoPrinter.info(obj, ansi=True))
+            _, _, frames, branches = estimate if estimate else cls.estimate(obj)
+            display = ("Display: %d frames (max_frames %s), %d branches (max_branches %s)"
+                       % (frames, cls.options['max_frames'], branches, cls.options['max_branches']))
+            page.page('\n'.join([InfoPrinter.info(obj, ansi=True), '', display]))
 
 
     @classmethod
@@ -562,8 +592,46 @@ class TimerMagic(Magics):
             print(self.elapsed_time())
 
 
+@magics_class
+class ProfileMagic(Magics):
+    """
+    A cell magic for profiling the display of HoloViews objects,
+    printing the time spent in each stage of the plotting pipeline
+    for each type of element.
+    """
+
+    @cell_magic
+    def profile(self, line, cell):
+        """
+        Profile magic to print a table of the number of calls along
+        with the total and exclusive time spent in each stage of the
+        display pipeline, from the display hooks through plot
+        construction, option lookup, compositing, range computation
+        and frame updates to drawing, rendering and widget encoding.
+
+        To profile the display of the output of a cell, run:
+
+        %%profile
+        hv_obj
+
+        Optionally a filename may be supplied, in which case the
+        cProfile statistics of the cell are also dumped to that file
+        for inspection with the pstats module:
+
+        %%profile display.prof
+        hv_obj
+        """
+        filename = line.split('#')[0].strip()
+        with RenderProfiler(cprofile=filename or None) as profiler:
+            self.shell.run_cell(cell, store_history=STORE_HISTORY)
+        print(profiler.table())
+        if filename:
+            print("cProfile statistics written to %s" % filename)
+
+
 def load_magics(ip):
     ip.register_magics(TimerMagic)
+    ip.register_magics(ProfileMagic)
     ip.register_magics(OutputMagic)
 
     if pyparsing is None:  print("%opts magic unavailable (pyparsing cannot be imported)")
@@ -0,0 +1,147 @@
+"""
+A minimal WSGI server for the frames exported by the notebook
+widgets, allowing large HoloMaps exported to json to be browsed while
+only downloading the frames that are displayed.
+"""
+
+import os, sys, json, threading
+
+try:
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from SocketServer import ThreadingMixIn
+from wsgiref.simple_server import make_server, WSGIServer, WSGIRequestHandler
+
+import param
+
+
+class _ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+class FrameServer(param.Parameterized):
+    """
+    FrameServer is a WSGI application serving the frames exported by
+    widgets with export_json enabled at server_url/fig_{id}/{frame},
+    where the export is found in the fig_{id} subdirectory of the
+    json_path. Frames are read from their own file or from the chunk
+    holding them, as described by the manifest of the export.
+
+    Frames missing on disk are rendered on demand if the widget that
+    exported them is alive in the same process, e.g. when the server
+    is started in the notebook kernel, allowing widgets to export only
+    their first frame. The server may be run on a background thread
+    using start, or mounted in any WSGI container:
+
+    >>> server = FrameServer().start()          # doctest: +SKIP
+    >>> NdWidget.server_url = server.url        # doctest: +SKIP
+    >>> NdWidget.export_json = True             # doctest: +SKIP
+    """
+
+    json_path = param.String(default='./json_figures', doc="""
+        The directory holding the exported frames, which should match
+        the json_path of the widgets.""")
+
+    host = param.String(default='localhost', doc="""
+        The host name the server is bound to by start.""")
+
+    port = param.Integer(default=8008, doc="""
+        The port the server is bound to by start.""")
+
+    def __init__(self, **params):
+        super(FrameServer, self).__init__(**params)
+        self._server, self._thread = None, None
+
+
+    @property
+    def url(self):
+        "The URL to supply as the server_url of the widgets."
+        return 'http://%s:%d' % (self.host, self.port)
+
+
+    def manifest(self, fig_id):
+        """
+        Returns the manifest of the export with the supplied fig_{id}
+        directory name or None if there is no such export.
+        """
+        filename = os.path.join(self.json_path, fig_id, 'manifest.json')
+        if not os.path.isfile(filename):
+            return None
+        with open(filename) as f:
+            return json.load(f)
+
+
+    def frame(self, fig_id, idx):
+        """
+        Returns the serialized frame at the supplied index of the
+        export with the supplied fig_{id} directory name, rendering it
+        if it is missing and the exporting widget is available, or
+        None if the frame cannot be found.
+        """
+        manifest = self.manifest(fig_id)
+        if manifest is None or not 0 <= idx < manifest['frames']:
+            return None
+        path = os.path.join(self.json_path, fig_id)
+        filename = os.path.join(path, str(idx))
+        if os.path.isfile(filename):
+            with open(filename, 'rb') as f:
+                return f.read().decode('utf-8')
+        chunk = os.path.join(path, 'chunk_%d.json' % (idx // manifest['chunk_size']))
+        if os.path.isfile(chunk):
+            with open(chunk) as f:
+                frames = json.load(f)
+            if str(idx) in frames:
+                return frames[str(idx)]
+
+        widgets = sys.modules.get('holoviews.ipython.widgets')
+        widget = widgets.NdWidget.exports.get(manifest['id']) if widgets else None
+        if widget is None:
+            return None
+        return widget.export_frame(idx)
+
+
+    def __call__(self, environ, start_response):
+        parts = environ.get('PATH_INFO', '').strip('/').split('/')[-2:]
+        frame, manifest = None, None
+        if len(parts) == 2 and parts[0].startswith('fig_') and parts[1].isdigit():
+            frame = self.frame(parts[0], int(parts[1]))
+            manifest = self.manifest(parts[0])
+
+        headers = [('Access-Control-Allow-Origin', '*')]
+        if frame is None:
+            start_response('404 Not Found', headers + [('Content-Type', 'text/plain')])
+            return [b'Frame not found']
+        mime_type = 'application/json' if manifest['mpld3'] else 'text/html'
+        data = frame.encode('utf-8')
+        start_response('200 OK', headers + [('Content-Type', mime_type + '; charset=utf-8'),
+                                            ('Content-Length', str(len(data)))])
+        return [data]
+
+
+    def start(self):
+        """
+        Starts serving on the configured host and port on a background
+        thread and returns the server.
+        """
+        if self._server is None:
+            self._server = make_server(self.host, self.port, self,
+                                       server_class=_ThreadingWSGIServer,
+                                       handler_class=_QuietHandler)
+            self.port = self._server.server_port
+            self._thread = threading.Thread(target=self._server.serve_forever)
+            self._thread.daemon = True
+            self._thread.start()
+        return self
+
+
+    def stop(self):
+        "Stops the server if it has been started."
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server, self._thread = None, None
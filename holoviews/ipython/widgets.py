@@ -1,4 +1,5 @@
-import os, sys, math, time, uuid, json
+import os, sys, re, math, time, uuid, json, base64, hashlib, inspect, threading, multiprocessing
+from io import BytesIO
 from unittest import SkipTest
 
 try:
@@ -17,11 +18,12 @@ except:
 # IPython 0.13 does not have version_info
 ipython2 = hasattr(IPython, 'version_info') and (IPython.version_info[0] == 2)
 
+import numpy as np
 import param
 
 from ..core import OrderedDict, NdMapping
 from ..core.util import ProgressIndicator
-from ..plotting import Plot
+from ..plotting import Plot, HTML_TAGS, RenderProfiler, render_lock
 from .magics import OutputMagic
 
 
@@ -210,6 +212,82 @@ def isnumeric(val):
         return False
 
 
+def _frame_comm_manager():
+    """
+    Returns the comm manager of the running IPython kernel with the
+    targets used to send widget frames registered, or None if no
+    kernel is available.
+    """
+    try:
+        from IPython import get_ipython
+        ip = get_ipython()
+        manager = ip.kernel.comm_manager if hasattr(ip, 'kernel') else ip.comm_manager
+    except:
+        return None
+    for target, handler in [('hv_frames', _open_frame_stream),
+                            ('hv_widget', _open_widget_comm)]:
+        if target not in manager.targets:
+            manager.register_target(target, handler)
+    return manager
+
+
+def _comm_buffers():
+    "Whether the kernel comms support sending binary buffers."
+    try:
+        argspec = getattr(inspect, 'getfullargspec', inspect.getargspec)
+        return 'buffers' in argspec(Comm.send).args
+    except:
+        return False
+
+
+def _open_frame_stream(comm, msg):
+    "Streams the remaining frames of the widget opening the comm."
+    NdWidget._evict_pending()
+    widget = NdWidget.pending.pop(msg['content']['data']['id'], (None, None))[1]
+    if widget is None:
+        comm.close()
+    else:
+        widget.stream_frames(comm)
+
+
+def _open_widget_comm(comm, msg):
+    "Sends the frames requested by the live widget opening the comm."
+    widget = SelectionWidget.widgets.get(msg['content']['data']['id'])
+    if widget is None:
+        comm.close()
+    else:
+        comm.on_msg(lambda msg: widget.send_frame(comm, msg['content']['data']['frame']))
+        comm.on_close(lambda msg: widget.close())
+
+
+def _in_kernel():
+    "Whether the code is running in an IPython kernel."
+    try:
+        from IPython import get_ipython
+        return getattr(get_ipython(), 'kernel', None) is not None
+    except:
+        return False
+
+
+# The widget rendering frames in a forked worker process
+_render_widget = None
+
+def _init_render_worker(widget):
+    """
+    Initializes a forked worker process, which receives the widget
+    when forked rather than by pickling, silencing its output.
+    """
+    global _render_widget
+    _render_widget = widget
+    devnull = open(os.devnull, 'w')
+    sys.stdout, sys.stderr = devnull, devnull
+
+
+def _render_frame(idx):
+    "Renders a frame of the widget inherited by a worker process."
+    return idx, _render_widget._plot_figure(idx)
+
+
 def get_plot_size():
     factor = OutputMagic.options['size'] / 100.0
     return (Plot.figure_inches[0] * factor,
@@ -233,13 +311,60 @@ class NdWidget(param.Parameterized):
          a callback from the slider.""")
 
     json_path = param.String(default='./json_figures', doc="""
-         If export_json is True the json files will be written to this
-         directory.""")
+         If export_json is True the frames will be written to the
+         fig_{id} subdirectory of this directory, along with a
+         manifest.json file describing the export.""")
+
+    chunk_size = param.Integer(default=1, bounds=(1, None), doc="""
+         Number of frames per exported file. If one, each frame is
+         written to a file named after its index, which may be served
+         by any static file server. Otherwise frames are grouped into
+         chunk_{n}.json files, which the FrameServer serves by frame.""")
 
     server_url = param.String(default='', doc="""If export_json is
          True the slider widget will expect to be served the plot data
          from this URL. Data should be served from:
-         server_url/fig_{id}/{frame}.""")
+         server_url/fig_{id}/{frame}, e.g. by a FrameServer.""")
+
+    #######################
+    # Rendering options   #
+    #######################
+
+    progressive = param.Boolean(default=False, doc="""
+         Whether to render only the first frame before displaying the
+         widget, streaming the remaining frames to the notebook over a
+         comm as they are rendered. Requires a live IPython kernel.
+         Note that the streamed frames are not saved with the
+         notebook. When exporting json, only the first frame is
+         exported, leaving a FrameServer running in the kernel to
+         render the remaining frames on demand.""")
+
+    compression = param.ObjectSelector(default=None,
+                                       objects=[None, 'dedupe', 'delta'], doc="""
+         Compression of the frames embedded in the widget. If 'dedupe',
+         frames identical to an earlier frame are embedded as
+         references to that frame. If 'delta', PNG frames are
+         additionally embedded as the tiles that changed relative to
+         the previous frame, which are composited onto the previous
+         frame by the browser. Keyframes are embedded in full every
+         keyframe_interval frames or whenever the delta is larger than
+         the frame itself.""")
+
+    keyframe_interval = param.Integer(default=50, bounds=(1, None), doc="""
+         Maximum number of consecutive delta frames between keyframes
+         if compression is 'delta'.""")
+
+    tile_size = param.Integer(default=32, bounds=(1, None), doc="""
+         Size in pixels of the square tiles compared between frames if
+         compression is 'delta'.""")
+
+    workers = param.Integer(default=1, bounds=(1, None), doc="""
+         Number of worker processes used to render the frames. The
+         workers are forked once the first frame has been rendered,
+         sharing the plot and its precomputed ranges. Requires fork
+         support and is disabled within an IPython kernel, which
+         cannot be forked safely, otherwise frames are rendered
+         serially.""")
 
     ##############################
     # Javascript include options #
@@ -248,6 +373,20 @@ class NdWidget(param.Parameterized):
     mpld3_url = 'https://mpld3.github.io/js/mpld3.v0.3git.js'
     d3_url = 'https://cdnjs.cloudflare.com/ajax/libs/d3/3.4.13/d3.js'
 
+    # Widgets waiting for the notebook to request their remaining frames
+    # by id, along with the time they were added. Widgets that are not
+    # requested within pending_timeout seconds (e.g. in a notebook saved
+    # before the comm connected) are evicted.
+    pending = OrderedDict()
+    pending_timeout = 300
+
+    # Progressive widgets exporting json by id, rendering frames
+    # missing on disk on demand. Only the most recent exports_limit
+    # widgets are kept and widgets are removed once all their frames
+    # have been exported.
+    exports = OrderedDict()
+    exports_limit = 20
+
     def __init__(self, plot, **params):
         super(NdWidget, self).__init__(**params)
         self.id = uuid.uuid4().hex
@@ -280,24 +419,256 @@ class NdWidget(param.Parameterized):
             encoder = dict(cls=mpld3._display.NumpyEncoder)
 
         if self.export_json:
-            if not os.path.isdir(self.json_path):
-                os.mkdir(self.json_path)
-            with open(self.json_path+'/fig_%s.json' % self.id, 'wb') as f:
-                json.dump(frames, f, **encoder)
+            self.export_frames(frames)
             frames = {}
         elif self.mpld3:
             frames = json.dumps(frames, **encoder)
+        elif self._compressed:
+            frames = self.compress_frames(frames)
         return frames
 
 
+    def export_frames(self, frames):
+        """
+        Writes the supplied frames to the fig_{id} subdirectory of the
+        json_path, either to one file per frame or to chunks of
+        chunk_size frames, and writes the manifest if missing. A
+        single frame is always written to its own file, allowing
+        frames rendered on demand to be added to chunked exports.
+        """
+        path = os.path.join(self.json_path, 'fig_%s' % self.id)
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+        manifest = os.path.join(path, 'manifest.json')
+        if not os.path.isfile(manifest):
+            info = {'id': self.id, 'frames': len(self.plot),
+                    'chunk_size': self.chunk_size, 'mpld3': self.mpld3}
+            with open(manifest, 'w') as f:
+                json.dump(info, f)
+
+        if self.chunk_size == 1 or len(frames) == 1:
+            files = {str(idx): self._serialize_frame(frame)
+                     for idx, frame in frames.items()}
+        else:
+            chunks = {}
+            for idx, frame in frames.items():
+                chunk = chunks.setdefault('chunk_%d.json' % (idx // self.chunk_size), {})
+                chunk[str(idx)] = self._serialize_frame(frame)
+            files = {name: json.dumps(chunk) for name, chunk in chunks.items()}
+        for name, content in files.items():
+            with open(os.path.join(path, name), 'wb') as f:
+                f.write(content.encode('utf-8'))
+
+
+    def _serialize_frame(self, frame):
+        "Serializes a frame as HTML or, for mpld3, as JSON."
+        if not self.mpld3:
+            return str(frame)
+        import mpld3
+        return json.dumps(frame, cls=mpld3._display.NumpyEncoder)
+
+
+    def export_frame(self, idx):
+        """
+        Renders and exports the frame at the supplied index, returning
+        the serialized frame. Frames requested from a FrameServer are
+        rendered one at a time across all widgets by the render_lock.
+        """
+        with render_lock:
+            frame = self._plot_figure(idx)
+            self._unexported.discard(idx)
+            if not self._unexported:
+                NdWidget.exports.pop(self.id, None)
+        self.export_frames({idx: frame})
+        return self._serialize_frame(frame)
+
+
+    @property
+    def _compressed(self):
+        "Whether the embedded frames are compressed."
+        return bool(self.compression) and not (self.mpld3 or self.export_json)
+
+
+    def compress_frames(self, frames):
+        """
+        Compresses the supplied HTML frames according to the
+        compression mode, replacing frames identical to an earlier
+        frame by the index of that frame and, in 'delta' mode, PNG
+        frames by a dictionary holding the index of the previous frame
+        and a list of [x, y, data URL] tiles to composite onto it.
+        """
+        compressed, digests = {}, {}
+        previous, keyframe = None, None
+        for idx in sorted(frames):
+            frame = frames[idx]
+            digest = hashlib.sha1(frame.encode('utf-8')).hexdigest()
+            if digest in digests:
+                compressed[idx] = digests[digest]
+            else:
+                digests[digest] = idx
+                compressed[idx] = frame
+            if self.compression != 'delta':
+                continue
+            pixels = self._decode_png(frame)
+            if (digest in digests and digests[digest] == idx and previous is not None
+                and previous[1] is not None and pixels is not None
+                and idx - keyframe < self.keyframe_interval):
+                tiles = self._delta_tiles(previous[1], pixels)
+                if tiles == []:
+                    compressed[idx] = previous[0]
+                elif tiles is not None and sum(len(t[2]) for t in tiles) < len(frame):
+                    compressed[idx] = {'delta': previous[0], 'tiles': tiles}
+            if isinstance(compressed[idx], str) or keyframe is None:
+                keyframe = idx
+            previous = (idx, pixels)
+        return compressed
+
+
+    @staticmethod
+    def _decode_png(frame):
+        "Returns the RGBA pixels of a PNG frame or None for other frames."
+        from matplotlib import image
+        match = re.search("data:image/png;base64,([^'\"]+)", frame)
+        if match is None:
+            return None
+        data = BytesIO(base64.b64decode(match.group(1)))
+        pixels = image.imread(data, format='png')
+        if pixels.dtype != np.uint8:
+            pixels = np.round(pixels * 255).astype(np.uint8)
+        if pixels.shape[2] == 3:
+            alpha = np.full(pixels.shape[:2] + (1,), 255, dtype=np.uint8)
+            pixels = np.concatenate([pixels, alpha], axis=2)
+        return pixels
+
+
+    def _delta_tiles(self, previous, pixels):
+        """
+        Returns the tiles of the pixels that differ from the previous
+        pixels as a list of [x, y, data URL] lists, merging runs of
+        changed tiles along each row of tiles. Returns None if the
+        frames differ in size.
+        """
+        from matplotlib import image
+        if previous.shape != pixels.shape:
+            return None
+        size = self.tile_size
+        h, w = pixels.shape[:2]
+        ny, nx = -(-h // size), -(-w // size)
+        changed = np.zeros((ny*size, nx*size), dtype=bool)
+        changed[:h, :w] = np.any(previous != pixels, axis=2)
+        changed = changed.reshape(ny, size, nx, size).any(axis=(1, 3))
+
+        tiles = []
+        for row in range(ny):
+            cols = np.flatnonzero(changed[row])
+            if not len(cols): continue
+            runs = np.split(cols, np.flatnonzero(np.diff(cols) > 1) + 1)
+            for run in runs:
+                x0, y0 = run[0]*size, row*size
+                tile = pixels[y0:y0+size, x0:(run[-1]+1)*size]
+                data = BytesIO()
+                image.imsave(data, tile, format='png')
+                b64 = base64.b64encode(data.getvalue()).decode('utf-8')
+                tiles.append([int(x0), int(y0), 'data:image/png;base64,' + b64])
+        return tiles
+
+
+    def render_frames(self, indices=None):
+        """
+        Generator yielding (index, frame) tuples for the supplied frame
+        indices (all frames by default). Unless the plot has already
+        been drawn, the first frame is rendered in this process, while
+        the remaining frames are distributed across the workers and
+        yielded in the order they are completed. Within an IPython
+        kernel frames are always rendered serially, as forking the
+        multithreaded kernel is unsafe.
+        """
+        indices = list(range(len(self.plot)) if indices is None else indices)
+        if indices and not self.plot.drawn:
+            with render_lock:
+                frame = self._plot_figure(indices[0])
+            yield indices[0], frame
+            indices = indices[1:]
+        if (self.workers < 2 or len(indices) < 2 or not hasattr(os, 'fork')
+            or _in_kernel()):
+            for idx in indices:
+                with render_lock:
+                    frame = self._plot_figure(idx)
+                yield idx, frame
+            return
+
+        context = (multiprocessing.get_context('fork')
+                   if hasattr(multiprocessing, 'get_context') else multiprocessing)
+        pool = context.Pool(min(self.workers, len(indices)),
+                            _init_render_worker, (self,))
+        try:
+            for idx, frame in pool.imap_unordered(_render_frame, indices):
+                yield idx, frame
+        finally:
+            pool.terminate()
+
+
+    def collect_frames(self):
+        """
+        Renders the frames to be embedded in the widget, returning them
+        in an OrderedDict by index. If progressive, only the first frame
+        is rendered and the remaining frames are streamed once the
+        widget has been displayed or, when exporting json, rendered on
+        demand by a FrameServer.
+        """
+        indices = range(len(self.plot))
+        if self.progressive and self.export_json:
+            self._unexported = set(indices[1:])
+            if self._unexported:
+                NdWidget.exports[self.id] = self
+                while len(NdWidget.exports) > self.exports_limit:
+                    NdWidget.exports.popitem(last=False)
+            indices = [0]
+        elif self.progressive and len(indices) > 1 and _frame_comm_manager() is not None:
+            NdWidget._evict_pending()
+            NdWidget.pending[self.id] = (time.time(), self)
+            indices = [0]
+        return OrderedDict(sorted(self.render_frames(indices), key=lambda x: x[0]))
+
+
+    @classmethod
+    def _evict_pending(cls):
+        "Evicts the pending widgets that were not requested in time."
+        expired = time.time() - cls.pending_timeout
+        while cls.pending and next(iter(cls.pending.values()))[0] < expired:
+            cls.pending.popitem(last=False)
+
+
+    def stream_frames(self, comm):
+        """
+        Renders all but the first frame on a background thread, sending
+        each frame to the notebook over the supplied comm as it is
+        completed.
+        """
+        def stream():
+            for idx, frame in self.render_frames(range(1, len(self.plot))):
+                comm.send({'frame': idx, 'data': frame if self.mpld3 else str(frame)})
+            comm.close()
+        thread = threading.Thread(target=stream)
+        thread.daemon = True
+        thread.start()
+
+
     def _plot_figure(self, idx):
+        """
+        Renders the frame at the supplied index. The figure of the plot
+        is not managed by pyplot once drawn, allowing frames to be
+        rendered on its canvas from background threads while holding
+        the render_lock.
+        """
         from .display_hooks import display_figure
         fig = self.plot[idx]
         if OutputMagic.options['backend'] == 'd3':
             import mpld3
             mpld3.plugins.connect(fig, mpld3.plugins.MousePosition(fontsize=14))
             return mpld3.fig_to_dict(fig)
-        return display_figure(fig)
+        return display_figure(fig, close=False)
 
 
 
@@ -318,19 +689,18 @@ class ScrubberWidget(NdWidget):
 
     def __init__(self, plot, **params):
         super(ScrubberWidget, self).__init__(plot, **params)
-        self.frames = OrderedDict((idx, self._plot_figure(idx))
-                                  for idx in range(len(self.plot)))
+        self.frames = self.collect_frames()
 
 
     def __call__(self):
-        frames = {idx: frame if self.mpld3 or self.export_json else
-                  str(frame) for idx, frame in enumerate(self.frames.values())}
-        frames = self.encode_frames(frames)
+        frames = self.encode_frames(dict(self.frames))
 
         data = {'id': self.id, 'Nframes': len(self.plot),
                 'interval': int(1000. / OutputMagic.options['fps']),
                 'frames': frames,
                 'load_json': str(self.export_json).lower(),
+                'progressive': str(self.id in NdWidget.pending).lower(),
+                'compressed': str(self._compressed).lower(),
                 'server': self.server_url,
                 'mpld3_url': self.mpld3_url,
                 'd3_url': self.d3_url[:-3],
@@ -347,23 +717,89 @@ class CustomCommSocket(CommSocket):
     A CustomCommSocket is required to delay communication
     between the kernel and the canvas element until the widget
     has been rendered in the notebook.
+
+    Where the kernel supports binary comm buffers, image updates are
+    sent as raw PNG data rather than as base64 encoded data URLs,
+    which are unpacked by the SelectionWidget into the Blobs
+    understood by the matplotlib canvas.
     """
 
     def __init__(self, manager):
         self.supports_binary = None
+        self.binary = _comm_buffers()
         self.manager = manager
         self.uuid = str(uuid.uuid4())
         self.html = "<div id=%r></div>" % self.uuid
 
     def start(self):
         try:
-            self.comm = Comm('matplotlib', data={'id': self.uuid})
+            self.comm = Comm('hv_matplotlib', data={'id': self.uuid})
         except AttributeError:
             raise RuntimeError('Unable to create an IPython notebook Comm '
                                'instance. Are you in the IPython notebook?')
         self.comm.on_msg(self.on_message)
         self.comm.on_close(lambda close_message: self.manager.clearup_closed())
 
+    def send_binary(self, blob):
+        if not self.binary:
+            return CommSocket.send_binary(self, blob)
+        self.comm.send({'blob': 'image/png'}, buffers=[blob])
+
+
+
+class FrameCache(object):
+    """
+    Thread-safe least recently used cache of rendered frames, bounded
+    by the total length of the cached frames in bytes and optionally
+    by the number of frames. The most recently cached frame is always
+    retained, even if it exceeds the byte budget on its own.
+    """
+
+    def __init__(self, max_bytes, max_frames=None):
+        self.max_bytes = max_bytes
+        self.max_frames = max_frames
+        self.nbytes = 0
+        self._frames = OrderedDict()
+        self._lock = threading.RLock()
+
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._frames
+
+
+    def __len__(self):
+        return len(self._frames)
+
+
+    def get(self, key, default=None):
+        """
+        Returns the frame cached under the supplied key, marking it as
+        most recently used.
+        """
+        with self._lock:
+            if key not in self._frames:
+                return default
+            frame = self._frames.pop(key)
+            self._frames[key] = frame
+            return frame
+
+
+    def set(self, key, frame):
+        """
+        Caches the supplied frame, evicting the least recently used
+        frames until the cache is within its bounds.
+        """
+        with self._lock:
+            if key in self._frames:
+                self.nbytes -= len(self._frames.pop(key))
+            self._frames[key] = frame
+            self.nbytes += len(frame)
+            while len(self._frames) > 1 and (self.nbytes > self.max_bytes or
+                                             len(self._frames) > (self.max_frames or np.inf)):
+                _, evicted = self._frames.popitem(last=False)
+                self.nbytes -= len(evicted)
+
 
 
 class SelectionWidget(NdWidget):
@@ -389,7 +825,23 @@ class SelectionWidget(NdWidget):
         a static widget not dependent on the IPython server.""")
 
     cache_size = param.Integer(default=100, doc="""
-        Size of dynamic cache if frames are not embedded.""")
+        Maximum number of frames in the dynamic cache if frames are
+        not embedded.""")
+
+    cache_bytes = param.Integer(default=50*1024**2, doc="""
+        Maximum total size in bytes of the frames in the dynamic
+        cache if frames are not embedded. Least recently viewed
+        frames are evicted first.""")
+
+    prefetch = param.Integer(default=1, bounds=(0, None), doc="""
+        Number of neighbouring frames along each dimension rendered
+        ahead of time on a background thread whenever a frame is
+        selected, if frames are not embedded.""")
+
+    binary = param.Boolean(default=True, doc="""
+        Whether frames that are not embedded are sent to the notebook
+        as binary comm buffers holding the raw image data, where
+        supported by the kernel, rather than as base64 encoded html.""")
 
     template = param.String('jsslider.jinja', doc="""
         The jinja2 template used to generate the html output.""")
@@ -405,11 +857,16 @@ class SelectionWidget(NdWidget):
         NdWidget.__init__(self, plot, **params)
         nbagg = CommSocket is not object
         self.nbagg = OutputMagic.options['backend'] == 'nbagg' and nbagg
-        self.frames = {}
+        self.frames = FrameCache(self.cache_bytes, self.cache_size)
+        self.format = OutputMagic.options['fig']
+        live = not (self.embed or self.nbagg or self.mpld3)
+        self.transport = live and _frame_comm_manager() is not None
+        self._binary = (self.transport and self.binary and
+                        self.format in ('png', 'svg') and _comm_buffers())
+        self._prefetch_lock = threading.Lock()
+        self._prefetch_queue, self._prefetch_thread = [], None
         if self.embed:
-            frames = {idx: self._plot_figure(idx)
-                      for idx in range(len(self.keys))}
-            self.frames = self.encode_frames(frames)
+            self.frames = self.encode_frames(dict(self.collect_frames()))
         elif self.nbagg:
             fig = self.plot[0]
             self.manager = new_figure_manager_given_figure(OutputMagic.nbagg_counter, fig)
@@ -459,13 +916,10 @@ class SelectionWidget(NdWidget):
         elif self.nbagg:
             self.manager.display_js()
             frames = {0: self.comm.html}
+        elif self.mpld3:
+            frames = self._cache_frame(0)
         else:
-            frames = {0: self._plot_figure(0)}
-            if self.mpld3:
-                frames = self.encode_frames(frames)
-                self.frames[0] = frames
-            else:
-                self.frames.update(frames)
+            frames = {0: self._frame_html(0)}
 
         data = {'id': self.id, 'Nframes': len(self.mock_obj),
                 'Nwidget': self.mock_obj.ndims,
@@ -473,7 +927,10 @@ class SelectionWidget(NdWidget):
                 'key_data': key_data, 'widgets': widgets,
                 'init_dim_vals': init_dim_vals,
                 'load_json': str(self.export_json).lower(),
+                'progressive': str(self.id in NdWidget.pending).lower(),
+                'compressed': str(self._compressed).lower(),
                 'nbagg': str(self.nbagg).lower(),
+                'comm': str(self.transport).lower(),
                 'server': self.server_url,
                 'cached': str(self.embed).lower(),
                 'mpld3_url': self.mpld3_url,
@@ -495,14 +952,129 @@ class SelectionWidget(NdWidget):
             fig = self.plot[n]
             fig.canvas.draw_idle()
             return
-        if n not in self.frames:
-            if len(self.frames) >= self.cache_size:
-                self.frames.popitem(last=False)
-            frame = self._plot_figure(n)
-            if self.mpld3: frame = self.encode_frames({0: frame})
-            self.frames[n] = frame
-        return self.frames[n]
+        frame = self._frame_html(n)
+        if self.prefetch:
+            self._prefetch_neighbours(n)
+        return frame
+
+
+    def send_frame(self, comm, n):
+        """
+        Sends the frame at the supplied index over the supplied comm,
+        as a binary buffer holding the image data where supported by
+        the kernel and as html otherwise.
+        """
+        frame = self._cache_frame(n)
+        if self.prefetch:
+            self._prefetch_neighbours(n)
+        if self._binary:
+            mime_type, tag = HTML_TAGS[self.format]
+            comm.send({'frame': n, 'mime_type': mime_type, 'tag': tag},
+                      buffers=[frame])
+        else:
+            comm.send({'frame': n, 'html': frame})
+
+
+    def _frame_html(self, n):
+        "Returns the html of the frame at the supplied index."
+        frame = self._cache_frame(n)
+        if not self._binary:
+            return frame
+        mime_type, tag = HTML_TAGS[self.format]
+        b64 = base64.b64encode(frame).decode('utf-8')
+        return tag.format(src=HTML_TAGS['base64'].format(mime_type=mime_type, b64=b64))
+
+
+    def _cache_frame(self, n):
+        """
+        Returns the frame at the supplied index from the cache,
+        rendering and caching it if required. Frames sent as binary
+        buffers are cached as raw image data. Rendering is serialized
+        with the display hooks by the render_lock.
+        """
+        frame = self.frames.get(n)
+        if frame is None:
+            with render_lock:
+                frame = self.frames.get(n)
+                if frame is None:
+                    if self._binary:
+                        from .display_hooks import figure_bytes
+                        frame = figure_bytes(self.plot[n], self.format,
+                                             OutputMagic.options['dpi'], close=False)
+                    else:
+                        frame = self._plot_figure(n)
+                        if self.mpld3: frame = self.encode_frames({0: frame})
+                    self.frames.set(n, frame)
+        return frame
+
+
+    def neighbours(self, n):
+        """
+        Returns the indices of the frames neighbouring the frame at the
+        supplied index along each dimension, up to prefetch steps away
+        and ordered by distance.
+        """
+        if not hasattr(self, '_key_index'):
+            self._keys = list(self.mock_obj.data.keys())
+            self._key_index = {k: i for i, k in enumerate(self._keys)}
+            self._dim_values = [dim.values if dim.values else
+                                sorted(set(self.mock_obj.dimension_values(dim.name)))
+                                for dim in self.mock_obj.key_dimensions]
+        key = self._keys[n]
+        neighbours = []
+        for step in range(1, self.prefetch+1):
+            for d, values in enumerate(self._dim_values):
+                if key[d] not in values: continue
+                pos = values.index(key[d])
+                for offset in (step, -step):
+                    if not 0 <= pos + offset < len(values): continue
+                    neighbour = key[:d] + (values[pos + offset],) + key[d+1:]
+                    if neighbour in self._key_index:
+                        neighbours.append(self._key_index[neighbour])
+        return neighbours
+
+
+    def close(self):
+        """
+        Removes the widget from the registry of live widgets once it
+        is no longer displayed, releasing its plot and cached frames.
+        """
+        SelectionWidget.widgets.pop(self.id, None)
+        with self._prefetch_lock:
+            self._prefetch_queue = []
+        self.frames = FrameCache(self.cache_bytes, self.cache_size)
+
+
+    def _prefetch_neighbours(self, n):
+        """
+        Replaces the queue of frames to prefetch with the uncached
+        neighbours of the supplied frame, starting the prefetching
+        thread if required. The thread exits once the queue is empty.
+        """
+        with self._prefetch_lock:
+            self._prefetch_queue = [idx for idx in self.neighbours(n)
+                                    if idx not in self.frames]
+            if self._prefetch_queue and self._prefetch_thread is None:
+                self._prefetch_thread = threading.Thread(target=self._prefetch_frames)
+                self._prefetch_thread.daemon = True
+                self._prefetch_thread.start()
+
+
+    def _prefetch_frames(self):
+        while True:
+            with self._prefetch_lock:
+                if not self._prefetch_queue:
+                    self._prefetch_thread = None
+                    return
+                idx = self._prefetch_queue.pop(0)
+            try:
+                self._cache_frame(idx)
+            except Exception as e:
+                self.warning('Frame %d could not be prefetched: %s' % (idx, e))
+
 
+RenderProfiler.targets.extend([('widgets', NdWidget, '__call__'),
+                              ('encode', NdWidget, 'encode_frames')])
 
 
 def progress(iterator, enum=False, length=None):
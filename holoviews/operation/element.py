@@ -1,3 +1,6 @@
+import copy, hashlib, threading
+from collections import OrderedDict
+
 import numpy as np
 
 import param
@@ -6,7 +9,7 @@ from ..core import Dimension, ElementOperation, CompositeOverlay, \
                    NdOverlay, Overlay, BoundingBox
 from ..core.util import find_minmax
 from ..element.chart import Histogram, VectorField, Curve
-from ..element.raster import Image, RGB
+from ..element.raster import Raster, Image, RGB
 from ..element.tabular import ItemTable
 from ..element.path import Contours
 from .normalization import raster_normalization
@@ -59,14 +62,74 @@ class chain(ElementOperation):
        A list of ElementOperations (or ElementOperation instances)
        that are applied on the input from left to right..""")
 
+    pipeline = param.Boolean(default=False, doc="""
+       Whether to fuse consecutive operations that implement an array
+       level kernel (e.g. threshold, gradient, transform and
+       raster_normalization), passing the raw arrays between them
+       and only wrapping the result of the last operation of each
+       such run in an element. A run ends after any operation
+       changing the dimensions or bounds of its input, such as
+       gradient or transform.""")
+
+    in_place = param.Boolean(default=False, doc="""
+       Whether fused kernels may write their output into the array
+       returned by the preceding kernel instead of allocating a new
+       array. The data of the input element is never modified.""")
+
     def _process(self, view, key=None):
-        processed = view
-        for operation in self.p.operations:
-            processed = operation.process_element(processed, key, input_ranges=self.p.input_ranges)
+        operations = [op.instance() if isinstance(op, type) else op
+                      for op in self.p.operations]
+        processed, fused = view, []
+        for operation in operations + [None]:
+            if self.p.pipeline and self._fusable(operation):
+                fused.append(operation)
+                # Kernels following an operation that changes the
+                # metadata require the wrapped output
+                if operation._array_preserves_metadata:
+                    continue
+                operation = None
+            if fused and isinstance(processed, Raster) and all(
+                    isinstance(processed, op._array_input_type) for op in fused):
+                processed = self._process_fused(fused, processed, key)
+            else:
+                # Unsupported inputs are processed (and validated) in turn
+                for op in fused:
+                    processed = op.process_element(processed, key,
+                                                   input_ranges=self.p.input_ranges)
+            fused = []
+            if operation is not None:
+                processed = operation.process_element(processed, key,
+                                                      input_ranges=self.p.input_ranges)
 
         return processed.clone(group=self.p.group)
 
 
+    @classmethod
+    def _fusable(cls, operation):
+        return (operation is not None and type(operation)._process_array
+                is not ElementOperation._process_array)
+
+
+    def _process_fused(self, operations, element, key):
+        """
+        Applies the array kernels of the supplied operations to the
+        data of the Raster element in turn, wrapping the final array
+        using the last operation. The kernels are applied on copies
+        of the operations holding the parameter overrides, leaving
+        the supplied operations unmodified.
+        """
+        data = element.data
+        for operation in operations:
+            operation = copy.copy(operation)
+            operation.p = param.ParamOverrides(operation, {'input_ranges': self.p.input_ranges})
+            buffer = data if self.p.in_place and data is not element.data else None
+            data = operation._process_array(data, element, key, out=buffer)
+            if np.may_share_memory(data, element.data) and data is not element.data:
+                data = data.copy()
+        return operation._wrap_array(data, element)
+
+
+
 class transform(ElementOperation):
     """
     Generic ElementOperation to transform an input Image or RGBA
@@ -97,10 +160,18 @@ class transform(ElementOperation):
        Image to the data in the output Image. By default, acts as
        the identity function such that the output matches the input.""")
 
+    _array_preserves_metadata = False
+
+    def _process_array(self, data, element, key=None, out=None):
+        return data if not self.p.operator else self.p.operator(data)
+
+
+    def _wrap_array(self, data, element):
+        return Image(data, element.bounds, group=self.p.group)
+
+
     def _process(self, matrix, key=None):
-        processed = (matrix.data if not self.p.operator
-                     else self.p.operator(matrix.data))
-        return Image(processed, matrix.bounds, group=self.p.group)
+        return self._wrap_array(self._process_array(matrix.data, matrix), matrix)
 
 
 #==============================#
@@ -285,17 +356,23 @@ class threshold(ElementOperation):
     group = param.String(default='Threshold', doc="""
        The group assigned to the thresholded output.""")
 
+    _array_input_type = Image
+
+    def _process_array(self, data, element, key=None, out=None):
+        above = data > self.p.level
+        if out is None or out.shape != data.shape or out.dtype.kind != 'f':
+            out = np.empty(data.shape)
+        out.fill(self.p.low)
+        out[above] = self.p.high
+        return out
+
+
     def _process(self, matrix, key=None):
 
         if not isinstance(matrix, Image):
             raise TypeError("The threshold operation requires a Image as input.")
 
-        arr = matrix.data
-        high = np.ones(arr.shape) * self.p.high
-        low = np.ones(arr.shape) * self.p.low
-        thresholded = np.where(arr > self.p.level, high, low)
-
-        return matrix.clone(thresholded, group=self.p.group)
+        return self._wrap_array(self._process_array(matrix.data, matrix), matrix)
 
 
 
@@ -312,18 +389,16 @@ class gradient(ElementOperation):
     group = param.String(default='Gradient', doc="""
     The group assigned to the output gradient matrix.""")
 
-    def _process(self, matrix, key=None):
-
-        if len(matrix.value_dimensions) != 1:
-            raise ValueError("Input matrix to gradient operation must "
-                             "have single value dimension.")
+    _array_preserves_metadata = False
 
-        matrix_dim = matrix.value_dimensions[0]
-
-        data = matrix.data
-        r, c = data.shape
-        dx = np.diff(data, 1, axis=1)[0:r-1, 0:c-1]
-        dy = np.diff(data, 1, axis=0)[0:r-1, 0:c-1]
+    def _gradient(self, data, matrix_dim):
+        """
+        Computes the gradient magnitude over the last two axes of the
+        data.
+        """
+        r, c = data.shape[-2:]
+        dx = np.diff(data, 1, axis=-1)[..., 0:r-1, 0:c-1]
+        dy = np.diff(data, 1, axis=-2)[..., 0:r-1, 0:c-1]
 
         cyclic_range = 1.0 if not matrix_dim.cyclic else matrix_dim.range
         if cyclic_range is not None: # Wrap into the specified range
@@ -336,7 +411,36 @@ class gradient(ElementOperation):
             dx = 0.5 * cyclic_range - np.abs(dx - 0.5 * cyclic_range)
             dy = 0.5 * cyclic_range - np.abs(dy - 0.5 * cyclic_range)
 
-        return Image(np.sqrt(dx * dx + dy * dy), matrix.bounds, group=self.p.group)
+        return np.sqrt(dx * dx + dy * dy)
+
+
+    def _validate(self, matrix):
+        if len(matrix.value_dimensions) != 1:
+            raise ValueError("Input matrix to gradient operation must "
+                             "have single value dimension.")
+        return matrix.value_dimensions[0]
+
+
+    def _process_array(self, data, element, key=None, out=None):
+        return self._gradient(data, self._validate(element))
+
+
+    def _wrap_array(self, data, element):
+        return Image(data, element.bounds, group=self.p.group)
+
+
+    def _process(self, matrix, key=None):
+        return self._wrap_array(self._process_array(matrix.data, matrix), matrix)
+
+
+    def _process_batch(self, matrices, keys):
+        dims = [self._validate(matrix) for matrix in matrices]
+        shapes = set(matrix.data.shape for matrix in matrices)
+        if len(shapes) > 1 or any(d != dims[0] for d in dims):
+            return super(gradient, self)._process_batch(matrices, keys)
+        stacked = np.array([matrix.data for matrix in matrices])
+        return [Image(data, matrix.bounds, group=self.p.group)
+                for data, matrix in zip(self._gradient(stacked, dims[0]), matrices)]
 
 
 
@@ -355,19 +459,29 @@ class fft_power(ElementOperation):
     The group assigned to the output power spectrum.""")
 
 
-    def _process(self, matrix, key=None):
+    def _normalize(self, matrix, key):
         normfn = raster_normalization.instance()
         if self.p.input_ranges:
-            matrix = normfn.process_element(matrix, key, *self.p.input_ranges)
+            return normfn.process_element(matrix, key, *self.p.input_ranges)
         else:
-            matrix = normfn.process_element(matrix, key)
+            return normfn.process_element(matrix, key)
+
 
-        fft_spectrum = abs(np.fft.fftshift(np.fft.fft2(matrix.data - 0.5, s=None, axes=(-2, -1))))
+    def _spectrum(self, data):
+        """
+        Computes the normalized power spectrum over the last two axes
+        of the data.
+        """
+        axes = (-2, -1)
+        fft_spectrum = abs(np.fft.fftshift(np.fft.fft2(data - 0.5, s=None, axes=axes), axes=axes))
         fft_spectrum = 1 - fft_spectrum # Inverted spectrum by convention
-        zero_min_spectrum = fft_spectrum - fft_spectrum.min()
-        spectrum_range = fft_spectrum.max() - fft_spectrum.min()
-        spectrum = (self.p.max_power * zero_min_spectrum) / spectrum_range
+        spectrum_min = fft_spectrum.min(axis=axes, keepdims=True)
+        zero_min_spectrum = fft_spectrum - spectrum_min
+        spectrum_range = fft_spectrum.max(axis=axes, keepdims=True) - spectrum_min
+        return (self.p.max_power * zero_min_spectrum) / spectrum_range
+
 
+    def _spectrum_image(self, spectrum, matrix):
         l, b, r, t = matrix.bounds.lbrt()
         density = matrix.xdensity
         bounds = BoundingBox(radius=(density/2)/(r-l))
@@ -375,12 +489,35 @@ class fft_power(ElementOperation):
         return Image(spectrum, bounds, label=matrix.label, group=self.p.group)
 
 
+    def _process(self, matrix, key=None):
+        matrix = self._normalize(matrix, key)
+        return self._spectrum_image(self._spectrum(matrix.data), matrix)
+
+
+    def _process_batch(self, matrices, keys):
+        matrices = [self._normalize(matrix, key) for matrix, key in zip(matrices, keys)]
+        if len(set(matrix.data.shape for matrix in matrices)) > 1:
+            return [self._spectrum_image(self._spectrum(matrix.data), matrix)
+                    for matrix in matrices]
+        spectra = self._spectrum(np.array([matrix.data for matrix in matrices]))
+        return [self._spectrum_image(spectrum, matrix)
+                for spectrum, matrix in zip(spectra, matrices)]
+
+
 
 class convolve(ElementOperation):
     """
     Apply a convolution to an overlay using the top layer as the
     kernel for convolving the bottom layer. Both Image elements in
     the input overlay should have a single value dimension.
+
+    The convolution wraps around the edges of the target. Small
+    kernels are applied directly (or as two one-dimensional passes if
+    the kernel is separable), larger kernels are applied by
+    multiplying real FFTs, caching the transform of each kernel for
+    every target shape it is applied to. When supplied with a HoloMap,
+    the frames in each batch sharing a kernel and target shape are
+    transformed together as a single stacked array.
     """
 
     output_type = Image
@@ -393,7 +530,23 @@ class convolve(ElementOperation):
         convolution in lbrt (left, bottom, right, top) format. By
         default, no slicing is applied.""")
 
-    def _process(self, overlay, key=None):
+    method = param.ObjectSelector(default='auto', objects=['auto', 'direct', 'fft'], doc="""
+        Whether to convolve directly or by multiplying FFTs. The auto
+        setting convolves directly whenever the number of kernel
+        values to apply (summed over both passes for separable
+        kernels) does not exceed direct_size.""")
+
+    direct_size = param.Integer(default=25, bounds=(0, None), doc="""
+        The largest number of kernel values applied directly when the
+        method is set to auto.""")
+
+    # Kernel FFTs keyed by kernel content and target shape, guarded
+    # by a lock as operations may be applied on multiple threads
+    _kernel_ffts = OrderedDict()
+    _kernel_cache_size = 32
+    _kernel_lock = threading.Lock()
+
+    def _get_inputs(self, overlay):
         if len(overlay) != 2:
             raise Exception("Overlay must contain at least to items.")
 
@@ -406,18 +559,103 @@ class convolve(ElementOperation):
         yslice = slice(self.p.kernel_roi[1], self.p.kernel_roi[3])
 
         k = kernel.data if self.p.kernel_roi == (0,0,0,0) else kernel[xslice, yslice].data
+        return target, np.asarray(k)
+
+
+    @classmethod
+    def _kernel_key(cls, k):
+        return (hashlib.sha1(np.ascontiguousarray(k).view(np.uint8)).hexdigest(),
+                k.shape, k.dtype.str)
 
-        fft1 = np.fft.fft2(target.data)
-        fft2 = np.fft.fft2(k, s= target.data.shape)
-        convolved_raw = np.fft.ifft2(fft1 * fft2).real
 
+    @classmethod
+    def _kernel_fft(cls, k, shape, key=None):
+        """
+        Returns the real FFT of the kernel padded (or cropped) to the
+        supplied shape, reusing previously computed transforms.
+        """
+        key = (cls._kernel_key(k) if key is None else key, shape)
+        with cls._kernel_lock:
+            if key in cls._kernel_ffts:
+                kernel_fft = cls._kernel_ffts.pop(key)
+                cls._kernel_ffts[key] = kernel_fft
+                return kernel_fft
+        kernel_fft = np.fft.rfft2(k, s=shape)
+        with cls._kernel_lock:
+            cls._kernel_ffts[key] = kernel_fft
+            while len(cls._kernel_ffts) > cls._kernel_cache_size:
+                cls._kernel_ffts.popitem(last=False)
+        return kernel_fft
+
+
+    def _convolve(self, data, k, key=None):
+        """
+        Convolves the last two axes of the data with the kernel,
+        centering and normalizing the result by the kernel sum.
+        """
+        data = np.asarray(data, dtype=np.float64)
+        shape = data.shape[-2:]
         k_rows, k_cols = k.shape
-        rolled = np.roll(np.roll(convolved_raw, -(k_cols//2), axis=-1), -(k_rows//2), axis=-2)
-        convolved = rolled / float(k.sum())
+        # Kernel values beyond the target shape are discarded
+        taps = np.asarray(k[:shape[0], :shape[1]], dtype=np.float64)
+
+        method, separable = self.p.method, None
+        if method == 'auto':
+            if taps.size > self.p.direct_size and sum(taps.shape) <= self.p.direct_size:
+                u, sv, v = np.linalg.svd(taps)
+                if sv[1:].sum() <= 1e-12 * sv[0]:
+                    separable = (u[:, 0]*sv[0], v[0])
+            method = 'direct' if (separable or taps.size <= self.p.direct_size) else 'fft'
+
+        if method == 'fft':
+            fft = np.fft.rfft2(data) * self._kernel_fft(k, shape, key)
+            convolved = np.fft.irfft2(fft, s=shape)
+            convolved = np.roll(np.roll(convolved, -(k_rows//2), axis=-2),
+                                -(k_cols//2), axis=-1)
+        elif separable:
+            rows, cols = separable
+            passed = np.zeros(data.shape)
+            for i, weight in enumerate(rows):
+                passed += weight * np.roll(data, i-k_rows//2, axis=-2)
+            convolved = np.zeros(data.shape)
+            for j, weight in enumerate(cols):
+                convolved += weight * np.roll(passed, j-k_cols//2, axis=-1)
+        else:
+            convolved = np.zeros(data.shape)
+            for i, row in enumerate(taps):
+                if not row.any(): continue
+                rolled = np.roll(data, i-k_rows//2, axis=-2)
+                for j, weight in enumerate(row):
+                    if weight == 0: continue
+                    convolved += weight * np.roll(rolled, j-k_cols//2, axis=-1)
+        return convolved / float(k.sum())
 
+
+    def _process(self, overlay, key=None):
+        target, k = self._get_inputs(overlay)
+        convolved = self._convolve(target.data, k)
         return Image(convolved, bounds=target.bounds, group=self.p.group)
 
 
+    def _process_batch(self, overlays, keys):
+        # Group the frames by kernel and target shape
+        inputs = [self._get_inputs(overlay) for overlay in overlays]
+        batches = OrderedDict()
+        for i, (target, k) in enumerate(inputs):
+            batch_key = (self._kernel_key(k), target.data.shape)
+            batches.setdefault(batch_key, []).append(i)
+
+        convolved = [None] * len(inputs)
+        for (kernel_key, _), indices in batches.items():
+            k = inputs[indices[0]][1]
+            stacked = np.array([inputs[i][0].data for i in indices])
+            for i, frame in zip(indices, self._convolve(stacked, k, kernel_key)):
+                convolved[i] = frame
+
+        return [Image(data, bounds=target.bounds, group=self.p.group)
+                for (target, _), data in zip(inputs, convolved)]
+
+
 
 class split_raster(ElementOperation):
     """
@@ -440,13 +678,137 @@ class split_raster(ElementOperation):
 
 
 
+# Edges of a marching squares cell, indexed in the segment table
+_TOP, _RIGHT, _BOTTOM, _LEFT = range(4)
+
+# The pairs of cell edges joined by the contour segments for each
+# case, where the case sums 8, 4, 2 and 1 for the top-left,
+# top-right, bottom-right and bottom-left corners above the level.
+# The saddle cases 5 and 10 join the corners above the level when
+# the cell center lies above the level, cases 16 and 17 hold the
+# alternative segments used when the center lies below.
+_SEGMENTS = -np.ones((18, 2, 2), dtype=int)
+for _case, _segments in {1:  [(_LEFT, _BOTTOM)],   2:  [(_BOTTOM, _RIGHT)],
+                         3:  [(_LEFT, _RIGHT)],    4:  [(_TOP, _RIGHT)],
+                         5:  [(_LEFT, _TOP), (_BOTTOM, _RIGHT)],
+                         6:  [(_TOP, _BOTTOM)],    7:  [(_LEFT, _TOP)],
+                         8:  [(_LEFT, _TOP)],      9:  [(_TOP, _BOTTOM)],
+                         10: [(_TOP, _RIGHT), (_LEFT, _BOTTOM)],
+                         11: [(_TOP, _RIGHT)],     12: [(_LEFT, _RIGHT)],
+                         13: [(_BOTTOM, _RIGHT)],  14: [(_LEFT, _BOTTOM)],
+                         16: [(_TOP, _RIGHT), (_LEFT, _BOTTOM)],
+                         17: [(_LEFT, _TOP), (_BOTTOM, _RIGHT)]}.items():
+    _SEGMENTS[_case, :len(_segments)] = _segments
+
+
+def marching_squares(data, levels):
+    """
+    Computes the contour lines of a 2D array at each of the supplied
+    levels using the marching squares algorithm, without requiring
+    matplotlib.
+
+    The contour segments for all levels are found in a single
+    vectorized pass over the cells of the array and are then
+    stitched into continuous lines, closing any loops by repeating
+    the first vertex. Cells with NaN corners are skipped.
+
+    Returns a list containing a list of lines per level, where each
+    line is an Nx2 array of fractional (column, row) indices into
+    the array.
+    """
+    data = np.asarray(data, dtype=np.float64)
+    levels = np.asarray(levels, dtype=np.float64).reshape(-1, 1, 1)
+    rows, cols = data.shape
+    if rows < 2 or cols < 2:
+        return [[] for _ in range(len(levels))]
+
+    # Classify the cells of every level at once
+    corners = [data[:-1, :-1], data[:-1, 1:], data[1:, 1:], data[1:, :-1]]
+    with np.errstate(invalid='ignore'):
+        above = data > levels
+        center_below = (sum(corners) / 4.) <= levels
+    cases = (8*above[:, :-1, :-1] + 4*above[:, :-1, 1:] +
+             2*above[:, 1:, 1:] + above[:, 1:, :-1])
+    cases[:, np.any(np.isnan(corners), axis=0)] = 0
+    cases[(cases == 5) & center_below] = 16
+    cases[(cases == 10) & center_below] = 17
+
+    # Every edge between two adjacent samples gets a unique node id,
+    # numbering the horizontal edges before the vertical ones and
+    # offsetting the ids of each level
+    nhorizontal = rows * (cols-1)
+    nnodes = nhorizontal + (rows-1) * cols
+    level, i, j = np.nonzero(cases)
+    edges = np.column_stack([i*(cols-1) + j,                  # Top
+                             nhorizontal + i*cols + j + 1,    # Right
+                             (i+1)*(cols-1) + j,              # Bottom
+                             nhorizontal + i*cols + j])       # Left
+    edges += (level * nnodes)[:, None]
+    segments = _SEGMENTS[cases[level, i, j]]
+    starts, ends = [], []
+    for k in range(2):
+        cells = np.flatnonzero(segments[:, k, 0] >= 0)
+        starts.append(edges[cells, segments[cells, k, 0]])
+        ends.append(edges[cells, segments[cells, k, 1]])
+    starts, ends = np.concatenate(starts), np.concatenate(ends)
+
+    # Interpolate the crossing point along each edge in use
+    nodes, inverse = np.unique(np.concatenate([starts, ends]), return_inverse=True)
+    node_levels, local = nodes // nnodes, nodes % nnodes
+    horizontal = local < nhorizontal
+    vertical = local - nhorizontal
+    i0 = np.where(horizontal, local // (cols-1), vertical // cols)
+    j0 = np.where(horizontal, local % (cols-1), vertical % cols)
+    z0 = data[i0, j0]
+    z1 = data[i0 + ~horizontal, j0 + horizontal]
+    frac = (levels.flat[node_levels] - z0) / (z1 - z0)
+    coords = np.column_stack([j0 + horizontal*frac, i0 + ~horizontal*frac])
+
+    # Each node joins at most two segments, allowing the lines to be
+    # traced by following the neighbours of each node in turn
+    nsegments = len(starts)
+    src = np.concatenate([inverse[:nsegments], inverse[nsegments:]])
+    dst = np.concatenate([inverse[nsegments:], inverse[:nsegments]])
+    order = np.argsort(src, kind='mergesort')
+    src, dst = src[order], dst[order]
+    first = np.searchsorted(src, src, 'left')
+    neighbours = -np.ones((len(nodes), 2), dtype=int)
+    neighbours[src, np.arange(len(src)) - first] = dst
+    degree = np.bincount(src, minlength=len(nodes))
+
+    lines = [[] for _ in range(len(levels))]
+    nb0, nb1 = neighbours[:, 0].tolist(), neighbours[:, 1].tolist()
+    visited = bytearray(len(nodes))
+    # Open lines start at nodes on the boundary, all others are loops
+    for start in np.concatenate([np.flatnonzero(degree == 1),
+                                 np.flatnonzero(degree == 2)]).tolist():
+        if visited[start]: continue
+        path, prev, current = [start], -1, start
+        visited[start] = 1
+        while True:
+            nxt = nb0[current] if nb0[current] != prev else nb1[current]
+            if nxt == -1:
+                break
+            elif visited[nxt]:
+                if nxt == start: path.append(start)
+                break
+            path.append(nxt)
+            visited[nxt] = 1
+            prev, current = current, nxt
+        lines[node_levels[start]].append(coords[path])
+    return lines
+
+
+
 class contours(ElementOperation):
     """
     Given a Image with a single channel, annotate it with contour
     lines for a given set of contour levels.
 
     The return is an NdOverlay with a Contours layer for each given
-    level, overlaid on top of the input Image.
+    level, overlaid on top of the input Image. The contours are
+    computed with the marching squares algorithm over the sample
+    positions of the Image, expressed in sheet coordinates.
     """
 
     output_type = Overlay
@@ -459,21 +821,19 @@ class contours(ElementOperation):
 
 
     def _process(self, matrix, key=None):
-        from matplotlib import pyplot as plt
-
-        figure_handle = plt.figure()
-        (l, b, r, t) = matrix.extents
-        contour_set = plt.contour(matrix.data, extent=(l, r, t, b),
-                                  levels=self.p.levels)
+        (l, b, r, t) = matrix.bounds.lbrt()
+        rows, cols = matrix.data.shape[:2]
+        xscale, yscale = (r-l) / float(cols), (t-b) / float(rows)
 
         contours = NdOverlay(None, key_dimensions=['Levels'])
-        for level, cset in zip(self.p.levels, contour_set.collections):
-            paths = cset.get_paths()
-            lines = [path.vertices for path in paths]
-            contours[level] = Contours(lines, group=self.p.group,
+        for level, lines in zip(self.p.levels, marching_squares(matrix.data, self.p.levels)):
+            # Map the sample indices to the sheet coordinates of the
+            # corresponding cell centers
+            paths = [np.column_stack([l + (line[:, 0] + 0.5) * xscale,
+                                      t - (line[:, 1] + 0.5) * yscale])
+                     for line in lines]
+            contours[level] = Contours(paths, level=level, group=self.p.group,
                                        label=matrix.label)
-
-        plt.close(figure_handle)
         return matrix * contours
 
 
@@ -485,6 +845,12 @@ class histogram(ElementOperation):
 
     If adjoin is True, the histogram will be returned adjoined to
     the Raster as a side-plot.
+
+    When a HoloMap is processed with individually set to False, the
+    bins are shared across all frames, spanning the declared range of
+    the dimension or otherwise the combined range of the data. All
+    frames sharing the same bins are binned together, with the values
+    of the resulting Histograms held in a single 2D array.
     """
 
     adjoin = param.Boolean(default=True, doc="""
@@ -508,11 +874,88 @@ class histogram(ElementOperation):
     style_prefix = param.String(default=None, allow_None=None, doc="""
       Used for setting a common style for histograms in a HoloMap or AdjointLayout.""")
 
-    def _process(self, view, key=None):
+    def _selected_dim(self, view):
         if self.p.dimension:
-            selected_dim = self.p.dimension
-        else:
-            selected_dim = [d.name for d in view.value_dimensions + view.key_dimensions][0]
+            return self.p.dimension
+        return [d.name for d in view.value_dimensions + view.key_dimensions][0]
+
+
+    def shared_range(self, views):
+        """
+        Returns the range spanning the selected dimension across all
+        the supplied elements, using the declared range of the
+        dimension if available. Any undeclared bounds are computed
+        in a single pass over the data computing the running minimum
+        and maximum.
+        """
+        dimension = views[0].get_dimension(self._selected_dim(views[0]))
+        declared = tuple(dimension.range) if dimension.range else (None, None)
+        if None not in declared:
+            return declared
+        lower, upper = np.inf, -np.inf
+        for view in views:
+            data = np.asarray(view.dimension_values(self._selected_dim(view)), dtype=np.float64)
+            if len(data) and not np.all(np.isnan(data)):
+                lower, upper = min(lower, np.nanmin(data)), max(upper, np.nanmax(data))
+        if lower > upper:
+            lower, upper = 0, 0
+        lower = lower if declared[0] is None else declared[0]
+        upper = upper if declared[1] is None else declared[1]
+        return (lower, upper)
+
+
+    def _process_items(self, items):
+        # Shared bins are resolved over all frames before batching
+        if not self.p.individually and self.p.bin_range is None:
+            self.p.bin_range = self.shared_range([el for _, el in items])
+        return super(histogram, self)._process_items(items)
+
+
+    def _wrap_histogram(self, view, values, edges, selected_dim):
+        hist_view = Histogram(values, edges, key_dimensions=[view.get_dimension(selected_dim)],
+                              label=view.label)
+        return (view << hist_view) if self.p.adjoin else hist_view
+
+
+    def _process_batch(self, views, keys):
+        if self.p.bin_range is None or len(views) < 2:
+            return super(histogram, self)._process_batch(views, keys)
+
+        # Avoids range issues including zero bin range
+        lower, upper = self.p.bin_range
+        if (lower, upper) == (0, 0):
+            lower, upper = (0.0, 0.1)
+        elif lower == upper:
+            lower, upper = lower - 0.5, upper + 0.5
+        num_bins = self.p.num_bins
+        edges = np.linspace(lower, upper, num_bins + 1)
+
+        # Bin the stacked data of all frames at once, offsetting the
+        # bin indices of each frame
+        selected = [self._selected_dim(view) for view in views]
+        data = [np.asarray(view.dimension_values(dim), dtype=np.float64).ravel()
+                for view, dim in zip(views, selected)]
+        frames = np.repeat(np.arange(len(data)), [len(d) for d in data])
+        data = np.concatenate(data)
+        bins = np.searchsorted(edges, data, 'right') - 1
+        bins[data == upper] = num_bins - 1 # Last bin includes the upper edge
+        valid = (bins >= 0) & (bins < num_bins)
+        counts = np.bincount(frames[valid] * num_bins + bins[valid],
+                             minlength=len(views) * num_bins)
+        values = counts.reshape(len(views), num_bins).astype(np.float64)
+
+        if self.p.normed:
+            totals = values.sum(axis=1, keepdims=True)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                values /= totals * np.diff(edges)
+            values[np.isnan(values)] = 0
+
+        return [self._wrap_histogram(view, values[i], edges, dim)
+                for i, (view, dim) in enumerate(zip(views, selected))]
+
+
+    def _process(self, view, key=None):
+        selected_dim = self._selected_dim(view)
         data = np.array(view.dimension_values(selected_dim))
         range = find_minmax((np.min(data), np.max(data)), (0, -float('inf')))\
             if self.p.bin_range is None else self.p.bin_range
@@ -529,10 +972,179 @@ class histogram(ElementOperation):
             hist = np.zeros(self.p.num_bins)
         hist[np.isnan(hist)] = 0
 
-        hist_view = Histogram(hist, edges, key_dimensions=[view.get_dimension(selected_dim)],
-                              label=view.label)
+        return self._wrap_histogram(view, hist, edges, selected_dim)
 
-        return (view << hist_view) if self.p.adjoin else hist_view
+
+
+class HistogramAccumulator(param.Parameterized):
+    """
+    Accumulates a histogram of a stream of samples, allowing the
+    distribution of a long running process to be kept up to date by
+    binning only the newly arriving samples on each update.
+
+    The bins span the bin_range if supplied and otherwise the range
+    of the first batch of samples. When adaptive, samples falling
+    outside the current bins extend the range by repeatedly merging
+    adjacent pairs of bins, keeping the number of bins fixed.
+    Otherwise such samples are discarded and counted as outliers.
+
+    Partial accumulators, e.g. computed in parallel, may be combined
+    using merge, and a Histogram snapshot of the accumulated counts
+    may be obtained at any time. If a source is supplied, the
+    accumulator may be collected by a Collector, drawing new samples
+    from the source on each collection.
+    """
+
+    adaptive = param.Boolean(default=True, doc="""
+      Whether to extend the range of the bins to include samples
+      outside the current bins.""")
+
+    bin_range = param.NumericTuple(default=None, length=2, allow_None=True, doc="""
+      Specifies the initial range of the bins, otherwise determined by
+      the first batch of samples.""")
+
+    dimension = param.ClassSelector(class_=(Dimension, str), default='x', doc="""
+      The dimension of the accumulated samples.""")
+
+    normed = param.Boolean(default=True, doc="""
+      Whether the histogram snapshots are normalized.""")
+
+    num_bins = param.Integer(default=20, bounds=(1, None), doc="""
+      Number of bins in the histogram.""")
+
+    source = param.Callable(default=None, doc="""
+      Callable returning the samples that have arrived since the last
+      call, used to update the accumulator when collected.""")
+
+    def __init__(self, **params):
+        super(HistogramAccumulator, self).__init__(**params)
+        self.counts = np.zeros(self.num_bins)
+        self.count = 0
+        self.outliers = 0
+        self.lower, self.width = None, None
+        if self.bin_range is not None:
+            self._set_range(*self.bin_range)
+
+
+    @property
+    def edges(self):
+        if self.lower is None:
+            return None
+        return self.lower + self.width * np.arange(self.num_bins + 1)
+
+
+    def _set_range(self, lower, upper):
+        if lower == upper:
+            lower, upper = lower - 0.5, upper + 0.5
+        self.lower = float(lower)
+        self.width = float(upper - lower) / self.num_bins
+        # Ensures the upper edge is not rounded below the range
+        while self.lower + self.width * self.num_bins < upper:
+            self.width = np.nextafter(self.width, np.inf)
+
+
+    def _extend(self, lower, upper):
+        """
+        Doubles the bin width until the bins span the supplied range,
+        merging adjacent pairs of bins at each step. The bins grow
+        upwards or downwards towards the values outside the range.
+        """
+        while lower < self.lower or upper > self.lower + self.width * self.num_bins:
+            downward = lower < self.lower
+            counts = self.counts
+            if len(counts) % 2:
+                counts = np.concatenate([[0], counts] if downward else [counts, [0]])
+            merged = counts.reshape(-1, 2).sum(axis=1)
+            padding = np.zeros(self.num_bins - len(merged))
+            if downward:
+                self.lower -= self.width * self.num_bins
+                self.counts = np.concatenate([padding, merged])
+            else:
+                self.counts = np.concatenate([merged, padding])
+            self.width *= 2
+
+
+    def _accumulate(self, samples, weights=None):
+        if weights is None:
+            weights = np.ones(len(samples))
+        # Infinite samples can never be binned and count as outliers
+        infinite = np.isinf(samples)
+        self.outliers += weights[infinite].sum()
+        valid = np.isfinite(samples)
+        samples, weights = samples[valid], weights[valid]
+        if not len(samples):
+            return
+        lower, upper = samples.min(), samples.max()
+        if self.lower is None:
+            self._set_range(lower, upper)
+        elif self.adaptive:
+            self._extend(lower, upper)
+
+        # The last bin includes the upper edge, clipping rounding errors
+        upper = self.lower + self.width * self.num_bins
+        inside = (samples >= self.lower) & (samples <= upper)
+        bins = np.floor((samples - self.lower) / self.width).astype(int)
+        bins = np.clip(bins, 0, self.num_bins - 1)
+        self.outliers += weights[~inside].sum()
+        self.counts += np.bincount(bins[inside], weights[inside], self.num_bins)
+        self.count += weights[inside].sum()
+
+
+    def update(self, samples):
+        """
+        Bins the supplied samples into the accumulated counts, ignoring
+        NaNs and counting infinite samples as outliers, and returns the
+        accumulator.
+        """
+        samples = np.asarray(samples, dtype=np.float64).ravel()
+        self._accumulate(samples)
+        return self
+
+
+    def merge(self, *others):
+        """
+        Adds the counts of the supplied accumulators to this one and
+        returns it. Counts of bins that do not align with the bins of
+        this accumulator are assigned according to the bin centers.
+        """
+        for other in others:
+            if other.lower is None:
+                continue
+            self.outliers += other.outliers
+            if self.lower is None:
+                self.lower, self.width = other.lower, other.width
+            aligned = (self.lower, self.width) == (other.lower, other.width)
+            if aligned:
+                self.counts += other.counts
+                self.count += other.count
+            else:
+                self._accumulate(other.edges[:-1] + other.width/2., other.counts)
+        return self
+
+
+    def snapshot(self, **kwargs):
+        """
+        Returns a Histogram of the accumulated counts. The supplied
+        keywords are passed to the Histogram constructor.
+        """
+        if self.lower is None:
+            edges = np.linspace(0, 0.1, self.num_bins + 1)
+        else:
+            edges = self.edges
+        values = self.counts.copy()
+        if self.normed and self.count:
+            values /= self.count * self.width
+        return Histogram(values, edges, key_dimensions=[self.dimension], **kwargs)
+
+
+    def __call__(self, **kwargs):
+        """
+        Updates the accumulator with the new samples from the source
+        if supplied and returns a Histogram snapshot.
+        """
+        if self.source is not None:
+            self.update(self.source())
+        return self.snapshot(**kwargs)
 
 
 
@@ -574,13 +1186,12 @@ class vectorfield(ElementOperation):
         X, Y = np.meshgrid(np.linspace(l, r, self.p.cols+2)[1:-1],
                            np.linspace(b, t, self.p.rows+2)[1:-1])
 
-        vector_data = []
-        for x, y in zip(X.flat, Y.flat):
-            components = (x,y, radians[x,y])
-            if lengths is not None:
-                components += (lengths[x,y],)
-
-            vector_data.append(components)
+        # Gather the samples at all grid positions at once
+        xs, ys = X.flatten(), Y.flatten()
+        columns = [xs, ys, radians.data[radians.sheet2matrixidx(xs, ys)]]
+        if lengths is not None:
+            columns.append(lengths.data[lengths.sheet2matrixidx(xs, ys)])
+        vector_data = np.column_stack(columns)
 
         value_dimensions = [Dimension('Magnitude'),
                             Dimension('Angle', cyclic=True, range=cyclic_dim.range)]
@@ -589,6 +1200,165 @@ class vectorfield(ElementOperation):
 
 
 
+class aggregate(ElementOperation):
+    """
+    Bins the coordinates of a Points (or Scatter) element into a
+    regular grid, returning an Image of the number of points falling
+    into each cell or the sum, mean or maximum of a value dimension
+    over those points. Unlike plotting each point individually, the
+    cost of rendering the result is independent of the number of
+    points.
+
+    The points are binned in chunks of chunk_size rows, keeping the
+    memory overhead bounded for very large inputs. If supplied with an
+    overlay, the points in all the layers are accumulated into a
+    single Image, allowing data that has been loaded in chunks to be
+    aggregated without first being concatenated.
+
+    To render large Points in an Overlay as a raster upon display, a
+    display mode Compositor may be defined, e.g.:
+
+    Compositor('Points', aggregate, 'Aggregate', 'display')
+    """
+
+    output_type = Image
+
+    aggregator = param.ObjectSelector(default='count',
+                                      objects=['count', 'sum', 'mean', 'max'], doc="""
+       The reduction applied to the points falling into each cell,
+       either the number of points or the sum, mean or maximum of the
+       selected value dimension. Empty cells are assigned zero for
+       count and sum and NaN for mean and max.""")
+
+    bounds = param.Parameter(default=None, doc="""
+       The bounds of the output Image, as a BoundingBox or an
+       (l, b, r, t) tuple. Points outside the bounds are discarded.
+       By default the extents of the input are used.""")
+
+    dimension = param.String(default=None, doc="""
+       The value dimension to aggregate; defaults to the first
+       dimension after the x and y coordinates. Not required when
+       counting points.""")
+
+    xdensity = param.Number(default=None, bounds=(0, None), doc="""
+       The number of cells per unit along the x-axis. If not
+       supplied, the number of columns is given by the shape
+       parameter.""")
+
+    ydensity = param.Number(default=None, bounds=(0, None), doc="""
+       The number of cells per unit along the y-axis. If not
+       supplied, the number of rows is given by the shape
+       parameter.""")
+
+    shape = param.NumericTuple(default=(100, 100), doc="""
+       The number of (rows, columns) in the output Image, used
+       whenever the corresponding density is not supplied.""")
+
+    chunk_size = param.Integer(default=1000000, bounds=(1, None), doc="""
+       The number of points binned at once.""")
+
+    group = param.String(default='Aggregate', doc="""
+       The group assigned to the output Image.""")
+
+
+    def _get_bounds(self, elements):
+        if self.p.bounds is not None:
+            bounds = self.p.bounds
+            return bounds.lbrt() if isinstance(bounds, BoundingBox) else tuple(bounds)
+        xs, ys = [[el.dimension_values(i) for el in elements if len(el)] for i in (0, 1)]
+        if not xs:
+            return -0.5, -0.5, 0.5, 0.5
+        (l, r), (b, t) = [(np.nanmin([np.nanmin(v) for v in vals]),
+                           np.nanmax([np.nanmax(v) for v in vals])) for vals in (xs, ys)]
+        # Avoids zero width bounds for degenerate inputs
+        if r == l: l, r = l-0.5, r+0.5
+        if t == b: b, t = b-0.5, t+0.5
+        return l, b, r, t
+
+
+    def _accumulate(self, xs, ys, vs, lbrt, shape, accumulators):
+        """
+        Bins a chunk of points, updating the flat count, sum and
+        maximum accumulators in place.
+        """
+        l, b, r, t = lbrt
+        rows, cols = shape
+        counts, sums, maxs = accumulators
+
+        mask = (xs >= l) & (xs <= r) & (ys >= b) & (ys <= t)
+        if vs is not None:
+            mask &= ~np.isnan(vs)
+            vs = vs[mask]
+        # Row zero lies along the top edge as in an Image
+        col = ((xs[mask] - l) * (cols / float(r - l))).astype(int)
+        row = ((t - ys[mask]) * (rows / float(t - b))).astype(int)
+        # Points on the right and bottom edges fall into the last cells
+        np.minimum(col, cols-1, out=col)
+        np.minimum(row, rows-1, out=row)
+        cells = row * cols + col
+
+        counts += np.bincount(cells, minlength=rows*cols)
+        if vs is None or not len(cells):
+            return
+        if sums is not None:
+            sums += np.bincount(cells, weights=vs, minlength=rows*cols)
+        if maxs is not None:
+            # After sorting by cell and value, the last entry of each
+            # run of identical cells holds the maximum for that cell
+            order = np.lexsort((vs, cells))
+            cells, vs = cells[order], vs[order]
+            last = np.append(cells[1:] != cells[:-1], True)
+            maxs[cells[last]] = np.maximum(maxs[cells[last]], vs[last])
+
+
+    def _process(self, view, key=None):
+        elements = view.values() if isinstance(view, CompositeOverlay) else [view]
+        aggregator = self.p.aggregator
+        l, b, r, t = self._get_bounds(elements)
+
+        rows, cols = self.p.shape
+        if self.p.xdensity: cols = max(1, int(round((r-l) * self.p.xdensity)))
+        if self.p.ydensity: rows = max(1, int(round((t-b) * self.p.ydensity)))
+
+        counts = np.zeros(rows*cols, dtype=np.int64)
+        sums = np.zeros(rows*cols) if aggregator in ['sum', 'mean'] else None
+        maxs = np.full(rows*cols, -np.inf) if aggregator == 'max' else None
+
+        vdim = None
+        for el in elements:
+            if aggregator != 'count':
+                dims = el.dimensions()
+                vdim = (el.get_dimension(self.p.dimension) if self.p.dimension
+                        else dims[2] if len(dims) > 2 else None)
+                if vdim is None:
+                    raise ValueError("%s has no value dimension to aggregate."
+                                     % type(el).__name__)
+            xs, ys = el.dimension_values(0), el.dimension_values(1)
+            vs = None if vdim is None else el.dimension_values(vdim.name)
+            for start in range(0, len(xs), self.p.chunk_size):
+                chunk = slice(start, start+self.p.chunk_size)
+                self._accumulate(np.asarray(xs[chunk], dtype=np.float64),
+                                 np.asarray(ys[chunk], dtype=np.float64),
+                                 None if vs is None else np.asarray(vs[chunk], dtype=np.float64),
+                                 (l, b, r, t), (rows, cols), (counts, sums, maxs))
+
+        if aggregator == 'count':
+            data, vdim = counts, Dimension('Count')
+        elif aggregator == 'sum':
+            data = sums
+        elif aggregator == 'mean':
+            data = np.full(rows*cols, np.NaN)
+            np.divide(sums, counts, out=data, where=counts > 0)
+        else:
+            data = np.where(counts > 0, maxs, np.NaN)
+
+        return Image(data.reshape(rows, cols), bounds=BoundingBox(points=((l, b), (r, t))),
+                     xdensity=cols/float(r-l), ydensity=rows/float(t-b),
+                     key_dimensions=elements[0].dimensions()[:2],
+                     value_dimensions=[vdim], group=self.p.group, label=elements[0].label)
+
+
+
 class analyze_roi(ElementOperation):
     """
     Compute a table of information from a Image within the indicated
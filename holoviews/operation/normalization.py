@@ -13,6 +13,8 @@ normalizations result in transformations to the stored data within
 each element.
 """
 
+import numpy as np
+
 import param
 from ..core.operation import ElementOperation
 from ..element import Raster
@@ -152,23 +154,39 @@ class raster_normalization(Normalization):
 
     def _normalize_raster(self, raster, key):
         if not isinstance(raster, Raster): return raster
-        norm_raster = raster.clone(raster.data.copy())
+        return raster.clone(self._process_array(raster.data, raster, key))
+
+
+    def _process_array(self, data, raster, key=None, out=None):
+        if out is None:
+            out = data.copy()
+        elif out is not data:
+            out[...] = data
         ranges = self.get_ranges(raster, key)
+        if self.p.ranges == {} and self.data_range and data is not raster.data:
+            # Data ranges of the raster are stale after fused kernels
+            ranges = dict(ranges, **{d.name: (np.nanmin(data), np.nanmax(data))
+                                     for d in raster.value_dimensions[:1]
+                                     if len(data.shape) == 2})
 
         for depth, name in enumerate(d.name for d in raster.value_dimensions):
             depth_range = ranges.get(name, (None, None))
             if None in depth_range:  continue
-            if depth_range and len(norm_raster.data.shape) == 2:
+            if depth_range and len(out.shape) == 2:
                 depth_range = ranges[name]
-                norm_raster.data[:,:] -= depth_range[0]
+                out[:,:] -= depth_range[0]
                 range = (depth_range[1] - depth_range[0])
                 if range:
-                    norm_raster.data[:,:] /= range
+                    out[:,:] /= range
             elif depth_range:
-                norm_raster.data[:,:,depth] -= depth_range[0]
+                out[:,:,depth] -= depth_range[0]
                 range = (depth_range[1] - depth_range[0])
                 if range:
-                    norm_raster.data[:,:,depth] /= range
-        return norm_raster
+                    out[:,:,depth] /= range
+        return out
+
+
+    def _wrap_array(self, data, raster):
+        return raster.clone(data)
 
 
@@ -1,4 +1,5 @@
-import os
+import os, threading
+from contextlib import contextmanager
 from io import BytesIO
 from tempfile import NamedTemporaryFile
 
@@ -7,12 +8,13 @@ try: basestring = basestring
 except: basestring = str
 
 from matplotlib import ticker
-from matplotlib import rc_params_from_file
+from matplotlib import rc_params_from_file, rcParams
 
 from param.parameterized import bothmethod
 
 from ..core.options import Cycle, Palette, Options, Store, StoreOptions
 from ..core import Dimension
+from ..core.traversal import unique_dimkeys
 from ..core.io import Exporter
 from .annotation import * # pyflakes:ignore (API import)
 from .chart import * # pyflakes:ignore (API import)
@@ -20,6 +22,7 @@ from .chart3d import * # pyflakes:ignore (API import)
 from .plot import * # pyflakes:ignore (API import)
 from .raster import * # pyflakes:ignore (API import)
 from .tabular import * # pyflakes:ignore (API import)
+from .profiler import RenderProfiler
 from . import pandas # pyflakes:ignore (API import)
 from . import seaborn # pyflakes:ignore (API import)
 
@@ -41,6 +44,10 @@ HTML_TAGS = {
     'mp4':  ('video/mp4',    VIDEO_TAG)
 }
 
+# Serializes the rendering of plots by the display hooks with the
+# rendering of widget frames on background threads
+render_lock = threading.RLock()
+
 # <format name> : (animation writer, format,  anim_kwargs, extra_args)
 ANIMATION_OPTS = {
     'webm': ('ffmpeg', 'webm', {},
@@ -132,11 +139,25 @@ class MPLPlotRenderer(Exporter):
     key_fn = param.Callable(None, allow_None=True, constant=True,  doc="""
         MPLPlotRenderer does not support the saving of object key metadata""")
 
+    # Holds the (object, id, data, format, size, dpi) already rendered
+    # for the object currently being displayed in each thread, if any
+    _reuse = threading.local()
+
 
     def __call__(self, obj, fmt=None):
         """
         Render the supplied HoloViews component using matplotlib.
         """
+        if fmt is None and isinstance(obj, HoloMap):
+            fmt = self.holomap if len(obj) > 1 else self.fig
+            if fmt is None: return
+
+        rendered = self._lookup_rendered(obj, fmt)
+        if rendered is not None:
+            (data, fmt) = rendered
+            return data, {'file-ext':fmt,
+                          'mime_type':HTML_TAGS[fmt][0]}
+
         if isinstance(obj, AdjointLayout):
             obj = Layout.from_values(obj)
 
@@ -166,6 +187,58 @@ class MPLPlotRenderer(Exporter):
                       'mime_type':HTML_TAGS[fmt][0]}
 
 
+    @classmethod
+    @contextmanager
+    def reusing(cls, obj, data=None, fmt=None, size=None, dpi=None):
+        """
+        Context manager within which rendering the supplied object to
+        the given format, size and dpi returns the data already
+        rendered for it, e.g. for display, instead of rendering it
+        again. The object must not be modified within the context and
+        if it is None, nothing is reused.
+        """
+        cls._reuse.rendered = None if obj is None else (obj, obj.id, data, fmt, size, dpi)
+        try:
+            yield
+        finally:
+            cls._reuse.rendered = None
+
+
+    @classmethod
+    def reused(cls):
+        """
+        Returns the arguments of the reusing context active in the
+        current thread, allowing it to be entered in another thread,
+        or None if there is no active context.
+        """
+        rendered = getattr(cls._reuse, 'rendered', None)
+        if rendered is None:
+            return None
+        (obj, _, data, fmt, size, dpi) = rendered
+        return (obj, data, fmt, size, dpi)
+
+
+    def _lookup_rendered(self, obj, fmt):
+        """
+        Returns the data already rendered for the object and its format
+        if they match the format, size and resolution this renderer
+        would produce. The default format is only determined, from the
+        number of frames of the object, if a render may be reused.
+        """
+        rendered = getattr(MPLPlotRenderer._reuse, 'rendered', None)
+        if rendered is None:
+            return None
+        (robj, rid, data, rfmt, size, dpi) = rendered
+        if robj is not obj or rid != obj.id:
+            return None
+        if fmt is None:
+            fmt = self.holomap if len(unique_dimkeys(obj)[1]) > 1 else self.fig
+        if (rfmt == fmt and size == self.size
+            and dpi == (self.dpi if self.dpi else rcParams['savefig.dpi'])):
+            return data, fmt
+        return None
+
+
     @bothmethod
     def save(self_or_cls, obj, basename, fmt=None, key={}, info={}, options=None, **kwargs):
         """
@@ -223,6 +296,8 @@ class MPLPlotRenderer(Exporter):
 
 
 Store.renderer = MPLPlotRenderer
+RenderProfiler.targets.extend([('render', MPLPlotRenderer, 'figure_data'),
+                              ('render', MPLPlotRenderer, 'anim_data')])
 
 def set_style(key):
     """
@@ -302,5 +377,5 @@ def public(obj):
     return any([issubclass(obj, bc) for bc in baseclasses])
 
 
-_public = ["MPLPlotRenderer", "GrayNearest"] + list(set([_k for _k, _v in locals().items() if public(_v)]))
+_public = ["MPLPlotRenderer", "RenderProfiler", "GrayNearest"] + list(set([_k for _k, _v in locals().items() if public(_v)]))
 __all__ = _public
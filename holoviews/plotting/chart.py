@@ -15,6 +15,120 @@ from .element import ElementPlot
 from .plot import Plot
 
 
+def minmax_decimate(data, x_range, buckets):
+    """
+    Decimates an array of samples sorted along the first column by
+    splitting the x_range into the given number of equal width
+    buckets and retaining the first, last, minimum and maximum sample
+    of each bucket, preserving the envelope of the plotted line.
+    Samples outside the x_range are dropped, apart from the closest
+    sample on either side.
+    """
+    (l, r), xs = x_range, data[:, 0]
+    lo = max(np.searchsorted(xs, l, 'left') - 1, 0)
+    hi = min(np.searchsorted(xs, r, 'right') + 1, len(xs))
+    data = data[lo:hi]
+    xs, ys = data[:, 0], data[:, 1]
+
+    scaled = np.clip((xs - l) / float(r - l) * buckets, -1, buckets)
+    bucket = np.floor(scaled).astype(int)
+    changes = np.flatnonzero(np.diff(bucket)) + 1
+    starts = np.concatenate([[0], changes])
+    ends = np.concatenate([changes, [len(xs)]])
+    segment = np.repeat(np.arange(len(starts)), ends - starts)
+
+    extrema = []
+    for reduction in [np.minimum, np.maximum]:
+        matches = np.flatnonzero(ys == reduction.reduceat(ys, starts)[segment])
+        _, first = np.unique(segment[matches], return_index=True)
+        extrema.append(matches[first])
+    return data[np.unique(np.concatenate([starts, ends-1] + extrema))]
+
+
+def lttb_decimate(data, samples):
+    """
+    Decimates an array of samples sorted along the first column to
+    the given number of samples using the Largest-Triangle-Three-
+    Buckets algorithm, which retains the sample in each bucket
+    spanning the largest triangle with the sample retained in the
+    previous bucket and the average of the next bucket.
+    """
+    n = len(data)
+    if samples >= n or samples < 3:
+        return data
+    xs, ys = data[:, 0], data[:, 1]
+    edges = np.linspace(1, n-1, samples-1).astype(int)
+    edges = np.concatenate([edges, [n]])
+    retained = np.zeros(samples, dtype=int)
+    retained[-1] = n-1
+    selected = 0
+    for i in range(samples-2):
+        start, end = edges[i], edges[i+1]
+        next_x = xs[end:edges[i+2]].mean()
+        next_y = ys[end:edges[i+2]].mean()
+        ax, ay = xs[selected], ys[selected]
+        areas = np.abs((ax - next_x) * (ys[start:end] - ay) -
+                       (ax - xs[start:end]) * (next_y - ay))
+        selected = start + np.argmax(areas)
+        retained[i+1] = selected
+    return data[retained]
+
+
+
+def _grid_spacing(xs, ys):
+    """
+    Returns the smallest spacing between the points if they lie on a
+    regular grid ordered row by row along xs, otherwise None.
+    """
+    cols = np.argmax(ys != ys[0]) or len(ys)
+    if len(xs) % cols:
+        return None
+    X, Y = xs.reshape(-1, cols), ys.reshape(-1, cols)
+    if not (np.all(X == X[0]) and np.all(Y == Y[:, :1])):
+        return None
+    steps = []
+    for diffs in (np.diff(X[0]), np.diff(Y[:, 0])):
+        if not len(diffs):
+            continue
+        if diffs[0] == 0 or not np.allclose(diffs, diffs[0]):
+            return None
+        steps.append(abs(diffs[0]))
+    return min(steps) if steps else None
+
+
+def min_distance(xs, ys):
+    """
+    Returns the smallest distance between any two of the supplied
+    points (or infinity for fewer than two points).
+
+    Points on a regular grid are detected in linear time. Otherwise
+    the points are sorted along the axis with the widest spread and
+    each point is compared against its k-th successor for increasing
+    k, until the gap along the sorted axis alone exceeds the closest
+    distance found so far.
+    """
+    xs, ys = np.asarray(xs, dtype=np.float64), np.asarray(ys, dtype=np.float64)
+    if len(xs) < 2:
+        return np.inf
+    for axes in [(xs, ys), (ys, xs)]:
+        spacing = _grid_spacing(*axes)
+        if spacing is not None:
+            return spacing
+
+    if np.ptp(ys) > np.ptp(xs):
+        xs, ys = ys, xs
+    order = np.argsort(xs, kind='mergesort')
+    xs, ys = xs[order], ys[order]
+    best, k = np.inf, 1
+    while k < len(xs):
+        dx = xs[k:] - xs[:-k]
+        if dx.min() >= best:
+            break
+        best = min(best, np.hypot(dx, ys[k:] - ys[:-k]).min())
+        k += 1
+    return best
+
+
 class ChartPlot(ElementPlot):
 
     def __init__(self, data, **params):
@@ -106,6 +220,16 @@ class CurvePlot(ChartPlot):
         If enabled and plotted quantity is cyclic will center the
         plot around the peak.""")
 
+    decimate = param.ObjectSelector(default=None, objects=[None, 'minmax', 'lttb'], doc="""
+        Whether to decimate Curves with many more samples than pixels
+        along the x-axis before plotting, so the rendering time
+        depends on the width of the axis rather than on the number
+        of samples. The 'minmax' algorithm retains the first, last,
+        minimum and maximum sample per pixel, preserving the visual
+        envelope exactly, while 'lttb' retains one sample per pixel
+        using the Largest-Triangle-Three-Buckets algorithm. Only
+        Curves sorted along the x-axis are decimated.""")
+
     num_ticks = param.Integer(default=5, doc="""
         If autotick is disabled, this number of tickmarks will be drawn.""")
 
@@ -141,6 +265,8 @@ class CurvePlot(ChartPlot):
                 self.peak_argmax = np.argmax(element.data[:, 1])
             data = self._cyclic_curves(element)
             xticks = self._cyclic_reduce_ticks(self.xvalues)
+        else:
+            data = self._decimate(axis, element, data, ranges)
 
         # Create line segments and apply style
         style = self.style[self.cyclic_index]
@@ -152,10 +278,37 @@ class CurvePlot(ChartPlot):
         return self._finalize_axis(self.keys[-1], ranges=ranges, xticks=xticks)
 
 
+    def _decimate(self, axis, element, data, ranges):
+        """
+        Decimates the data according to the decimate parameter, given
+        the width of the axis in pixels and the x-range of the plot.
+        """
+        if self.decimate is None or len(data) < 3:
+            return data
+        width = int(np.ceil(axis.get_window_extent().width))
+        samples_per_pixel = 4 if self.decimate == 'minmax' else 1
+        xs = data[:, 0]
+        if len(data) <= width * samples_per_pixel or not np.all(xs[1:] >= xs[:-1]):
+            return data
+
+        l, _, r, _ = self.get_extents(element, ranges)
+        l = xs[0] if l is None or not np.isfinite(l) else l
+        r = xs[-1] if r is None or not np.isfinite(r) else r
+        if self.decimate == 'lttb':
+            lo = max(np.searchsorted(xs, l, 'left') - 1, 0)
+            hi = min(np.searchsorted(xs, r, 'right') + 1, len(xs))
+            return lttb_decimate(data[lo:hi], width)
+        elif r > l:
+            return minmax_decimate(data, (l, r), width)
+        return data
+
+
     def update_handles(self, axis, view, key, ranges=None):
         data = view.data
         if self.cyclic_range is not None:
             data = self._cyclic_curves(view)
+        else:
+            data = self._decimate(axis, view, data, ranges)
         self.handles['line_segment'].set_xdata(data[:, 0])
         self.handles['line_segment'].set_ydata(data[:, 1])
 
@@ -582,12 +735,16 @@ class VectorFieldPlot(ElementPlot):
 
     def _get_map_info(self, vmap):
         """
-        Get the minimum sample distance and maximum magnitude
+        Get the minimum sample distance across all frames of the map,
+        reusing the result for frames sharing the same positions.
         """
-        dists = []
+        dists, positions = [], None
         for vfield in vmap:
-            dists.append(self._get_min_dist(vfield))
-        return min(dists)
+            xys = vfield.data[:, :2]
+            if positions is None or not np.array_equal(xys, positions):
+                dists.append(self._get_min_dist(vfield))
+                positions = xys
+        return min(dists) if dists else None
 
 
     def _get_info(self, vfield, input_scale, ranges):
@@ -601,7 +758,7 @@ class VectorFieldPlot(ElementPlot):
             magnitude_dim = vfield.get_dimension(3).name
             _, max_magnitude = ranges[magnitude_dim]
 
-        min_dist =      self._min_dist if self._min_dist else self._get_min_dist(vfield)
+        min_dist = self._get_min_dist(vfield) if self._min_dist is None else self._min_dist
 
         if self.normalize_lengths and max_magnitude != 0:
             magnitudes =  magnitudes / max_magnitude
@@ -612,12 +769,7 @@ class VectorFieldPlot(ElementPlot):
 
     def _get_min_dist(self, vfield):
         "Get the minimum sampling distance."
-        xys = np.array([complex(x,y) for x,y in zip(vfield.data[:,0],
-                                                    vfield.data[:,1])])
-        m, n = np.meshgrid(xys, xys)
-        distances = abs(m-n)
-        np.fill_diagonal(distances, np.inf)
-        return  distances.min()
+        return min_distance(vfield.data[:, 0], vfield.data[:, 1])
 
 
     def __call__(self, ranges=None):
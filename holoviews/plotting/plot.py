@@ -123,30 +123,45 @@ class Plot(param.Parameterized):
         over the whole animation) and finally compute the dimension
         ranges in each group. The new set of ranges is returned.
         """
-        all_table = all(isinstance(el, Table) for el in obj.traverse(lambda x: x, [Element]))
-        if obj is None or not self.normalize or all_table:
+        if obj is None or not self.normalize:
             return OrderedDict()
+
+        # The normalization options and the ranges spanning the
+        # whole object are computed once and shared by all frames
+        if not hasattr(self, '_range_cache'):
+            self._range_cache = {}
+        cached = self._range_cache.get(id(obj))
+        if cached is None or cached[0] is not obj:
+            all_table = all(isinstance(el, Table) for el in obj.traverse(lambda x: x, [Element]))
+            norm_opts = None if all_table else self._get_norm_opts(obj)
+            cached = self._range_cache[id(obj)] = (obj, norm_opts, {})
+        _, norm_opts, mapwise_ranges = cached
+        if norm_opts is None:
+            return OrderedDict()
+
         # Get inherited ranges
         ranges = {} if ranges is None or self.adjoined else dict(ranges)
 
-        # Get element identifiers from current object and resolve
-        # with selected normalization options
-        norm_opts = self._get_norm_opts(obj)
-
         # Traverse displayed object if normalization applies
         # at this level, and ranges for the group have not
         # been supplied from a composite plot
         elements = []
         return_fn = lambda x: x if isinstance(x, Element) else None
         for group, (axiswise, framewise) in norm_opts.items():
+            mapwise = not framewise and not self.adjoined
             if group in ranges:
                 continue # Skip if ranges are already computed
-            elif not framewise and not self.adjoined: # Traverse to get all elements
+            elif mapwise and group in mapwise_ranges:
+                ranges[group] = OrderedDict(mapwise_ranges[group])
+                continue
+            elif mapwise: # Traverse to get all elements
                 elements = obj.traverse(return_fn, [group])
             elif key is not None: # Traverse to get elements for each frame
                 elements = self._get_frame(key).traverse(return_fn, [group])
             if not axiswise or (not framewise and isinstance(obj, HoloMap)): # Compute new ranges
                 self._compute_group_range(group, elements, ranges)
+                if mapwise and group in ranges:
+                    mapwise_ranges[group] = OrderedDict(ranges[group])
         return ranges
 
 
@@ -287,13 +302,16 @@ class Plot(param.Parameterized):
         if 'title' in self.handles:
             self.handles['title'].set_visible(self.show_title)
 
-        self.drawn = True
+        drawn, self.drawn = self.drawn, True
         if self.subplot:
             return self.handles['axis']
         else:
-            plt.draw()
+            # Updated frames belong to a figure already closed in
+            # pyplot and are rendered without pyplot
             fig = self.handles['fig']
-            plt.close(fig)
+            if not drawn:
+                plt.draw()
+                plt.close(fig)
             return fig
 
 
@@ -764,7 +782,7 @@ class LayoutPlot(CompositePlot):
       Specifies the space between vertically adjacent elements in the grid.
       Default value is set conservatively to avoid overlap of subplots.""")
 
-    def __init__(self, layout, **params):
+    def __init__(self, layout, keys=None, dimensions=None, **params):
         if not isinstance(layout, (NdLayout, Layout)):
             raise ValueError("LayoutPlot only accepts Layout objects.")
         if len(layout.values()) == 0:
@@ -775,7 +793,8 @@ class LayoutPlot(CompositePlot):
         self.rows, self.cols = layout.shape
         self.coords = list(product(range(self.rows),
                                    range(self.cols)))
-        dimensions, keys = traversal.unique_dimkeys(layout)
+        if not keys or not dimensions:
+            dimensions, keys = traversal.unique_dimkeys(layout)
         plotopts = Store.lookup_options(layout, 'plot').options
         super(LayoutPlot, self).__init__(keys=keys, dimensions=dimensions,
                                          uniform=traversal.uniform(layout),
@@ -0,0 +1,204 @@
+"""
+Profiling of the plotting and display pipeline, recording the time
+spent in each stage of rendering for each type of element.
+"""
+
+import cProfile, threading
+from contextlib import contextmanager
+from functools import wraps
+from timeit import default_timer
+
+import param
+from matplotlib.figure import Figure
+
+from ..core import OrderedDict, Dimensioned, HoloMap
+from ..core.options import Store, Compositor
+from .plot import Plot
+
+
+def _element_name(obj):
+    """
+    Returns the name of the element type associated with a HoloViews
+    object, or with the plot or widget displaying it, if any.
+    """
+    if not isinstance(obj, Dimensioned):
+        for attr in ['plot', 'map', 'layout']:
+            candidate = getattr(obj, attr, None)
+            if isinstance(candidate, (Dimensioned, Plot)):
+                return _element_name(candidate)
+        return None
+    if isinstance(obj, HoloMap) and obj.type is not None:
+        return obj.type.__name__
+    return type(obj).__name__
+
+
+def _subclasses(cls):
+    "Returns the supplied class and all its subclasses."
+    classes = [cls]
+    for subclass in cls.__subclasses__():
+        classes += [c for c in _subclasses(subclass) if c not in classes]
+    return classes
+
+
+
+class RenderProfiler(param.Parameterized):
+    """
+    RenderProfiler instruments the stages of the plotting pipeline
+    while active, recording the number of calls along with the total
+    and exclusive (self) time spent in each stage per element type.
+    Nested calls of a stage on the same object, e.g. via super, are
+    only counted once. The profiler is activated as a context manager:
+
+        with RenderProfiler() as profiler:
+            MPLPlotRenderer.save(obj, 'output')
+        print(profiler.table())
+
+    The stages are given by the targets list, mapping the methods of
+    a class and all its subclasses to a stage, and additional stages
+    may be timed explicitly using the stage context manager.
+    Optionally the full call graph may also be recorded with cProfile
+    and dumped to file.
+    """
+
+    cprofile = param.String(default=None, allow_None=True, doc="""
+        Filename the cProfile statistics of the profiled code are
+        dumped to, if any. The statistics may be loaded using the
+        pstats module.""")
+
+    # List of (stage, class, method name) tuples to instrument
+    targets = [('options', Store, 'lookup_options'),
+               ('collapse', Compositor, 'collapse'),
+               ('construction', Plot, '__init__'),
+               ('initialize', Plot, '__call__'),
+               ('update_frame', Plot, 'update_frame'),
+               ('ranges', Plot, 'compute_ranges'),
+               ('draw', Figure, 'draw')]
+
+    _active = None
+
+    def __init__(self, **params):
+        super(RenderProfiler, self).__init__(**params)
+        self.timings = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._patched = []
+        self._profile = None
+
+
+    def __enter__(self):
+        if RenderProfiler._active is not None:
+            raise Exception("Another RenderProfiler is already active.")
+        RenderProfiler._active = self
+        for stage, owner, attr in self.targets:
+            for cls in _subclasses(owner):
+                if attr in cls.__dict__:
+                    self._instrument(stage, cls, attr)
+        if self.cprofile:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        return self
+
+
+    def __exit__(self, *exc_info):
+        if self._profile is not None:
+            self._profile.disable()
+            self._profile.dump_stats(self.cprofile)
+            self._profile = None
+        for cls, attr, method in reversed(self._patched):
+            type.__setattr__(cls, attr, method)
+        self._patched = []
+        RenderProfiler._active = None
+
+
+    def _instrument(self, stage, cls, attr):
+        "Replaces the method on the supplied class with a timed wrapper."
+        method = cls.__dict__[attr]
+        if isinstance(method, (classmethod, staticmethod)):
+            fn = getattr(cls, attr)
+        else:
+            fn = method
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            frame = self._push(stage, args[0] if args else None, args[:2])
+            if frame is None:
+                return fn(*args, **kwargs)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._pop(frame)
+        self._patched.append((cls, attr, method))
+        # Set on the type directly, avoiding the warnings issued by
+        # Parameterized classes when setting non-parameter attributes
+        type.__setattr__(cls, attr, staticmethod(wrapper) if fn is not method else wrapper)
+
+
+    def _push(self, stage, obj, candidates):
+        """
+        Pushes a stage called on the supplied object onto the stack of
+        the current thread, returning None for a nested call of the
+        same stage on the same object. The element type is looked up
+        on the candidate objects, defaulting to that of the enclosing
+        stage.
+        """
+        stack = self._local.__dict__.setdefault('stack', [])
+        if stack and stack[-1][0] == stage and stack[-1][1] is obj:
+            return None
+        names = [_element_name(c) for c in candidates]
+        names = [n for n in names if n is not None]
+        if names:
+            element = names[0]
+        elif stack:
+            element = stack[-1][2]
+        else:
+            element = type(obj).__name__
+        frame = [stage, obj, element, default_timer(), 0.]
+        stack.append(frame)
+        return frame
+
+
+    def _pop(self, frame):
+        "Pops the stage off the stack and records its timings."
+        stage, _, element, start, nested = frame
+        elapsed = default_timer() - start
+        stack = self._local.stack
+        stack.pop()
+        if stack:
+            stack[-1][4] += elapsed
+        with self._lock:
+            timing = self.timings.setdefault((stage, element), [0, 0., 0.])
+            timing[0] += 1
+            timing[1] += elapsed
+            timing[2] += elapsed - nested
+
+
+    @classmethod
+    @contextmanager
+    def stage(cls, stage, obj=None):
+        """
+        Context manager timing the enclosed code as the named stage
+        for the supplied object, if a RenderProfiler is active.
+        """
+        profiler = cls._active
+        frame = None if profiler is None else profiler._push(stage, obj, [obj])
+        try:
+            yield
+        finally:
+            if frame is not None:
+                profiler._pop(frame)
+
+
+    def table(self):
+        """
+        Returns a table of the number of calls, the total time and
+        the exclusive time spent in each stage for each element type,
+        sorted by exclusive time.
+        """
+        header = '%-14s %-18s %8s %10s %10s' % ('Stage', 'Element', 'Calls',
+                                               'Total (s)', 'Self (s)')
+        lines = [header, '-'*len(header)]
+        rows = sorted(self.timings.items(), key=lambda x: -x[1][2])
+        for (stage, element), (calls, total, exclusive) in rows:
+            lines.append('%-14s %-18s %8d %10.3f %10.3f' % (stage, element, calls,
+                                                           total, exclusive))
+        lines += ['-'*len(header), '%-42s %10.3f' % ('Total', sum(t[2] for _, t in rows))]
+        return '\n'.join(lines)
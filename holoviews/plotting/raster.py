@@ -10,7 +10,7 @@ import param
 from ..core.options import Store
 from ..core import CompositeOverlay
 from ..core import traversal
-from ..core.util import match_spec
+from ..core.util import match_spec, hsv_to_rgb
 from ..element.raster import HeatMap, Image, Raster, RGB, HSV
 from .element import ElementPlot, OverlayPlot
 from .plot import Plot, GridPlot
@@ -30,6 +30,7 @@ class RasterPlot(ElementPlot):
 
     def __init__(self, *args, **kwargs):
         super(RasterPlot, self).__init__(*args, **kwargs)
+        self._rgb_buffer = None
         if self.map.type == Raster:
             self.invert_yaxis = True
 
@@ -49,7 +50,9 @@ class RasterPlot(ElementPlot):
         clims = opts.pop('clims', None)
         if view.depth != 1:
             opts.pop('cmap', None)
-        if isinstance(view, RGB):
+        if isinstance(view, HSV):
+            data = self._hsv_to_rgb(view)
+        elif isinstance(view, RGB):
             data = view.rgb.data
         elif isinstance(view, HeatMap):
             data = view.data
@@ -84,6 +87,21 @@ class RasterPlot(ElementPlot):
                                    xticks=xticks, yticks=yticks)
 
 
+    def _hsv_to_rgb(self, view):
+        """
+        Converts the HSV data of the supplied view to RGB, reusing a
+        preallocated buffer across frames of the same shape.
+        Matplotlib keeps a reference to the array passed to imshow
+        and set_data rather than a copy, so the buffer may only be
+        overwritten because the single image artist of this plot is
+        redrawn right after each update. The buffer must not be
+        shared between artists.
+        """
+        if self._rgb_buffer is None or self._rgb_buffer.shape != view.data.shape:
+            self._rgb_buffer = np.empty(view.data.shape)
+        return hsv_to_rgb(view.data, out=self._rgb_buffer)
+
+
     def _compute_ticks(self, view):
         if isinstance(view, HeatMap):
             xdim, ydim = view.key_dimensions
@@ -143,7 +161,13 @@ class RasterPlot(ElementPlot):
 
     def update_handles(self, axis, view, key, ranges=None):
         im = self.handles.get('im', None)
-        im.set_data(view.data)
+        if isinstance(view, HSV):
+            data = self._hsv_to_rgb(view)
+        elif isinstance(view, RGB):
+            data = view.rgb.data
+        else:
+            data = view.data
+        im.set_data(data)
 
         if isinstance(view, HeatMap) and self.show_values:
            self._annotate_values(view)
@@ -0,0 +1,52 @@
+"""
+Tests for the vectorized colorspace conversions used by HSV elements.
+"""
+import colorsys
+import numpy as np
+
+from holoviews.core.util import hsv_to_rgb, rgb_to_hsv
+from holoviews.element import HSV, RGB
+from holoviews.element.comparison import ComparisonTestCase
+
+
+class ColorspaceConversionTest(ComparisonTestCase):
+
+    def setUp(self):
+        np.random.seed(42)
+        self.hsv = np.random.rand(10, 12, 3)
+        self.hsv[0, :, 1] = 0 # Unsaturated samples
+        self.hsva = np.random.rand(10, 12, 4)
+
+    def test_hsv_to_rgb_matches_colorsys(self):
+        expected = np.array([[colorsys.hsv_to_rgb(*px) for px in row]
+                             for row in self.hsv])
+        self.assertEqual(hsv_to_rgb(self.hsv), expected)
+
+    def test_rgb_to_hsv_matches_colorsys(self):
+        rgb = np.random.rand(10, 12, 3)
+        rgb[0, 0] = 0.5 # Grey sample with zero chroma
+        expected = np.array([[colorsys.rgb_to_hsv(*px) for px in row]
+                             for row in rgb])
+        self.assertEqual(rgb_to_hsv(rgb), expected)
+
+    def test_hsv_roundtrip_preserves_alpha(self):
+        rgba = hsv_to_rgb(self.hsva)
+        self.assertEqual(rgba[..., 3], self.hsva[..., 3])
+        self.assertEqual(rgb_to_hsv(rgba)[..., :3], self.hsva[..., :3])
+
+    def test_hsv_to_rgb_preallocated_output(self):
+        out = np.empty(self.hsv.shape)
+        result = hsv_to_rgb(self.hsv, out=out)
+        self.assertTrue(result is out)
+        self.assertEqual(out, hsv_to_rgb(self.hsv))
+
+    def test_hsv_to_rgb_inplace(self):
+        expected = hsv_to_rgb(self.hsva)
+        data = self.hsva.copy()
+        hsv_to_rgb(data, out=data)
+        self.assertEqual(data, expected)
+
+    def test_hsv_element_rgb(self):
+        rgb = HSV(self.hsva).rgb
+        self.assertTrue(type(rgb) is RGB)
+        self.assertEqual(rgb.data, hsv_to_rgb(self.hsva))
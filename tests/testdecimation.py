@@ -0,0 +1,42 @@
+"""
+Test cases for the Curve decimation applied by CurvePlot.
+"""
+from unittest import SkipTest
+import numpy as np
+
+try:
+    from matplotlib import pyplot
+    pyplot.switch_backend('agg')
+    from holoviews.plotting.chart import minmax_decimate, lttb_decimate
+except:
+    raise SkipTest("Matplotlib required to test plot decimation")
+
+from holoviews.element.comparison import ComparisonTestCase
+
+
+class DecimationTest(ComparisonTestCase):
+
+    def setUp(self):
+        np.random.seed(1)
+        xs = np.linspace(0, 100, 10000)
+        self.data = np.column_stack([xs, np.sin(xs) + np.random.randn(10000)])
+
+    def test_minmax_preserves_envelope(self):
+        decimated = minmax_decimate(self.data, (0, 100), 100)
+        self.assertTrue(len(decimated) <= 400)
+        self.assertEqual(decimated[:, 1].min(), self.data[:, 1].min())
+        self.assertEqual(decimated[:, 1].max(), self.data[:, 1].max())
+
+    def test_minmax_preserves_endpoints(self):
+        decimated = minmax_decimate(self.data, (0, 100), 100)
+        self.assertEqual(decimated[[0, -1]], self.data[[0, -1]])
+
+    def test_minmax_crops_to_range(self):
+        decimated = minmax_decimate(self.data, (20, 30), 100)
+        inside = decimated[1:-1, 0]
+        self.assertTrue(np.all((inside >= 20) & (inside <= 30)))
+
+    def test_lttb_sample_count(self):
+        decimated = lttb_decimate(self.data, 200)
+        self.assertEqual(len(decimated), 200)
+        self.assertEqual(decimated[[0, -1]], self.data[[0, -1]])
@@ -0,0 +1,94 @@
+"""
+Test cases for indexed slicing and lookups on Chart elements.
+"""
+import numpy as np
+
+from holoviews import Curve, Points, Scatter
+from holoviews.element.comparison import ComparisonTestCase
+
+
+class GridIndexTest(ComparisonTestCase):
+
+    def setUp(self):
+        np.random.seed(1)
+        self.data = np.random.rand(2000, 2)
+        self.points = Points(self.data)
+        self.indexed = Points(self.data, spatial_index=True)
+
+    def test_box_slice(self):
+        self.assertEqual(self.indexed[0.2:0.4, 0.5:0.9].data,
+                         self.points[0.2:0.4, 0.5:0.9].data)
+
+    def test_open_slice(self):
+        self.assertEqual(self.indexed[0.3:, :].data,
+                         self.points[0.3:, :].data)
+
+    def test_select(self):
+        self.assertEqual(self.indexed.select(x=(0.1, 0.2), y=(0.1, 0.2)).data,
+                         self.points.select(x=(0.1, 0.2), y=(0.1, 0.2)).data)
+
+    def test_exact_lookup(self):
+        x, y = self.data[10]
+        self.assertEqual(self.indexed[x, y], self.data[10:11])
+
+    def test_closest(self):
+        coords = [tuple(c) for c in np.random.rand(50, 2)*1.4-0.2]
+        self.assertEqual(self.indexed.closest(coords),
+                         self.points.closest(coords))
+
+
+class SortedIndexTest(ComparisonTestCase):
+
+    def setUp(self):
+        np.random.seed(1)
+        xs = np.random.rand(1000)
+        self.xs = xs
+        self.scatter = Scatter(np.column_stack([xs, xs*2]))
+        self.indexed = Scatter(np.column_stack([xs, xs*2]), spatial_index=True)
+
+    def test_range_slice(self):
+        self.assertEqual(self.indexed[0.2:0.5].data, self.scatter[0.2:0.5].data)
+
+    def test_closest(self):
+        coords = [0.5, 0.77, -1, 3]
+        self.assertEqual(self.indexed.closest(coords), self.scatter.closest(coords))
+
+    def test_closest_absolute_distance(self):
+        self.assertEqual(self.scatter.closest(0.5), [self.xs[np.argmin(np.abs(self.xs-0.5))]])
+
+    def test_exact_lookup(self):
+        self.assertEqual(self.indexed[self.xs[3]], self.scatter[self.xs[3]])
+
+
+class MonotonicCurveTest(ComparisonTestCase):
+
+    def setUp(self):
+        xs = np.linspace(0, 10, 101)
+        self.data = np.column_stack([xs, np.sin(xs)])
+        self.curve = Curve(self.data)
+        self.unsorted = Curve(self.data, monotonic=False)
+
+    def test_slice_returns_view(self):
+        sliced = self.curve[2:4]
+        self.assertTrue(np.shares_memory(sliced.data, self.curve.data))
+        self.assertEqual(sliced.data, self.unsorted[2:4].data)
+
+    def test_unsorted_slice_copies(self):
+        self.assertFalse(np.shares_memory(self.unsorted[2:4].data, self.unsorted.data))
+
+    def test_input_array_copied(self):
+        expected = self.curve[2:4].data.copy()
+        self.data[:] = self.data[::-1]
+        self.assertEqual(self.curve[2:4].data, expected)
+
+    def test_detects_unsorted_data(self):
+        data = self.data[::-1]
+        mask = (2 <= data[:, 0]) & (data[:, 0] < 4)
+        self.assertEqual(Curve(data)[2:4].data, data[mask])
+
+    def test_closest(self):
+        self.assertEqual(self.curve.closest([2.04, 2.06, -1, 11]),
+                         self.unsorted.closest([2.04, 2.06, -1, 11]))
+
+    def test_exact_lookup(self):
+        self.assertEqual(self.curve[self.data[7, 0]], self.data[7:8])
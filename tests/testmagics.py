@@ -1,5 +1,7 @@
 from unittest import SkipTest
+import numpy as np
 
+from holoviews import HoloMap, Image
 from holoviews.core.options import Store
 try:
     from holoviews import ipython
@@ -111,6 +113,17 @@ class TestOutputMagic(ExtensionTestCase):
         self.line_magic('output', "size=-50")
         self.assertEqual(ipython.OutputMagic.options.get('size', None), 100)
 
+    def test_output_estimate_holomap(self):
+        hmap = HoloMap({i: Image(np.random.rand(2, 2)) for i in range(5)})
+        dimensions, keys, frames, branches = ipython.OutputMagic.estimate(hmap)
+        self.assertEqual((len(keys), frames, branches), (5, 5, 1))
+
+    def test_output_estimate_layout(self):
+        hmap = HoloMap({i: Image(np.random.rand(2, 2)) for i in range(5)})
+        layout = hmap + hmap.relabel(group='Other')
+        dimensions, keys, frames, branches = ipython.OutputMagic.estimate(layout)
+        self.assertEqual((len(keys), frames, branches), (5, 10, 2))
+
 
 class TestCompositorMagic(ExtensionTestCase):
 
@@ -0,0 +1,97 @@
+"""
+Test cases for the incremental export of the NotebookArchive.
+"""
+import os
+import time
+import shutil
+import tempfile
+from unittest import SkipTest
+import numpy as np
+
+try:
+    from holoviews.ipython.archive import NotebookArchive, content_hash
+    from matplotlib import pyplot
+    pyplot.switch_backend('agg')
+except:
+    raise SkipTest("IPython and matplotlib required to test NotebookArchive")
+
+from holoviews import Image
+from holoviews.element.comparison import ComparisonTestCase
+
+
+class NotebookArchiveIncrementalTest(ComparisonTestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.archive = NotebookArchive(root=self.root, incremental=True, workers=2,
+                                       skip_notebook_export=True)
+        self.archive._auto = True
+        self.archive._timestamp = tuple(time.localtime())
+        self.archive.notebook_name = 'notebook'
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def image(self, seed, label='Im'):
+        return Image(np.random.RandomState(seed).rand(3, 3), group='Group', label=label)
+
+    def listing(self):
+        return sorted(os.listdir(os.path.join(self.root, 'notebook')))
+
+    def test_content_hash_ignores_name(self):
+        self.assertEqual(content_hash(self.image(0)), content_hash(self.image(0)))
+
+    def test_content_hash_data_and_label(self):
+        self.assertNotEqual(content_hash(self.image(0)), content_hash(self.image(1)))
+        self.assertNotEqual(content_hash(self.image(0)), content_hash(self.image(0, 'Other')))
+
+    def test_content_hash_array_views(self):
+        data = np.random.RandomState(0).rand(3, 3)
+        self.assertEqual(content_hash(Image(data.T.copy())), content_hash(Image(data.T)))
+
+    def test_content_hash_unhashable(self):
+        image = self.image(0)
+        image.data = lambda: None
+        self.assertEqual(content_hash(image), None)
+
+    def test_incremental_add_exports(self):
+        self.archive.add(self.image(0, 'A'), html='<b>A</b>')
+        self.archive.add(self.image(1, 'B'), html='<b>B</b>')
+        self.archive._queue.join()
+        self.assertEqual(self.listing(), ['Group-A.hvz', 'Group-A.svg',
+                                          'Group-B.hvz', 'Group-B.svg'])
+        self.assertEqual(len(self.archive), 0)
+
+    def test_incremental_add_exports_synchronously(self):
+        self.archive.add(self.image(0), html='image')
+        self.assertEqual(list(self.archive._exported.keys()),
+                         [('Group-Im', 'svg'), ('Group-Im', 'hvz')])
+        self.archive._queue.join()
+
+    def test_incremental_skips_unchanged(self):
+        self.archive.add(self.image(0), html='first')
+        self.archive.add(self.image(0), html='second')
+        self.archive._queue.join()
+        self.assertEqual(self.listing(), ['Group-Im.hvz', 'Group-Im.svg'])
+        self.assertEqual(list(self.archive._replacements.values()), [['first', 'second']])
+
+    def test_incremental_substitutes_every_display(self):
+        substitutions = {}
+        self.archive._get_notebook_node = lambda: None
+        self.archive._generate_html = lambda node, subs: substitutions.update(subs) or ''
+        self.archive._clear_notebook = lambda node: ''
+        self.archive.exporters = self.archive.exporters[:1]
+        self.archive.add(self.image(0), html='first')
+        self.archive.add(self.image(0), html='second')
+        self.archive._export_with_html()
+        self.assertEqual(self.archive.traceback, None)
+        self.assertEqual(sorted(substitutions), ['first', 'second'])
+        self.assertEqual(substitutions['first'], substitutions['second'])
+
+    def test_incremental_export_writes_remaining(self):
+        self.archive.add(self.image(0), html='image')
+        self.archive.add(filename='notes', data=b'notes',
+                         info={'file-ext':'txt', 'mime_type':'text/plain'})
+        self.archive.export()
+        self.assertEqual(self.listing(), ['Group-Im.hvz', 'Group-Im.svg', 'notes.txt'])
+        self.assertEqual(self.archive.traceback, None)
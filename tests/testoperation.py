@@ -0,0 +1,531 @@
+"""
+Tests for the ElementOperations in holoviews.operation.element.
+"""
+import shutil
+import tempfile
+from unittest import SkipTest
+
+import numpy as np
+
+from holoviews.core import Dimension, HoloMap, NdOverlay, Overlay
+from holoviews.core.operation import Operation
+import holoviews.core.operation as core_operation
+from holoviews.core.options import Compositor
+from holoviews.element import Points, Scatter, Image, VectorField
+from holoviews.element.comparison import ComparisonTestCase
+from holoviews.operation import aggregate, contours, convolve, vectorfield, \
+    gradient, fft_power, threshold, chain, transform, histogram, \
+    HistogramAccumulator
+from holoviews.operation.normalization import raster_normalization
+from holoviews.operation.element import marching_squares
+
+
+class AggregateTest(ComparisonTestCase):
+
+    def setUp(self):
+        self.points = Points(np.array([[0, 0, 1], [0.1, 0.1, 3],
+                                       [0.9, 0.9, 2], [1, 1, np.NaN]]),
+                             value_dimensions=['z'])
+        self.bounds = (0, 0, 1, 1)
+
+    def test_aggregate_count(self):
+        img = aggregate(self.points, shape=(2, 2), bounds=self.bounds)
+        self.assertEqual(img.data, np.array([[0, 2], [2, 0]]))
+        self.assertEqual(img.value_dimensions[0].name, 'Count')
+        self.assertEqual(img.bounds.lbrt(), self.bounds)
+
+    def test_aggregate_sum(self):
+        img = aggregate(self.points, shape=(2, 2), bounds=self.bounds,
+                        aggregator='sum')
+        self.assertEqual(img.data, np.array([[0., 2.], [4., 0.]]))
+        self.assertEqual(img.value_dimensions[0].name, 'z')
+
+    def test_aggregate_mean(self):
+        img = aggregate(self.points, shape=(2, 2), bounds=self.bounds,
+                        aggregator='mean')
+        self.assertEqual(img.data, np.array([[np.NaN, 2.], [2., np.NaN]]))
+
+    def test_aggregate_max(self):
+        img = aggregate(self.points, shape=(2, 2), bounds=self.bounds,
+                        aggregator='max')
+        self.assertEqual(img.data, np.array([[np.NaN, 2.], [3., np.NaN]]))
+
+    def test_aggregate_matches_histogram2d(self):
+        np.random.seed(1)
+        data = np.random.randn(1000, 2)
+        img = aggregate(Points(data), bounds=(-2, -2, 2, 2), shape=(8, 10), chunk_size=77)
+        hist, _, _ = np.histogram2d(data[:, 0], data[:, 1], bins=(10, 8),
+                                    range=((-2, 2), (-2, 2)))
+        self.assertEqual(img.data, hist.T[::-1].astype(int))
+
+    def test_aggregate_density(self):
+        img = aggregate(self.points, bounds=(0, 0, 2, 1), xdensity=4, ydensity=3)
+        self.assertEqual(img.data.shape, (3, 8))
+        self.assertEqual(img.data.sum(), 4)
+
+    def test_aggregate_scatter(self):
+        scatter = Scatter(np.random.rand(50, 2))
+        img = aggregate(scatter, shape=(5, 5))
+        self.assertEqual(img.data.sum(), 50)
+        self.assertEqual([d.name for d in img.key_dimensions], ['x', 'y'])
+
+    def test_aggregate_overlay_accumulates(self):
+        overlay = NdOverlay({0: self.points, 1: self.points})
+        img = aggregate(overlay, shape=(2, 2), bounds=self.bounds)
+        self.assertEqual(img.data, np.array([[0, 4], [4, 0]]))
+
+    def test_aggregate_holomap(self):
+        hmap = HoloMap({0: self.points, 1: self.points})
+        processed = aggregate(hmap, shape=(2, 2))
+        self.assertEqual(processed.type, Image)
+        self.assertEqual(processed.last.data, np.array([[0, 2], [2, 0]]))
+
+    def test_aggregate_missing_value_dimension(self):
+        points = Points(np.random.rand(10, 2))
+        with self.assertRaises(ValueError):
+            aggregate(points, aggregator='sum')
+
+    def test_aggregate_display_compositor(self):
+        compositor = Compositor('Points', aggregate, 'Aggregate', 'display',
+                                shape=(2, 2), bounds=self.bounds)
+        img = compositor.apply(Overlay([self.points]), None)
+        self.assertEqual(img.data, np.array([[0, 2], [2, 0]]))
+
+
+class MarchingSquaresTest(ComparisonTestCase):
+
+    def setUp(self):
+        self.peak = np.zeros((5, 5))
+        self.peak[1:4, 1:4] = 1
+        self.peak[2, 2] = 2
+
+    def test_closed_loop(self):
+        [lines] = marching_squares(self.peak, [0.5])
+        self.assertEqual(len(lines), 1)
+        line = lines[0]
+        self.assertEqual(line[0], line[-1])
+        self.assertEqual(len(line), 13)
+        self.assertEqual(np.abs(line - 2).max(), 1.5)
+
+    def test_multiple_levels(self):
+        lines = marching_squares(self.peak, [0.5, 1.5, 3])
+        self.assertEqual([len(l) for l in lines], [1, 1, 0])
+        self.assertEqual(np.abs(lines[1][0] - 2).max(), 0.5)
+
+    def test_open_line(self):
+        ramp = np.tile(np.arange(4.), (3, 1))
+        [[line]] = marching_squares(ramp, [1.25])
+        self.assertEqual(sorted(line[:, 1]), [0, 1, 2])
+        self.assertEqual(line[:, 0], np.full(3, 1.25))
+
+    def test_skips_nan_cells(self):
+        peak = self.peak.copy()
+        peak[0, 2] = np.NaN
+        [lines] = marching_squares(peak, [0.5])
+        self.assertEqual(len(lines), 1)
+        self.assertNotEqual(lines[0][0].tolist(), lines[0][-1].tolist())
+
+    def test_matches_matplotlib(self):
+        try:
+            from matplotlib import pyplot as plt
+        except ImportError:
+            raise SkipTest("Matplotlib required to compare contours")
+        xs, ys = np.meshgrid(np.linspace(-2, 2, 30), np.linspace(-2, 2, 25))
+        data = np.sin(3*xs) * np.cos(2*ys) + 0.3*xs
+        [lines] = marching_squares(data, [0.5])
+        figure = plt.figure()
+        expected = plt.contour(data, levels=[0.5]).collections[0].get_paths()
+        plt.close(figure)
+        self.assertEqual(sorted(len(l) for l in lines),
+                         sorted(len(p.vertices) for p in expected))
+        vertices = np.concatenate(lines)
+        dists = [np.abs(vertices - v).sum(axis=1).min()
+                 for p in expected for v in p.vertices]
+        self.assertEqual(max(dists) < 1e-10, True)
+
+
+
+class ContoursTest(ComparisonTestCase):
+
+    def test_contours_sheet_coordinates(self):
+        data = np.zeros((4, 4))
+        data[1:3, 1:3] = 1
+        img = Image(data, bounds=(0, 0, 4, 4))
+        overlay = contours(img, levels=(0.5,))
+        contour = overlay.values()[1].values()[0]
+        self.assertEqual(contour.level, 0.5)
+        self.assertEqual(contour.xlim, (1, 3))
+        self.assertEqual(contour.ylim, (1, 3))
+
+    def test_contours_holomap(self):
+        hmap = HoloMap({i: Image(np.random.rand(10, 10)) for i in range(3)})
+        processed = contours(hmap, levels=(0.25, 0.75))
+        self.assertEqual(len(processed), 3)
+        self.assertEqual(processed.last.values()[1].keys(), [0.25, 0.75])
+
+
+
+class ConvolveTest(ComparisonTestCase):
+
+    def setUp(self):
+        np.random.seed(7)
+        self.target = np.random.rand(20, 16)
+        convolve._kernel_ffts.clear()
+
+    def reference(self, data, kernel):
+        convolved = np.fft.ifft2(np.fft.fft2(data) * np.fft.fft2(kernel, s=data.shape)).real
+        rows, cols = kernel.shape
+        rolled = np.roll(np.roll(convolved, -(cols//2), axis=-1), -(rows//2), axis=-2)
+        return rolled / kernel.sum()
+
+    def assert_methods_match(self, kernel):
+        overlay = Image(self.target) * Image(kernel)
+        expected = self.reference(self.target, kernel)
+        for method in ['auto', 'direct', 'fft']:
+            convolved = convolve(overlay, method=method).data
+            self.assertEqual(np.abs(convolved - expected).max() < 1e-12, True)
+
+    def test_convolve_small_kernel(self):
+        self.assert_methods_match(np.random.rand(3, 4))
+
+    def test_convolve_separable_kernel(self):
+        self.assert_methods_match(np.outer(np.random.rand(7), np.random.rand(6)))
+
+    def test_convolve_large_kernel(self):
+        self.assert_methods_match(np.random.rand(25, 18))
+
+    def test_kernel_fft_cached(self):
+        kernel = Image(np.random.rand(3, 3))
+        for _ in range(3):
+            convolve(Image(np.random.rand(8, 8)) * kernel, method='fft')
+        convolve(Image(np.random.rand(6, 6)) * kernel, method='fft')
+        self.assertEqual(len(convolve._kernel_ffts), 2)
+
+    def test_convolve_holomap_batched(self):
+        kernels = [Image(np.random.rand(9, 9)), Image(np.random.rand(2, 2))]
+        hmap = HoloMap({i: Image(np.random.rand(12, 12)) * kernels[i % 2]
+                        for i in range(4)})
+        processed = convolve(hmap)
+        self.assertEqual(processed.keys(), hmap.keys())
+        for key, overlay in hmap.items():
+            self.assertEqual(processed[key], convolve(overlay))
+
+
+
+class VectorFieldOperationTest(ComparisonTestCase):
+
+    def setUp(self):
+        np.random.seed(3)
+        self.radians = Image(np.random.rand(20, 20) * 2 * np.pi,
+                             value_dimensions=[Dimension('Angle', cyclic=True)])
+        self.lengths = Image(np.random.rand(20, 20))
+
+    def test_vectorfield_matches_pointwise_sampling(self):
+        field = vectorfield(self.radians * self.lengths, rows=4, cols=6)
+        xs, ys = np.meshgrid(np.linspace(-0.5, 0.5, 8)[1:-1],
+                             np.linspace(-0.5, 0.5, 6)[1:-1])
+        expected = np.array([(x, y, self.radians[x, y], self.lengths[x, y])
+                             for x, y in zip(xs.flat, ys.flat)])
+        self.assertEqual(field.data, expected)
+
+    def test_vectorfield_requires_cyclic(self):
+        with self.assertRaises(Exception):
+            vectorfield(self.lengths * self.radians)
+
+    def test_vectorfield_from_columns(self):
+        field = VectorField(([0, 1], (2, 3), np.array([[0.1], [0.2]]), np.ones(2)))
+        self.assertEqual(field.data, np.array([[0, 2, 0.1, 1], [1, 3, 0.2, 1]]))
+
+
+
+class ExecutorTest(ComparisonTestCase):
+
+    def setUp(self):
+        np.random.seed(11)
+        self.hmap = HoloMap({i: Image(np.random.rand(16, 16)) for i in range(9)},
+                            key_dimensions=['Frame'])
+
+    def assert_matches_serial(self, operation, **params):
+        expected = HoloMap([(k, operation(el, **params)) for k, el in self.hmap.items()],
+                           key_dimensions=['Frame'])
+        for executor in ['serial', 'thread', 'process']:
+            processed = operation(self.hmap, executor=executor, workers=2, **params)
+            self.assertEqual(processed.keys(), expected.keys())
+            for key in expected.keys():
+                self.assertEqual(np.abs(processed[key].data - expected[key].data).max() < 1e-12, True)
+
+    def test_threshold_executors(self):
+        self.assert_matches_serial(threshold, level=0.8, high=2)
+
+    def test_gradient_batched(self):
+        self.assert_matches_serial(gradient)
+
+    def test_fft_power_batched(self):
+        self.assert_matches_serial(fft_power, max_power=2)
+
+    def test_instance_parameters_passed_to_workers(self):
+        operation = threshold.instance(level=0.9)
+        processed = operation(self.hmap, executor='process', workers=2, batch_size=2)
+        self.assertEqual(processed.last.data, threshold(self.hmap.last, level=0.9).data)
+
+    def test_mixed_shapes_batched(self):
+        hmap = HoloMap({0: Image(np.random.rand(4, 4)), 1: Image(np.random.rand(6, 6))})
+        processed = gradient(hmap)
+        self.assertEqual([processed[k].data.shape for k in [0, 1]], [(3, 3), (5, 5)])
+
+    def test_default_batches_bounded_by_bytes(self):
+        sizes = []
+        class batch_sizes(threshold):
+            def _process_batch(self, elements, keys):
+                sizes.append(len(elements))
+                return super(batch_sizes, self)._process_batch(elements, keys)
+        batch_sizes(self.hmap, batch_bytes=16*16*8*4)
+        self.assertEqual(sizes, [4, 4, 1])
+
+    def test_thread_pool_reused(self):
+        threshold(self.hmap, executor='thread', workers=2)
+        pools = dict(core_operation._thread_pools)
+        threshold(self.hmap, executor='thread', workers=2)
+        self.assertIs(core_operation._thread_pools[2], pools[2])
+
+
+
+class OperationCacheTest(ComparisonTestCase):
+
+    def setUp(self):
+        np.random.seed(2)
+        self.image = Image(np.random.rand(10, 10))
+        self.cache = Operation.cache
+        self.cache.clear()
+
+    def tearDown(self):
+        self.cache.clear(disk=True)
+        self.cache.cache_dir = None
+        self.cache.max_bytes = Operation.cache.params('max_bytes').default
+
+    def test_memoize_disabled_by_default(self):
+        threshold(self.image)
+        self.assertEqual(len(self.cache._entries), 0)
+
+    def test_memoized_result_reused(self):
+        first = threshold(self.image, memoize=True)
+        second = threshold(self.image.clone(), memoize=True)
+        self.assertTrue(first is second)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_parameters_in_key(self):
+        first = threshold(self.image, memoize=True, level=0.2)
+        second = threshold(self.image, memoize=True, level=0.8)
+        self.assertFalse(first is second)
+        self.assertNotEqual(first.data.sum(), second.data.sum())
+
+    def test_batching_not_in_key(self):
+        first = threshold(self.image, memoize=True)
+        second = threshold(self.image, memoize=True, batch_size=2, batch_bytes=1024)
+        self.assertTrue(first is second)
+
+    def test_content_in_key(self):
+        first = threshold(self.image, memoize=True)
+        second = threshold(Image(self.image.data + 1), memoize=True)
+        self.assertFalse(first is second)
+
+    def test_holomap_only_processes_missing(self):
+        hmap = HoloMap({i: Image(np.random.rand(5, 5)) for i in range(3)})
+        first = gradient(hmap, memoize=True)
+        hmap[3] = Image(np.random.rand(5, 5))
+        second = gradient(hmap, memoize=True)
+        self.assertEqual(self.cache.misses, 4)
+        self.assertTrue(all(first[k] is second[k] for k in range(3)))
+
+    def test_byte_budget_evicts_least_recent(self):
+        self.cache.max_bytes = 2 * self.image.data.nbytes
+        for level in [0.1, 0.2, 0.3]:
+            threshold(self.image, memoize=True, level=level)
+        self.assertEqual(len(self.cache._entries), 2)
+        self.assertTrue(self.cache.nbytes <= self.cache.max_bytes)
+        threshold(self.image, memoize=True, level=0.1)
+        self.assertEqual(self.cache.hits, 0)
+
+    def test_disk_tier(self):
+        self.cache.cache_dir = tempfile.mkdtemp()
+        try:
+            first = threshold(self.image, memoize=True)
+            self.cache.clear()
+            second = threshold(self.image, memoize=True)
+            self.assertEqual(self.cache.hits, 1)
+            self.assertEqual(first, second)
+        finally:
+            shutil.rmtree(self.cache.cache_dir)
+
+    def test_compositor_memoized(self):
+        compositor = Compositor('Points', aggregate, 'Aggregate', 'display',
+                                shape=(2, 2), memoize=True)
+        points = Points(np.random.rand(10, 2))
+        first = compositor.apply(Overlay([points]), {}, key=(0,))
+        second = compositor.apply(Overlay([points]), {}, key=(0,))
+        self.assertTrue(first is second)
+
+
+
+class ChainTest(ComparisonTestCase):
+
+    def setUp(self):
+        np.random.seed(4)
+        self.image = Image(np.random.rand(20, 20) * 2,
+                           value_dimensions=[Dimension('z', range=(0, 2))])
+        self.operations = [raster_normalization, threshold.instance(level=0.3, high=0.25),
+                           gradient, transform.instance(operator=lambda x: x * 3),
+                           raster_normalization.instance(data_range=True)]
+
+    def test_pipeline_matches_sequential(self):
+        expected = chain(self.image, operations=self.operations)
+        for in_place in [False, True]:
+            fused = chain(self.image, operations=self.operations,
+                          pipeline=True, in_place=in_place)
+            self.assertEqual(fused, expected)
+
+    def test_in_place_preserves_input(self):
+        data = self.image.data.copy()
+        chain(self.image, operations=self.operations, pipeline=True, in_place=True)
+        self.assertEqual(self.image.data, data)
+
+    def test_pipeline_skips_intermediate_elements(self):
+        wrapped = []
+        class counting_threshold(threshold):
+            def _wrap_array(self, data, element):
+                wrapped.append(data)
+                return super(counting_threshold, self)._wrap_array(data, element)
+        operations = [counting_threshold, raster_normalization, counting_threshold]
+        chain(self.image, operations=operations, pipeline=True)
+        self.assertEqual(len(wrapped), 1)
+        chain(self.image, operations=operations)
+        self.assertEqual(len(wrapped), 3)
+
+    def test_pipeline_overlay_matches_sequential(self):
+        overlay = self.image * Image(np.random.rand(20, 20) * 4)
+        operations = [raster_normalization.instance(data_range=True)]
+        expected = chain(overlay, operations=operations)
+        fused = chain(overlay, operations=operations, pipeline=True)
+        self.assertEqual([el.data.max() for el in fused],
+                         [el.data.max() for el in expected])
+
+    def test_pipeline_validates_input(self):
+        points = Points(np.random.rand(10, 2))
+        with self.assertRaises(TypeError):
+            chain(points, operations=[threshold], pipeline=True)
+
+    def test_pipeline_preserves_operation_parameters(self):
+        operation = threshold.instance(level=0.3)
+        operation.p = None
+        chain(self.image, operations=[operation], pipeline=True, input_ranges={'z': (0, 1)})
+        self.assertEqual(operation.p, None)
+
+
+class SharedHistogramTest(ComparisonTestCase):
+
+    def setUp(self):
+        np.random.seed(3)
+        self.hmap = HoloMap({i: Image(np.random.randn(10, 10) * (i+1))
+                             for i in range(4)})
+
+    def test_shared_bins_match_numpy(self):
+        hists = histogram(self.hmap, adjoin=False, individually=False,
+                          bin_range=None, num_bins=10, normed=False)
+        data = np.concatenate([im.data.flatten() for im in self.hmap.values()])
+        for k, im in self.hmap.items():
+            hist, edges = np.histogram(im.data, bins=10, range=(data.min(), data.max()))
+            self.assertEqual(hists[k].values, hist.astype(float))
+            self.assertEqual(hists[k].edges, edges)
+
+    def test_shared_bins_normed(self):
+        hists = histogram(self.hmap, adjoin=False, individually=False,
+                          bin_range=None, num_bins=10)
+        for hist in hists.values():
+            self.assertAlmostEqual(np.sum(hist.values * np.diff(hist.edges)), 1.0)
+
+    def test_shared_bins_single_buffer(self):
+        hists = histogram(self.hmap, adjoin=False, individually=False,
+                          bin_range=None, num_bins=10)
+        bases = set(id(h.values.base) for h in hists.values())
+        self.assertEqual(len(bases), 1)
+
+    def test_holomap_hist_shared(self):
+        layout = self.hmap.hist(individually=False, num_bins=5)
+        hists = layout["right"]
+        edges = [tuple(h.edges) for h in hists.values()]
+        self.assertEqual(len(set(edges)), 1)
+
+    def test_shared_bins_half_declared_range(self):
+        hmap = HoloMap({i: Image(np.random.rand(4, 4) + i,
+                                 value_dimensions=[Dimension('z', range=(0, None))])
+                        for i in range(3)})
+        hists = histogram(hmap, adjoin=False, individually=False,
+                          bin_range=None, num_bins=5)
+        upper = max(im.data.max() for im in hmap.values())
+        for hist in hists.values():
+            self.assertEqual(hist.edges[[0, -1]], np.array([0, upper]))
+        hmap.hist(individually=False)
+
+
+class HistogramAccumulatorTest(ComparisonTestCase):
+
+    def setUp(self):
+        np.random.seed(7)
+        self.samples = np.random.randn(1000)
+
+    def test_update_fixed_range(self):
+        acc = HistogramAccumulator(num_bins=10, bin_range=(-4, 4), adaptive=False)
+        for batch in np.split(self.samples, 10):
+            acc.update(batch)
+        hist, edges = np.histogram(self.samples, bins=10, range=(-4, 4))
+        self.assertEqual(acc.counts, hist.astype(float))
+        self.assertEqual(acc.edges, edges)
+
+    def test_update_infinite_samples(self):
+        acc = HistogramAccumulator(num_bins=4)
+        acc.update([0, 1, np.inf])
+        acc.update([-np.inf, 0.5])
+        self.assertEqual(acc.edges, np.linspace(0, 1, 5))
+        self.assertEqual(acc.counts.sum(), 3)
+        self.assertEqual(acc.outliers, 2)
+
+    def test_update_outliers(self):
+        acc = HistogramAccumulator(num_bins=4, bin_range=(0, 1), adaptive=False)
+        acc.update([0.5, 1, 2, -1, np.NaN])
+        self.assertEqual(acc.count, 2)
+        self.assertEqual(acc.outliers, 2)
+
+    def test_adaptive_range(self):
+        acc = HistogramAccumulator(num_bins=5, bin_range=(0, 1))
+        acc.update([0.1, 0.5, 1.0])
+        acc.update([1.7])
+        acc.update([-3.2])
+        self.assertEqual(acc.edges, np.linspace(-6, 2, 6))
+        self.assertEqual(acc.counts, np.array([0, 1, 0, 1, 3.]))
+
+    def test_merge_aligned(self):
+        first = HistogramAccumulator(bin_range=(-4, 4)).update(self.samples[:500])
+        second = HistogramAccumulator(bin_range=(-4, 4)).update(self.samples[500:])
+        combined = HistogramAccumulator(bin_range=(-4, 4)).update(self.samples)
+        self.assertEqual(first.merge(second).counts, combined.counts)
+
+    def test_merge_unaligned(self):
+        first = HistogramAccumulator().update(self.samples[:500])
+        second = HistogramAccumulator().update(self.samples[500:] + 10)
+        first.merge(second)
+        self.assertEqual(first.count, 1000)
+        self.assertEqual(first.counts.sum(), 1000)
+
+    def test_snapshot_normed(self):
+        hist = HistogramAccumulator().update(self.samples).snapshot()
+        self.assertAlmostEqual(np.sum(hist.values * np.diff(hist.edges)), 1.0)
+
+    def test_collector_integration(self):
+        from holoviews.interface.collector import Collector
+        batches = iter(np.split(self.samples, 10))
+        acc = HistogramAccumulator(normed=False, source=lambda: next(batches))
+        collector = Collector()
+        collector.Distribution.Samples = collector.collect(acc)
+        data = collector(times=[1, 2, 3])
+        totals = [h.values.sum() for h in data.Distribution.Samples.values()]
+        self.assertEqual(totals, [100, 200, 300])
@@ -0,0 +1,56 @@
+"""
+Test cases for the packed storage and slicing of Path elements.
+"""
+import numpy as np
+
+from holoviews import Path, Contours
+from holoviews.element.comparison import ComparisonTestCase
+
+
+class PathStorageTest(ComparisonTestCase):
+
+    def setUp(self):
+        self.path = Path([np.array([[0, 0], [1, 1], [2, 2], [3, 3]]),
+                          [(0, 1), (5, 1), (1, 1)]])
+
+    def test_packed_offsets(self):
+        self.assertEqual(self.path.offsets, np.array([0, 4, 7]))
+        self.assertEqual(len(self.path), 2)
+
+    def test_data_views(self):
+        self.assertEqual(self.path.data[1], np.array([[0, 1], [5, 1], [1, 1]]))
+
+    def test_packed_constructor(self):
+        path = Path((self.path.vertices, self.path.offsets))
+        self.assertEqual(path, self.path)
+
+    def test_tuple_of_paths_rejected(self):
+        with self.assertRaises(ValueError):
+            Path((np.random.rand(4, 2), np.random.rand(4, 2)))
+
+    def test_invalid_offsets_rejected(self):
+        with self.assertRaises(ValueError):
+            Path((self.path.vertices, np.array([0, 5, 4, 7])))
+        with self.assertRaises(ValueError):
+            Path((self.path.vertices, np.array([0, 4])))
+
+    def test_empty_contours(self):
+        contours = Contours(None)
+        self.assertEqual(len(contours), 0)
+        self.assertEqual(contours.data, [])
+
+    def test_limits(self):
+        self.assertEqual(self.path.xlim, (0, 5))
+        self.assertEqual(self.path.ylim, (0, 3))
+
+    def test_dimension_values(self):
+        self.assertEqual(self.path.dimension_values('y'),
+                         np.array([0, 1, 2, 3, 1, 1, 1]))
+
+    def test_slice_splits_paths(self):
+        sliced = self.path[0.5:4, 0:1.5]
+        self.assertEqual(sliced, Path([np.array([[1., 1.]]), np.array([[1., 1.]])]))
+
+    def test_slice_x_only(self):
+        sliced = self.path[0.5:2.5]
+        self.assertEqual(sliced.offsets, np.array([0, 2, 3]))
@@ -0,0 +1,63 @@
+"""
+Test cases for the RenderProfiler timing the stages of plotting.
+"""
+import os
+import tempfile
+from unittest import SkipTest
+import numpy as np
+
+try:
+    from matplotlib import pyplot
+    pyplot.switch_backend('agg')
+    from holoviews.plotting import RenderProfiler, MPLPlotRenderer, RasterPlot, Plot
+except:
+    raise SkipTest("Matplotlib required to test RenderProfiler")
+
+from holoviews import HoloMap, Image
+from holoviews.core.options import Store
+from holoviews.element.comparison import ComparisonTestCase
+
+
+class RenderProfilerTest(ComparisonTestCase):
+
+    def setUp(self):
+        self.hmap = HoloMap({i: Image(np.random.rand(5, 5)) for i in range(3)},
+                            key_dimensions=['x'])
+
+    def test_profiler_stages(self):
+        with RenderProfiler() as profiler:
+            plot = RasterPlot(self.hmap)
+            for i in range(3):
+                MPLPlotRenderer.instance().figure_data(plot[i])
+        stages = {stage for stage, _ in profiler.timings}
+        self.assertEqual(stages >= {'construction', 'initialize', 'update_frame',
+                                    'options', 'render', 'draw'}, True)
+        self.assertEqual(profiler.timings[('construction', 'Image')][0], 1)
+        self.assertEqual(profiler.timings[('render', 'MPLPlotRenderer')][0], 3)
+
+    def test_profiler_self_time(self):
+        with RenderProfiler() as profiler:
+            RasterPlot(self.hmap)()
+        for calls, total, exclusive in profiler.timings.values():
+            self.assertEqual(exclusive <= total, True)
+
+    def test_profiler_explicit_stage(self):
+        with RenderProfiler() as profiler:
+            with RenderProfiler.stage('display', self.hmap):
+                pass
+        self.assertEqual(profiler.timings[('display', 'Image')][0], 1)
+
+    def test_profiler_restores_methods(self):
+        methods = (Plot.__dict__['__init__'], Store.__dict__['lookup_options'])
+        with RenderProfiler():
+            self.assertNotEqual(Plot.__dict__['__init__'], methods[0])
+        self.assertEqual((Plot.__dict__['__init__'], Store.__dict__['lookup_options']), methods)
+        self.assertEqual(RenderProfiler._active, None)
+
+    def test_profiler_cprofile_dump(self):
+        filename = os.path.join(tempfile.mkdtemp(), 'render.prof')
+        with RenderProfiler(cprofile=filename):
+            RasterPlot(self.hmap)()
+        self.assertEqual(os.path.isfile(filename), True)
+        os.remove(filename)
+        os.rmdir(os.path.dirname(filename))
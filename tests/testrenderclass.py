@@ -76,3 +76,49 @@ class MPLPlotRendererTest(ComparisonTestCase):
         data = self.renderer.instance(size=200)(self.image2, fmt='png')[0]
         self.assertEqual(digest_data(data),
                          '1fa233a601bc7942031e434c20253a8551639bd8cf574440ea9b4485a185c2a1')
+
+
+class MPLPlotRendererReuseTest(ComparisonTestCase):
+
+    def setUp(self):
+        if pyplot is None:
+            raise SkipTest("Matplotlib required to test renderer")
+        self.image = Image(np.array([[0,1],[2,3]]), label='Image1')
+        self.renderer = Store.renderer.instance(fig='png', dpi=72)
+
+    def test_reuse_matching_render(self):
+        with Store.renderer.reusing(self.image, b'data', 'png', 100, 72):
+            self.assertEqual(self.renderer(self.image)[0], b'data')
+        self.assertNotEqual(self.renderer(self.image)[0], b'data')
+
+    def test_reuse_mismatched_format(self):
+        with Store.renderer.reusing(self.image, b'data', 'svg', 100, 72):
+            self.assertNotEqual(self.renderer(self.image)[0], b'data')
+
+    def test_reuse_mismatched_size(self):
+        with Store.renderer.reusing(self.image, b'data', 'png', 200, 72):
+            self.assertNotEqual(self.renderer(self.image)[0], b'data')
+
+    def test_reuse_other_object(self):
+        with Store.renderer.reusing(self.image.clone(), b'data', 'png', 100, 72):
+            self.assertNotEqual(self.renderer(self.image)[0], b'data')
+
+    def test_frames_counted_only_when_reusing(self):
+        import holoviews.plotting as plotting
+        unique_dimkeys = plotting.unique_dimkeys
+        def fail(obj):
+            raise AssertionError('Frames counted without a render to reuse')
+        plotting.unique_dimkeys = fail
+        try:
+            self.assertEqual(self.renderer.instance(fig=None)(self.image), None)
+        finally:
+            plotting.unique_dimkeys = unique_dimkeys
+
+    def test_multiple_frames_without_format(self):
+        hmap = HoloMap({1: self.image, 2: self.image})
+        self.assertEqual(self.renderer.instance(holomap=None)(hmap), None)
+
+    def test_reused_context(self):
+        self.assertEqual(Store.renderer.reused(), None)
+        with Store.renderer.reusing(self.image, b'data', 'png', 100, 72):
+            self.assertEqual(Store.renderer.reused(), (self.image, b'data', 'png', 100, 72))
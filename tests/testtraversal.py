@@ -0,0 +1,28 @@
+"""
+Test cases for the traversal utilities over nested Dimensioned objects.
+"""
+from itertools import product
+
+from holoviews.core.traversal import decimate_keys
+from holoviews.element.comparison import ComparisonTestCase
+
+
+class DecimateKeysTest(ComparisonTestCase):
+
+    def test_decimate_keys_one_dimension(self):
+        keys = [(i,) for i in range(1000)]
+        self.assertEqual(decimate_keys(keys, 10), [list(range(0, 1000, 100))])
+
+    def test_decimate_keys_within_limit(self):
+        keys = list(product(range(5), 'ab'))
+        self.assertEqual(decimate_keys(keys, 10), [list(range(5)), ['a', 'b']])
+
+    def test_decimate_keys_balanced(self):
+        keys = list(product(range(300), range(20), 'abc'))
+        values = decimate_keys(keys, 500)
+        self.assertEqual([len(vals) for vals in values], [16, 10, 3])
+        self.assertEqual((values[0][:3], values[1][:3]), ([0, 19, 38], [0, 2, 4]))
+
+    def test_decimate_keys_single_frame(self):
+        keys = list(product(range(100), range(100)))
+        self.assertEqual(decimate_keys(keys, 1), [[0], [0]])
@@ -0,0 +1,62 @@
+"""
+Test cases for the sample spacing computed by VectorFieldPlot.
+"""
+from unittest import SkipTest
+import numpy as np
+
+try:
+    from matplotlib import pyplot
+    pyplot.switch_backend('agg')
+    from holoviews.plotting.chart import min_distance, VectorFieldPlot
+except:
+    raise SkipTest("Matplotlib required to test VectorFieldPlot")
+
+from holoviews.core import HoloMap
+from holoviews.element import VectorField
+from holoviews.element.comparison import ComparisonTestCase
+
+
+def brute_force(xs, ys):
+    points = xs + 1j*ys
+    distances = np.abs(points[:, None] - points[None])
+    np.fill_diagonal(distances, np.inf)
+    return distances.min()
+
+
+class MinDistanceTest(ComparisonTestCase):
+
+    def setUp(self):
+        np.random.seed(5)
+
+    def test_random_points(self):
+        xs, ys = np.random.rand(2, 300)
+        self.assertEqual(min_distance(xs, ys), brute_force(xs, ys))
+
+    def test_collinear_points(self):
+        xs, ys = np.full(100, 2.), np.random.rand(100)
+        self.assertEqual(min_distance(xs, ys), brute_force(xs, ys))
+
+    def test_regular_grid(self):
+        xs, ys = np.meshgrid(np.linspace(0, 1, 11), np.linspace(0, 3, 7))
+        self.assertEqual(min_distance(xs.flatten(), ys.flatten()), 0.1)
+        self.assertEqual(min_distance(xs.T.flatten(), ys.T.flatten()), 0.1)
+
+    def test_duplicate_points(self):
+        self.assertEqual(min_distance([0, 1, 0], [0, 1, 0]), 0)
+
+    def test_single_point(self):
+        self.assertEqual(min_distance([0], [0]), np.inf)
+
+
+class VectorFieldPlotTest(ComparisonTestCase):
+
+    def test_min_dist_across_frames(self):
+        xs, ys = np.meshgrid(np.linspace(-1, 1, 5), np.linspace(-1, 1, 5))
+        grid = (xs.flatten(), ys.flatten())
+        hmap = HoloMap({i: VectorField(grid + (np.random.rand(25), np.ones(25)))
+                        for i in range(3)})
+        hmap[3] = VectorField(([0, 0.1], [0, 0], [0, 0], [1, 1]))
+        plot = VectorFieldPlot(hmap)
+        self.assertEqual(plot._min_dist, 0.1)
+        plot()
+        plot.update_frame(0)
@@ -2,13 +2,20 @@
 Test cases for the HTML/JavaScript scrubber and widgets.
 """
 import re
+import time
+import threading
+import shutil
+import tempfile
 from hashlib import sha256
 from unittest import SkipTest
 import numpy as np
 
 try:
     from holoviews.ipython import IPTestCase
-    from holoviews.ipython.widgets import ScrubberWidget, SelectionWidget
+    from holoviews.ipython import widgets
+    from holoviews.ipython.widgets import NdWidget, ScrubberWidget, SelectionWidget, FrameCache
+    from holoviews.ipython.server import FrameServer
+    from holoviews.plotting import render_lock
     # Standardize backend due to random inconsistencies
     from matplotlib import pyplot
     pyplot.switch_backend('agg')
@@ -16,6 +23,7 @@ except:
     raise SkipTest("Matplotlib required to test widgets")
 
 from holoviews import Image, HoloMap
+from holoviews.element.comparison import ComparisonTestCase
 from holoviews.plotting import RasterPlot
 
 def digest_data(data):
@@ -29,6 +37,7 @@ prefixes =  ['anim', '_anim_slider', '_anim_img',
 filters  = [re.compile('{p}[a-f0-9]+'.format(p=p)) for p in prefixes]
 filters += [re.compile('new Animation\([a-z0-9_, "]+\)')]
 filters += [re.compile('new NDSlider\([a-z0-9_, "]+')]
+filters += [re.compile('"[a-f0-9]{32}"')]
 
 def normalize(data):
     for f in filters:
@@ -36,6 +45,17 @@ def normalize(data):
     # Hack around inconsistencies in jinja between Python 2 and 3
     return data.replace('0.0', '0').replace('1.0', '1')
 
+
+class MockComm(object):
+    "Records the messages sent over a comm."
+
+    def __init__(self):
+        self.messages = []
+
+    def send(self, data=None, metadata=None, buffers=None):
+        self.messages.append((data, buffers))
+
+
 class TestWidgets(IPTestCase):
 
     def setUp(self):
@@ -51,16 +71,190 @@ class TestWidgets(IPTestCase):
 
     def test_scrubber_widget_1(self):
         html = normalize(ScrubberWidget(self.plot1)())
-        self.assertEqual(digest_data(html), '300e45d633af83f1354d8208e37d7a1c4ca995d00c87c06e7f0250cd53411d1e')
+        self.assertEqual(digest_data(html), '75514e32439565b6904608450cca48cbf7a4d8aee2a3cab135e6fd1e269a5a6f')
 
     def test_selection_widget_1(self):
         html = normalize(SelectionWidget(self.plot1)())
-        self.assertEqual(digest_data(html), 'fd292efa2e934a1b8a8b9449399b76509aa40dfabcf9e630c8222ca362e20c8d')
+        self.assertEqual(digest_data(html), '10269661e17c5fd17388f18b422bb8432a5538ae707be4e68cc0621aaa10f83a')
 
     def test_scrubber_widget_2(self):
         html = normalize(ScrubberWidget(self.plot2)())
-        self.assertEqual(digest_data(html), '6fc2a1f43409e82da7d776aa30575ff9ed52e3a1925340df3a509bc8558788f6')
+        self.assertEqual(digest_data(html), 'f6f9cd1588988e8f88be5b2388a1c391600fc9702032252e385cf5bcd39a041c')
 
     def test_selection_widget_2(self):
         html = normalize(SelectionWidget(self.plot2)())
-        self.assertEqual(digest_data(html), '7353eaabf3481411a332b9d9c4aa591aab93f6edf72ac5b6bfbe45458e824714')
+        self.assertEqual(digest_data(html), '629e7c2402ada3b8b6d0605182502b5bfd51d03abec88f18cb3d39bbf3f55901')
+
+    def test_pending_widgets_evicted(self):
+        widget = ScrubberWidget(self.plot2)
+        NdWidget.pending[widget.id] = (time.time() - NdWidget.pending_timeout - 1, widget)
+        NdWidget._evict_pending()
+        self.assertNotIn(widget.id, NdWidget.pending)
+
+    def test_scrubber_widget_workers(self):
+        serial = ScrubberWidget(self.plot2).frames
+        parallel = ScrubberWidget(RasterPlot(self.plot2.map), workers=2).frames
+        self.assertEqual(list(serial.keys()), list(parallel.keys()))
+        self.assertEqual(list(serial.values()), list(parallel.values()))
+
+    def test_scrubber_widget_workers_serial_in_kernel(self):
+        in_kernel, multiprocessing = widgets._in_kernel, widgets.multiprocessing
+        widgets._in_kernel, widgets.multiprocessing = lambda: True, None
+        try:
+            widget = ScrubberWidget(RasterPlot(self.plot2.map), workers=2)
+            frames = list(widget.render_frames())
+        finally:
+            widgets._in_kernel, widgets.multiprocessing = in_kernel, multiprocessing
+        self.assertEqual([idx for idx, _ in frames], list(range(len(self.plot2))))
+
+    def test_selection_widget_neighbours(self):
+        holomap = HoloMap({(i, j): Image(np.random.rand(2, 2)) for i in range(3) for j in range(3)},
+                          key_dimensions=['x', 'y'])
+        widget = SelectionWidget(RasterPlot(holomap), embed=False, prefetch=1)
+        keys = list(holomap.data.keys())
+        neighbours = [keys[i] for i in widget.neighbours(keys.index((1, 1)))]
+        self.assertEqual(neighbours, [(2, 1), (0, 1), (1, 2), (1, 0)])
+
+    def test_selection_widget_binary_frames(self):
+        widget = SelectionWidget(self.plot2, embed=False, prefetch=0)
+        widget._binary, widget.format = True, 'png'
+        comm = MockComm()
+        widget.send_frame(comm, 1)
+        data, buffers = comm.messages[0]
+        self.assertEqual((data['frame'], data['mime_type']), (1, 'image/png'))
+        self.assertEqual(buffers[0][:4], b'\x89PNG')
+        self.assertIn("src='data:image/png;base64,", widget.update(1))
+
+    def test_selection_widget_html_frames(self):
+        widget = SelectionWidget(self.plot2, embed=False, prefetch=0)
+        widget._binary = False
+        comm = MockComm()
+        widget.send_frame(comm, 1)
+        data, buffers = comm.messages[0]
+        self.assertEqual(data, {'frame': 1, 'html': widget.update(1)})
+        self.assertEqual(buffers, None)
+
+    def test_selection_widget_prefetch_exits(self):
+        widget = SelectionWidget(self.plot2, embed=False, prefetch=1)
+        widget.update(0)
+        thread = widget._prefetch_thread
+        if thread is not None: thread.join()
+        self.assertEqual(widget._prefetch_thread, None)
+        self.assertIn(1, widget.frames)
+
+    def test_selection_widget_frames_without_pyplot(self):
+        widget = SelectionWidget(self.plot2, embed=False, prefetch=0)
+        widget.update(0)
+        pyplot.close('all')
+        widget.update(1)
+        self.assertEqual(pyplot.get_fignums(), [])
+
+    def test_selection_widget_close(self):
+        widget = SelectionWidget(self.plot2, embed=False, prefetch=0)
+        widget.update(0)
+        widget.close()
+        self.assertNotIn(widget.id, SelectionWidget.widgets)
+        self.assertNotIn(0, widget.frames)
+
+    def test_scrubber_widget_dedupe(self):
+        widget = ScrubberWidget(self.plot1, compression='dedupe')
+        frames = widget.compress_frames({0: 'a', 1: 'b', 2: 'a', 3: 'b'})
+        self.assertEqual(frames, {0: 'a', 1: 'b', 2: 0, 3: 1})
+
+    def test_scrubber_widget_delta(self):
+        data = np.random.rand(20, 20)
+        images = []
+        for i in range(3):
+            data = data.copy()
+            data[:2, :2] = i
+            images.append((i, Image(data)))
+        plot = RasterPlot(HoloMap(images, key_dimensions=['test']))
+        widget = ScrubberWidget(plot, compression='delta')
+        frames = widget.compress_frames({k: str(v) for k, v in widget.frames.items()})
+        self.assertEqual(frames[1]['delta'], 0)
+        self.assertEqual(frames[2]['delta'], 1)
+
+
+class TestFrameExport(IPTestCase):
+
+    def setUp(self):
+        super(TestFrameExport, self).setUp()
+        self.json_path = tempfile.mkdtemp()
+        holomap = HoloMap([(i, Image(np.random.rand(2, 2))) for i in range(5)],
+                          key_dimensions=['test'])
+        self.plot = RasterPlot(holomap)
+        self.server = FrameServer(json_path=self.json_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.json_path)
+        super(TestFrameExport, self).tearDown()
+
+    def test_export_frame_files(self):
+        widget = ScrubberWidget(self.plot, export_json=True, json_path=self.json_path)
+        widget()
+        fig_id = 'fig_%s' % widget.id
+        self.assertEqual(self.server.manifest(fig_id)['frames'], 5)
+        self.assertEqual(self.server.frame(fig_id, 3), str(widget.frames[3]))
+
+    def test_export_chunks(self):
+        widget = ScrubberWidget(self.plot, export_json=True, json_path=self.json_path,
+                                chunk_size=2)
+        widget()
+        self.assertEqual(self.server.frame('fig_%s' % widget.id, 3), str(widget.frames[3]))
+
+    def test_export_on_demand(self):
+        widget = ScrubberWidget(self.plot, export_json=True, json_path=self.json_path,
+                                progressive=True)
+        widget()
+        self.assertEqual(list(widget.frames.keys()), [0])
+        self.assertEqual(self.server.frame('fig_%s' % widget.id, 4)[:8], '<center>')
+        self.assertEqual(self.server.frame('fig_%s' % widget.id, 5), None)
+
+    def test_export_on_demand_holds_render_lock(self):
+        widget = ScrubberWidget(self.plot, export_json=True, json_path=self.json_path,
+                                progressive=True)
+        widget()
+        frames = []
+        request = threading.Thread(target=lambda: frames.append(
+            self.server.frame('fig_%s' % widget.id, 1)))
+        with render_lock:
+            request.start()
+            request.join(0.5)
+            self.assertEqual(frames, [])
+        request.join()
+        self.assertEqual(frames[0][:8], '<center>')
+
+    def test_export_registers_progressive_only(self):
+        widget = ScrubberWidget(self.plot, export_json=True, json_path=self.json_path)
+        widget()
+        self.assertNotIn(widget.id, NdWidget.exports)
+        widget = ScrubberWidget(self.plot, export_json=True, json_path=self.json_path,
+                                progressive=True)
+        widget()
+        self.assertIn(widget.id, NdWidget.exports)
+        for idx in range(1, len(self.plot)):
+            self.server.frame('fig_%s' % widget.id, idx)
+        self.assertNotIn(widget.id, NdWidget.exports)
+
+
+class TestFrameCache(ComparisonTestCase):
+
+    def test_frame_cache_byte_budget(self):
+        cache = FrameCache(10)
+        for key in range(5):
+            cache.set(key, 'abcd')
+        self.assertEqual(list(cache._frames.keys()), [3, 4])
+        self.assertEqual(cache.nbytes, 8)
+
+    def test_frame_cache_lru_order(self):
+        cache = FrameCache(100, max_frames=3)
+        for key in range(3):
+            cache.set(key, 'abcd')
+        cache.get(0)
+        cache.set(3, 'abcd')
+        self.assertEqual(list(cache._frames.keys()), [2, 0, 3])
+
+    def test_frame_cache_keeps_latest(self):
+        cache = FrameCache(2)
+        cache.set(0, 'abcd')
+        self.assertEqual(cache.get(0), 'abcd')